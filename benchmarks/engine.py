@@ -0,0 +1,377 @@
+"""
+Benchmarks of the game engine's hot paths, with fixed seeds.
+
+For each operation, reports throughput (ops/sec; hands/sec for full hands),
+per-op latency percentiles, and the peak memory traced (tracemalloc) while
+running one op. CPython doesn't expose allocation counts, so peak bytes
+allocated stand in for 'allocations per op'.
+
+Usage:
+    python -m benchmarks.engine --output results.json
+    python -m benchmarks.engine --output results.json --compare baseline.json
+
+With --compare, exits non-zero if any op's median latency regressed by more
+than --threshold (a fraction) relative to the baseline.
+"""
+from argparse import ArgumentParser
+from copy import deepcopy
+from itertools import cycle
+import json
+import platform
+import random
+import sys
+from time import perf_counter_ns
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+import numpy
+from numpy import percentile
+
+from game_assets.card import Card
+from game_assets.euchre import NUM_PLAYERS, NUM_TRICKS, SUITS
+from game_assets.hand import Hand
+from game_assets.models.trick_model import TrickModel
+from game_assets.players.heuristic_player import HeuristicPlayer
+from game_assets.players.partial_rl_player import RLTrickPlayer
+from game_assets.players.random_player import RandomPlayer
+from game_assets.table import Table
+from game_assets.trick import Trick
+
+DEFAULT_SEED = 0
+DEFAULT_THRESHOLD = 0.10
+# the player mixes benchmarked for Table.play_hand
+PLAYER_MIXES = {
+    "random": [RandomPlayer] * NUM_PLAYERS,
+    "heuristic": [HeuristicPlayer] * NUM_PLAYERS,
+    "heuristic_vs_random": [HeuristicPlayer, RandomPlayer] * (NUM_PLAYERS // 2),
+    "rl_stub_vs_heuristic": [None, HeuristicPlayer] * (NUM_PLAYERS // 2),
+}
+
+
+class StubTrickModel(TrickModel):
+    """
+    TrickModel that plays the first legal card, standing in for a learned
+    model so RLTrickPlayer's overhead can be measured
+    """
+
+    def __init__(self, **kwargs):
+        pass
+
+    def save(self, file_path: str):
+        pass
+
+    def load(self, file_path: str):
+        pass
+
+    def pred_card(self, player_hand: List[Card], active_hand: Hand,
+                active_trick: Trick) -> int:
+        if active_trick.played_cards:
+            lead = active_trick.played_cards[0].card
+            for ix, c in enumerate(player_hand):
+                if c.suit == lead.suit or (c.is_trump(active_hand.trump) and lead.is_trump(active_hand.trump)):
+                    return ix
+        return 0
+
+    def add_to_buffer(self, *args):
+        pass
+
+    def step_fit(self):
+        pass
+
+
+def time_op(op: Callable, setup: Callable = None, n: int = 1000,
+            warmup: int = 10) -> Dict[str, float]:
+    """
+    Time an operation
+
+    Parameters
+    ----------
+        op : Callable
+            The operation, called with the result of setup (if provided)
+
+        setup : Callable, default = None
+            Prepares the arguments for each sample (untimed)
+
+        n : int, default = 1000
+            The number of samples
+
+        warmup : int, default = 10
+            Untimed samples run first
+
+    Returns
+    -------
+        Dict[str, float] : ops_per_sec, latency percentiles (p50_us,
+            p90_us, p99_us), mean_us, and peak_alloc_bytes
+    """
+    def sample() -> int:
+        args = setup() if setup is not None else ()
+        start = perf_counter_ns()
+        op(*args)
+        return perf_counter_ns() - start
+
+    for _ in range(warmup):
+        sample()
+    latencies = [sample() / 1000 for _ in range(n)]
+    # allocation is measured separately, tracing slows the op
+    args = setup() if setup is not None else ()
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    op(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    p50, p90, p99 = percentile(latencies, [50, 90, 99])
+    mean = sum(latencies) / len(latencies)
+    return {
+        "n": n,
+        "ops_per_sec": 1e6 / mean,
+        "p50_us": float(p50),
+        "p90_us": float(p90),
+        "p99_us": float(p99),
+        "mean_us": mean,
+        "peak_alloc_bytes": peak - baseline,
+    }
+
+
+def _seed(seed: int) -> None:
+    """
+    Seed both sources of randomness used by the engine: the stdlib (deck
+    shuffles) and numpy's global state (RandomPlayer)
+    """
+    random.seed(seed)
+    numpy.random.seed(seed)
+
+
+def _make_players(mix: List[type]) -> List:
+    return [RLTrickPlayer(seat, StubTrickModel()) if cls is None else cls(seat)
+            for seat, cls in enumerate(mix)]
+
+
+def _random_card_pairs(n: int) -> List[Tuple[Card, Card, int, int]]:
+    deck = Table(*_make_players(PLAYER_MIXES["random"])).deck
+    return [(*random.sample(deck, 2), random.choice(SUITS), random.choice(SUITS)) for _ in range(n)]
+
+
+def _random_tricks(n: int) -> List[Tuple[Trick, int]]:
+    deck = Table(*_make_players(PLAYER_MIXES["random"])).deck
+    tricks = []
+    for _ in range(n):
+        played = Trick()
+        for seat, c in enumerate(random.sample(deck, NUM_PLAYERS)):
+            played.add_card(c, seat)
+        tricks.append((played, random.choice(SUITS)))
+    return tricks
+
+
+def _played_hands(n: int) -> List[Hand]:
+    """
+    Complete hands, played between heuristic players
+    """
+    h_table = Table(*_make_players(PLAYER_MIXES["heuristic"]))
+    hands = []
+    for _ in range(n):
+        kitty_face_up = h_table._deal()
+        pick_vals = h_table._pick_trump(kitty_face_up)
+        active_hand = Hand(pick_vals["bidder"], pick_vals["trump"], kitty_face_up, pick_vals["pick_up"])
+        for _ in range(NUM_TRICKS):
+            played_trick = h_table._play_trick(active_hand)
+            played_trick.score_trick(active_hand.trump)
+            active_hand.add_trick(played_trick)
+        hands.append(active_hand)
+        h_table._pass_deal()
+    return hands
+
+
+def _mid_hand_states(n: int) -> List[Tuple[List[Card], Hand, Trick, int, int]]:
+    """
+    States part way through hands between heuristic players: the next
+    player's cards, the hand, the trick in progress, the dealer's seat and
+    the next player's seat
+    """
+    players = _make_players(PLAYER_MIXES["heuristic"])
+    h_table = Table(*players)
+    states = []
+    for _ in range(n):
+        kitty_face_up = h_table._deal()
+        pick_vals = h_table._pick_trump(kitty_face_up)
+        active_hand = Hand(pick_vals["bidder"], pick_vals["trump"], kitty_face_up, pick_vals["pick_up"])
+        for _ in range(random.randrange(NUM_TRICKS)):
+            played_trick = h_table._play_trick(active_hand)
+            played_trick.score_trick(active_hand.trump)
+            active_hand.add_trick(played_trick)
+        first_player = (h_table.dealer + 1) % NUM_PLAYERS
+        if active_hand.tricks:
+            first_player = active_hand.tricks[-1].winning_player_seat
+        active_trick = Trick()
+        n_played = random.randrange(NUM_PLAYERS)
+        for offset in range(n_played):
+            p = players[(first_player + offset) % NUM_PLAYERS]
+            active_trick.add_card(p.play_card(active_hand, active_trick, h_table.dealer, first_player), p.seat)
+        seat = (first_player + n_played) % NUM_PLAYERS
+        states.append((list(players[seat].cards_held), deepcopy(active_hand), active_trick,
+                        h_table.dealer, seat))
+        h_table._pass_deal()
+    return states
+
+
+def run_benchmarks(seed: int = DEFAULT_SEED, n: int = 1000) -> Dict[str, Dict[str, float]]:
+    """
+    Run the benchmark suite
+
+    Parameters
+    ----------
+        seed : int, default = DEFAULT_SEED
+            Seeds inputs and play, so runs are reproducible
+
+        n : int, default = 1000
+            The number of samples per op (hands, for play_hand)
+
+    Returns
+    -------
+        Dict[str, Dict[str, float]] : results per op, see `time_op`
+    """
+    results = {}
+    # fast ops are timed over batches of inputs
+    batch = 100
+
+    _seed(seed)
+    pairs = _random_card_pairs(batch)
+    results["card.lt_card"] = _per_call(time_op(
+        lambda: [a.lt_card(b, trump, lead) for a, b, trump, lead in pairs], n=n), len(pairs))
+
+    _seed(seed)
+    tricks = _random_tricks(batch)
+    results["trick.score_trick"] = _per_call(time_op(
+        lambda: [played.score_trick(trump) for played, trump in tricks], n=n), len(tricks))
+
+    _seed(seed)
+    hands = _played_hands(batch)
+    results["hand.score_hand"] = _per_call(time_op(
+        lambda: [h.score_hand() for h in hands], n=n), len(hands))
+
+    for mix_name, mix in PLAYER_MIXES.items():
+        _seed(seed)
+        mix_table = Table(*_make_players(mix))
+        results[f"table.play_hand[{mix_name}]"] = time_op(mix_table.play_hand, n=n)
+
+    _seed(seed)
+    states = _mid_hand_states(n)
+    state_iter = cycle(states)
+    heuristic = HeuristicPlayer(0)
+
+    def next_state():
+        cards, active_hand, active_trick, dealer, seat = next(state_iter)
+        heuristic.seat = seat
+        heuristic.cards_held = list(cards)
+        return active_hand, active_trick, dealer, seat
+
+    results["heuristic_player.play_card"] = time_op(
+        lambda active_hand, active_trick, dealer, seat:
+            heuristic.play_card(active_hand, active_trick, dealer, seat),
+        next_state, n=n)
+
+    deck = Table(*_make_players(PLAYER_MIXES["random"])).deck
+    holdings = [random.sample(deck, NUM_TRICKS + 1) for _ in range(n)]
+    holding_iter = cycle(holdings)
+
+    def next_holding():
+        *cards, passed_card = next(holding_iter)
+        heuristic.cards_held = cards
+        return passed_card, False
+
+    results["heuristic_player.select_trump"] = time_op(heuristic.select_trump, next_holding, n=n)
+
+    rl_player = RLTrickPlayer(0, StubTrickModel())
+
+    def next_rl_state():
+        cards, active_hand, active_trick, _, seat = next(state_iter)
+        rl_player.seat = seat
+        rl_player.cards_held = list(cards)
+        return active_hand, active_trick
+
+    results["rl_trick_player._get_state_repr"] = time_op(rl_player._get_state_repr, next_rl_state, n=n)
+    return results
+
+
+def _per_call(result: Dict[str, float], calls: int) -> Dict[str, float]:
+    """
+    Rescale the result of timing a batch of calls to per-call figures
+    """
+    scaled = dict(result)
+    scaled["n"] = result["n"] * calls
+    scaled["ops_per_sec"] = result["ops_per_sec"] * calls
+    for key in ["p50_us", "p90_us", "p99_us", "mean_us"]:
+        scaled[key] = result[key] / calls
+    scaled["peak_alloc_bytes"] = result["peak_alloc_bytes"] / calls
+    return scaled
+
+
+def compare_results(current: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+                    threshold: float = DEFAULT_THRESHOLD) -> List[str]:
+    """
+    Identify regressions against a baseline
+
+    Parameters
+    ----------
+        current : Dict[str, Dict[str, float]]
+            Results, from `run_benchmarks`
+
+        baseline : Dict[str, Dict[str, float]]
+            Baseline results, from `run_benchmarks`
+
+        threshold : float, default = DEFAULT_THRESHOLD
+            The fractional increase in median latency flagged as a regression
+
+    Returns
+    -------
+        List[str] : A description of each regression
+    """
+    regressions = []
+    for op, result in current.items():
+        if op not in baseline:
+            continue
+        before = baseline[op]["p50_us"]
+        after = result["p50_us"]
+        if after > before * (1 + threshold):
+            regressions.append(f"{op}: p50 {before:.3f}us -> {after:.3f}us (+{after / before - 1:.1%})")
+    return regressions
+
+
+def main(argv: List[str] = None) -> int:
+    parser = ArgumentParser(description="Benchmark the game engine's hot paths")
+    parser.add_argument("--output", help="Save results to this JSON file")
+    parser.add_argument("--compare", help="Flag regressions against this baseline JSON file")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Fractional p50 latency increase flagged as a regression")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("-n", type=int, default=1000, help="Samples per op")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.seed, args.n)
+    report = {
+        "meta": {
+            "python": sys.version.split()[0],
+            "numpy": numpy.__version__,
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "n": args.n,
+        },
+        "results": results,
+    }
+    for op, result in results.items():
+        print(f"{op:40s} {result['ops_per_sec']:>14,.0f}/s  p50 {result['p50_us']:9.3f}us  "
+            f"p99 {result['p99_us']:9.3f}us  peak {result['peak_alloc_bytes']:>10,.0f}B")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare_results(results, baseline["results"], args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return int(bool(regressions))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,329 @@
+"""
+Bidding-only simulation: deals and trump selection (as `Table._deal` and
+`Table._pick_trump`) between four HeuristicPlayers, vectorized over many
+deals with a `BiddingTable`. No tricks are played, so call rates, stuck
+dealer rates and the like can be screened over activation grids cheaply.
+
+Points can optionally be estimated with an `OutcomeModel`: the mean points
+won by the bidding team, cached by the bidder's hand score for trump, fit
+from heuristic rollouts.
+"""
+from dataclasses import dataclass
+from typing import Sequence, Union
+
+from numpy import (arange, argsort, array, bincount, broadcast_to, concatenate, full, int64,
+                   ndarray, where, zeros)
+from numpy.random import Generator, default_rng
+
+from .bidding_table import CARD_SCORE, DEALER, MAX_HAND_SCORE, OPPONENT, PARTNER, BiddingTable
+from .bitmask import NUM_CARDS, hand_ranks
+from .euchre import CARD_FACES, NUM_PLAYERS, NUM_TRICKS, TEAMS
+from .rollout import HEURISTIC, rollout_batch
+
+# the pickup role of each bidding position (0 is left of the dealer)
+POSITION_ROLES = [OPPONENT, PARTNER, OPPONENT, DEALER]
+# deals are simulated in chunks, bounding memory
+CHUNK_SIZE = 1 << 16
+
+
+@dataclass
+class BiddingResult:
+    """
+    The outcome of bidding on each simulated deal
+
+    Attributes
+    ----------
+        dealer : np.array
+            The dealer's seat
+
+        upcard : np.array
+            The index (bitmask.card_ix) of the face-up kitty card
+
+        bidder : np.array
+            The seat of the player that selected trump
+
+        position : np.array
+            The bidder's position in the bidding order, 0 (left of the
+            dealer) - 3 (the dealer)
+
+        trump : np.array
+            The trump suit
+
+        pick_up : np.array
+            True where the upcard was ordered up in the first round
+
+        stuck : np.array
+            True where the dealer was forced to select trump
+
+        bidder_score : np.array
+            The integer heuristic score of the bidder's holding for trump,
+            before any exchange with the kitty
+
+        hands : np.array
+            (n x 4) bitmasks of the cards dealt to each seat, before any
+            exchange with the kitty. Only kept if requested
+    """
+    dealer: ndarray
+    upcard: ndarray
+    bidder: ndarray
+    position: ndarray
+    trump: ndarray
+    pick_up: ndarray
+    stuck: ndarray
+    bidder_score: ndarray
+    hands: ndarray = None
+
+    def call_rates(self) -> ndarray:
+        """
+        The fraction of deals on which each seat selects trump
+        """
+        return bincount(self.bidder, minlength=NUM_PLAYERS) / len(self.bidder)
+
+    def pickup_rates(self) -> ndarray:
+        """
+        The fraction of deals on which each seat orders up (or, as the
+        dealer, picks up) the upcard
+        """
+        return bincount(self.bidder[self.pick_up], minlength=NUM_PLAYERS) / len(self.bidder)
+
+    def position_call_rates(self) -> ndarray:
+        """
+        The fraction of deals on which trump is selected from each
+        bidding position, by round: (2 rounds x 4 positions)
+        """
+        return array([bincount(self.position[self.pick_up == first], minlength=NUM_PLAYERS)
+                    for first in [True, False]]) / len(self.bidder)
+
+    def dealer_suit_rates(self) -> ndarray:
+        """
+        The fraction of deals on which trump is made in the dealer's suit
+        (that of the upcard), by the bidder's position (3 is the dealer
+        picking up their own upcard). The suit turned down can't be called,
+        so these are first round calls
+        """
+        dealer_suit = self.trump == self.upcard // len(CARD_FACES)
+        return bincount(self.position[dealer_suit], minlength=NUM_PLAYERS) / len(self.bidder)
+
+    def stuck_rate(self) -> float:
+        """
+        The fraction of deals on which the dealer is forced to select trump
+        """
+        return self.stuck.mean()
+
+
+def simulate_bidding(n_deals: int, pickup_act: Union[float, Sequence[float]] = 1/3,
+                    trump_call_act: Union[float, Sequence[float]] = 0.55,
+                    bidding_table: BiddingTable = None, first_dealer: int = 0,
+                    rng: Generator = None, keep_hands: bool = False) -> BiddingResult:
+    """
+    Simulate the deal and trump selection of many hands, between four
+    HeuristicPlayers. As at a `Table`, the deal passes to the left each hand.
+
+    Parameters
+    ----------
+        n_deals : int
+            The number of deals to simulate
+
+        pickup_act : float or Sequence[float], default = 1/3
+            Each seat's `pickup_act` (or one value for all seats). Must be
+            on the bidding table's pickup grid
+
+        trump_call_act : float or Sequence[float], default = 0.55
+            Each seat's `trump_call_act` (or one value for all seats). Must
+            be on the bidding table's trump call grid
+
+        bidding_table : bidding_table.BiddingTable, default = None
+            The decision table. If not provided, one is built over grids of
+            the activations given
+
+        first_dealer : int, default = 0
+            The dealer's seat on the first deal
+
+        rng : numpy.random.Generator, default = None
+            The source of randomness. A fresh generator if not provided
+
+        keep_hands : bool, default = False
+            If the dealt hands should be kept (e.g. to fit an OutcomeModel)
+
+    Returns
+    -------
+        BiddingResult : the outcome of bidding on each deal
+    """
+    pickup_act = broadcast_to(array(pickup_act, dtype=float), (NUM_PLAYERS,))
+    trump_call_act = broadcast_to(array(trump_call_act, dtype=float), (NUM_PLAYERS,))
+    if bidding_table is None:
+        bidding_table = BiddingTable.build(sorted(set(pickup_act.tolist())),
+                                        sorted(set(trump_call_act.tolist())))
+    pickup_ix = array([bidding_table.pickup_ix(a) for a in pickup_act])
+    trump_call_ix = array([bidding_table.trump_call_ix(a) for a in trump_call_act])
+    rng = default_rng() if rng is None else rng
+    dealer = (first_dealer + arange(n_deals)) % NUM_PLAYERS
+    chunks = [_simulate_chunk(dealer[start:start + CHUNK_SIZE], pickup_ix, trump_call_ix,
+                            bidding_table, rng, keep_hands)
+            for start in range(0, n_deals, CHUNK_SIZE)]
+    fields = BiddingResult.__dataclass_fields__
+    return BiddingResult(**{name: concatenate([getattr(c, name) for c in chunks])
+                            if chunks and getattr(chunks[0], name) is not None else None
+                            for name in fields})
+
+
+def _simulate_chunk(dealer: ndarray, pickup_ix: ndarray, trump_call_ix: ndarray,
+                    bidding_table: BiddingTable, rng: Generator, keep_hands: bool) -> BiddingResult:
+    """
+    Simulate bidding for a chunk of deals. See `simulate_bidding`
+    """
+    n = len(dealer)
+    deals = argsort(rng.random((n, NUM_CARDS)), axis=1)
+    hands = zeros((n, NUM_PLAYERS), dtype=int64)
+    for seat in range(NUM_PLAYERS):
+        hands[:, seat] = (1 << deals[:, NUM_TRICKS * seat:NUM_TRICKS * (seat + 1)]).sum(axis=1)
+    # the kitty's face-up card is the 21st card dealt
+    upcard = deals[:, NUM_PLAYERS * NUM_TRICKS]
+    upcard_suit = upcard // len(CARD_FACES)
+    ranks = hand_ranks(hands)
+    rows = arange(n)
+
+    bidder = full(n, -1, dtype=int64)
+    position = full(n, -1, dtype=int64)
+    trump = upcard_suit.copy()
+    # kitty round
+    for pos, role in enumerate(POSITION_ROLES):
+        seat = (dealer + 1 + pos) % NUM_PLAYERS
+        calls = (bidder < 0) & (pickup_ix[seat] >= bidding_table.pickup_crit[ranks[rows, seat], upcard, role])
+        bidder[calls] = seat[calls]
+        position[calls] = pos
+    pick_up = bidder >= 0
+    # the turned down round; the dealer is stuck with the last call
+    for pos in range(NUM_PLAYERS):
+        seat = (dealer + 1 + pos) % NUM_PLAYERS
+        seat_rank = ranks[rows, seat]
+        calls = bidder < 0
+        if pos < NUM_PLAYERS - 1:
+            calls &= trump_call_ix[seat] >= bidding_table.trump_crit[seat_rank, upcard_suit]
+        bidder[calls] = seat[calls]
+        position[calls] = pos
+        trump[calls] = bidding_table.trump_suit[seat_rank, upcard_suit][calls]
+    stuck = ~pick_up & (position == NUM_PLAYERS - 1)
+
+    bidder_hands = hands[rows, bidder]
+    held = (bidder_hands[:, None] >> arange(NUM_CARDS)) & 1
+    bidder_score = (held * CARD_SCORE[trump]).sum(axis=1)
+    return BiddingResult(dealer, upcard, bidder, position, trump, pick_up, stuck,
+                        bidder_score, hands if keep_hands else None)
+
+
+def exchange_with_kitty(hands: ndarray, dealer: ndarray, upcard: ndarray,
+                        pick_up: ndarray) -> ndarray:
+    """
+    The hands held for trick play: where the upcard was picked up, the
+    dealer exchanges its weakest card for trump (the lowest indexed, of
+    equally weak cards) for the upcard
+
+    Parameters
+    ----------
+        hands : np.array
+            (n x 4) bitmasks of the cards dealt to each seat
+
+        dealer : np.array
+            The dealer's seat, per deal
+
+        upcard : np.array
+            The index of the face-up kitty card, per deal
+
+        pick_up : np.array
+            True where the upcard was picked up
+
+    Returns
+    -------
+        np.array : (n x 4) bitmasks of the cards held by each seat
+    """
+    hands = hands.copy()
+    rows = arange(len(hands))
+    dealer_hands = hands[rows, dealer]
+    held = ((dealer_hands[:, None] >> arange(NUM_CARDS)) & 1).astype(bool)
+    upcard_suit = upcard // len(CARD_FACES)
+    weakest = where(held, CARD_SCORE[upcard_suit], MAX_HAND_SCORE).argmin(axis=1)
+    exchanged = (dealer_hands ^ (1 << weakest)) | (1 << upcard)
+    hands[rows, dealer] = where(pick_up, exchanged, dealer_hands)
+    return hands
+
+
+def exchanged_hands(result: BiddingResult) -> ndarray:
+    """
+    The hands held for trick play after simulated bidding (see
+    `exchange_with_kitty`), for a BiddingResult with hands kept
+    """
+    return exchange_with_kitty(result.hands, result.dealer, result.upcard, result.pick_up)
+
+
+class OutcomeModel:
+    """
+    Cached estimate of the points a bidding team wins (less the points its
+    opponents win), by the bidder's hand score for trump and whether the
+    upcard was picked up. Fit from heuristic rollouts of simulated deals.
+    """
+
+    def __init__(self, net_points: ndarray, counts: ndarray):
+        """
+        Parameters
+        ----------
+            net_points : np.array
+                (2 x MAX_HAND_SCORE + 1) mean net points, by [pick_up, bidder_score]
+
+            counts : np.array
+                (2 x MAX_HAND_SCORE + 1) the number of rollouts behind each mean
+        """
+        self.net_points = net_points
+        self.counts = counts
+
+    @classmethod
+    def fit(cls, result: BiddingResult) -> 'OutcomeModel':
+        """
+        Fit the model from heuristic rollouts of simulated deals
+
+        Parameters
+        ----------
+            result : BiddingResult
+                Simulated bidding, with hands kept
+
+        Returns
+        -------
+            OutcomeModel : The fit model
+        """
+        if result.hands is None:
+            raise ValueError("Fitting requires a BiddingResult with hands kept")
+        played = rollout_batch(exchanged_hands(result), result.trump,
+                            (result.dealer + 1) % NUM_PLAYERS, result.bidder, HEURISTIC)
+        team = result.bidder % len(TEAMS)
+        rows = arange(len(team))
+        net = played.points[rows, team] - played.points[rows, 1 - team]
+        key = result.pick_up * (MAX_HAND_SCORE + 1) + result.bidder_score
+        n_keys = len(TEAMS) * (MAX_HAND_SCORE + 1)
+        counts = bincount(key, minlength=n_keys)
+        totals = bincount(key, weights=net, minlength=n_keys)
+        net_points = where(counts > 0, totals / counts.clip(min=1), 0.0)
+        return cls(net_points.reshape(2, -1), counts.reshape(2, -1))
+
+    def expected_points(self, result: BiddingResult) -> ndarray:
+        """
+        The estimated net points of the bidding team, for each deal
+
+        Parameters
+        ----------
+            result : BiddingResult
+                Simulated bidding
+
+        Returns
+        -------
+            np.array : The estimated net points, per deal
+        """
+        return self.net_points[result.pick_up.astype(int64), result.bidder_score]
+
+    def team_net_points(self, result: BiddingResult) -> ndarray:
+        """
+        The estimated mean net points per deal of each team (team zero,
+        team one) as bidders, over all deals
+        """
+        net = self.expected_points(result)
+        team = result.bidder % len(TEAMS)
+        return array([where(team == t, net, -net).mean() for t in sorted(TEAMS)])
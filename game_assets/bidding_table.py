@@ -0,0 +1,355 @@
+"""
+Exact tables of the HeuristicPlayer's bidding decisions, for every five-card
+holding, upcard and seat role, over a grid of `pickup_act`/`trump_call_act`
+values.
+
+The heuristic's hand strength depends only on the (integer) sum of the card
+scores of the holding for a suit, so decisions are evaluated once per
+distinct score with the same float expressions HeuristicPlayer uses, and
+then looked up for all C(24,5) holdings. Each decision is monotone in its
+activation, so a table stores only the first grid index at which the
+decision is made.
+"""
+from typing import List, Sequence, Tuple
+
+from numpy import (add, append, arange, array, asarray, einsum, int8, int64, load as np_load,
+                   ndarray, ones_like, savez_compressed, uint8, unique, where, zeros)
+
+from .bitmask import NUM_CARDS, NUM_HANDS, SUIT_MASKS, all_hands, card_ix, cards_mask, hand_rank, ix_card
+from .card import Card
+from .euchre import CARD_FACES, NUM_TRICKS, SUITS
+from .players.heuristic_player import MAX_CARD_SCORE, _card_score, _normalize_hand_score
+
+# pickup roles, by the dealer's relation to the evaluating player
+OPPONENT = 0
+PARTNER = 1
+DEALER = 2
+ROLES = [OPPONENT, PARTNER, DEALER]
+
+# the largest integer hand score (five cards of at most MAX_CARD_SCORE)
+MAX_HAND_SCORE = NUM_TRICKS * MAX_CARD_SCORE
+# CARD_SCORE[suit, ix] is the integer heuristic score of card ix, for suit
+CARD_SCORE = array([[_card_score(ix_card(ix), suit) for ix in range(NUM_CARDS)] for suit in SUITS])
+# the default activation grid, exactly matching literals such as 0.35, and
+# HeuristicPlayer's default activations (1/3, 0.55)
+DEFAULT_GRID = unique(append(arange(21) / 20, [1/3, 0.55]))
+
+
+class BiddingTable:
+    """
+    Lookup table of HeuristicPlayer bidding decisions
+
+    Attributes
+    ----------
+        pickup_grid : np.array
+            The sorted `pickup_act` values evaluated
+
+        trump_call_grid : np.array
+            The sorted `trump_call_act` values evaluated
+
+        pickup_crit : np.array
+            (NUM_HANDS x 24 upcards x 3 roles) uint8. The first pickup grid
+            index at which the card is picked up; len(pickup_grid) if never
+            (or if the upcard is in the holding)
+
+        trump_suit : np.array
+            (NUM_HANDS x 4 passed suits) int8. The suit the player selects,
+            given the suit turned down
+
+        trump_crit : np.array
+            (NUM_HANDS x 4 passed suits) uint8. The first trump call grid
+            index at which a non-dealer calls trump_suit
+    """
+
+    def __init__(self, pickup_grid: Sequence[float], trump_call_grid: Sequence[float],
+                pickup_crit: ndarray, trump_suit: ndarray, trump_crit: ndarray):
+        self.pickup_grid = _check_grid(pickup_grid, "pickup_grid")
+        self.trump_call_grid = _check_grid(trump_call_grid, "trump_call_grid")
+        self.pickup_crit = asarray(pickup_crit, dtype=uint8)
+        self.trump_suit = asarray(trump_suit, dtype=int8)
+        self.trump_crit = asarray(trump_crit, dtype=uint8)
+        if self.pickup_crit.shape != (NUM_HANDS, NUM_CARDS, len(ROLES)):
+            raise ValueError(f"pickup_crit has shape {self.pickup_crit.shape}")
+        if self.trump_suit.shape != (NUM_HANDS, len(SUITS)) or self.trump_crit.shape != (NUM_HANDS, len(SUITS)):
+            raise ValueError("trump_suit and trump_crit must have shape (NUM_HANDS, 4)")
+
+    @classmethod
+    def build(cls, pickup_grid: Sequence[float] = DEFAULT_GRID,
+            trump_call_grid: Sequence[float] = DEFAULT_GRID) -> 'BiddingTable':
+        """
+        Evaluate the heuristic bidding decisions for every holding
+
+        Parameters
+        ----------
+            pickup_grid : Sequence[float], default = DEFAULT_GRID
+                The `pickup_act` values to evaluate, sorted, in [0,1]
+
+            trump_call_grid : Sequence[float], default = DEFAULT_GRID
+                The `trump_call_act` values to evaluate, sorted, in [0,1]
+
+        Returns
+        -------
+            BiddingTable : The evaluated table
+        """
+        pickup_grid = _check_grid(pickup_grid, "pickup_grid")
+        trump_call_grid = _check_grid(trump_call_grid, "trump_call_grid")
+        n_pickup = len(pickup_grid)
+        hand_str = [_normalize_hand_score(score) for score in range(MAX_HAND_SCORE + 1)]
+
+        masks = all_hands()
+        held = ((masks[:, None] >> arange(NUM_CARDS)) & 1).astype(bool)
+        # the integer hand score, and the weakest card's score, per suit
+        scores = einsum("hc,sc->hs", held.astype(int64), CARD_SCORE)
+        weakest = where(held[:, None, :], CARD_SCORE[None, :, :], MAX_CARD_SCORE + 1).min(axis=2)
+
+        # first grid index each (hand score, upcard score) is picked up at
+        opp_crit = zeros((MAX_HAND_SCORE + 1, MAX_CARD_SCORE + 1), dtype=int64)
+        partner_crit = zeros((MAX_HAND_SCORE + 1, MAX_CARD_SCORE + 1), dtype=int64)
+        # an upcard is always trump, so has a nonzero score
+        for u_score in {int(CARD_SCORE[ix // len(CARD_FACES), ix]) for ix in range(NUM_CARDS)}:
+            k = u_score / MAX_CARD_SCORE
+            for score, h in enumerate(hand_str):
+                if h < 0:
+                    # below any five-card holding's score
+                    continue
+                opp_crit[score, u_score] = _first_true(
+                    [(h ** (1/2)) / (k ** (1/2)) > (3/(4*p + 0.0001)) - (3/4) for p in pickup_grid])
+                partner_crit[score, u_score] = _first_true(
+                    [(h ** (1/2)) * (k ** (1/2)) > 1 - p for p in pickup_grid])
+        dealer_pick = array([h > 0.6 for h in hand_str])
+
+        pickup_crit = zeros((NUM_HANDS, NUM_CARDS, len(ROLES)), dtype=uint8)
+        for ix in range(NUM_CARDS):
+            suit = ix // len(CARD_FACES)
+            u_score = CARD_SCORE[suit, ix]
+            h_score = scores[:, suit]
+            pickup_crit[:, ix, OPPONENT] = opp_crit[h_score, u_score]
+            pickup_crit[:, ix, PARTNER] = partner_crit[h_score, u_score]
+            # the dealer swaps the weakest card for the upcard, and compares
+            # against the strongest other suit of the original holding
+            new_score = h_score - weakest[:, suit] + u_score
+            other_best = scores[:, [s for s in SUITS if s != suit]].max(axis=1)
+            pickup_crit[:, ix, DEALER] = where(dealer_pick[new_score] & (new_score > other_best), 0, n_pickup)
+            # a holding can't be offered a card it holds
+            pickup_crit[held[:, ix], ix, :] = n_pickup
+
+        call_crit = array([_first_true([h > 1 - tc for tc in trump_call_grid]) for h in hand_str])
+        trump_suit = zeros((NUM_HANDS, len(SUITS)), dtype=int8)
+        trump_crit = zeros((NUM_HANDS, len(SUITS)), dtype=uint8)
+        for passed in SUITS:
+            others = [s for s in SUITS if s != passed]
+            # argmax takes the first maximum, as the player does
+            best = scores[:, others].argmax(axis=1)
+            trump_suit[:, passed] = array(others)[best]
+            trump_crit[:, passed] = call_crit[scores[arange(NUM_HANDS), trump_suit[:, passed]]]
+        return cls(pickup_grid, trump_call_grid, pickup_crit, trump_suit, trump_crit)
+
+    def save(self, file_path: str) -> None:
+        """
+        Save the table to a (compressed numpy) file
+
+        Parameters
+        ----------
+            file_path : str
+                The destination file
+
+        Returns
+        -------
+            None
+        """
+        savez_compressed(file_path, pickup_grid=self.pickup_grid,
+                        trump_call_grid=self.trump_call_grid, pickup_crit=self.pickup_crit,
+                        trump_suit=self.trump_suit, trump_crit=self.trump_crit)
+
+    @classmethod
+    def load(cls, file_path: str) -> 'BiddingTable':
+        """
+        Load a table saved with `save`
+
+        Parameters
+        ----------
+            file_path : str
+                The source file
+
+        Returns
+        -------
+            BiddingTable : The loaded table
+        """
+        with np_load(file_path) as data:
+            return cls(data["pickup_grid"], data["trump_call_grid"], data["pickup_crit"],
+                    data["trump_suit"], data["trump_crit"])
+
+    def pickup_ix(self, pickup_act: float) -> int:
+        """
+        Returns the index of a `pickup_act` value on the pickup grid
+        """
+        return _grid_ix(self.pickup_grid, pickup_act, "pickup_act")
+
+    def trump_call_ix(self, trump_call_act: float) -> int:
+        """
+        Returns the index of a `trump_call_act` value on the trump call grid
+        """
+        return _grid_ix(self.trump_call_grid, trump_call_act, "trump_call_act")
+
+    def kitty_pickup(self, cards: List[Card], kitty_card: Card, is_dealer: bool,
+                    dealer_is_team_member: bool, pickup_ix: int) -> bool:
+        """
+        Looks up HeuristicPlayer.select_kitty_pickup
+
+        Parameters
+        ----------
+            cards : List[card.Card]
+                The five cards held
+
+            kitty_card : card.Card
+                The face-up card in the kitty
+
+            is_dealer : bool
+                If the player is in the dealer's seat
+
+            dealer_is_team_member : bool
+                If the dealer is the player's team member
+
+            pickup_ix : int
+                The index of the player's `pickup_act` on the pickup grid
+
+        Returns
+        -------
+            bool : True if the card is to be picked up, false otherwise
+        """
+        if is_dealer:
+            role = DEALER
+        elif dealer_is_team_member:
+            role = PARTNER
+        else:
+            role = OPPONENT
+        return bool(pickup_ix >= self.pickup_crit[hand_rank(cards_mask(cards)), card_ix(kitty_card), role])
+
+    def select_trump(self, cards: List[Card], passed_card: Card, is_dealer: bool,
+                    trump_call_ix: int) -> Tuple[int, bool]:
+        """
+        Looks up HeuristicPlayer.select_trump
+
+        Parameters
+        ----------
+            cards : List[card.Card]
+                The five cards held
+
+            passed_card : card.Card
+                The card passed in the kitty round (turned down)
+
+            is_dealer : bool
+                If the player is in the dealer's seat (is stuck)
+
+            trump_call_ix : int
+                The index of the player's `trump_call_act` on the trump call grid
+
+        Returns
+        -------
+            int : The selected suit, if any (from euchre.SUITS). -1 if no suit selected
+            bool : True if suit selected, false otherwise.
+        """
+        rank = hand_rank(cards_mask(cards))
+        if is_dealer or trump_call_ix >= self.trump_crit[rank, passed_card.suit]:
+            return int(self.trump_suit[rank, passed_card.suit]), True
+        return -1, False
+
+    def pickup_rates(self) -> ndarray:
+        """
+        The exact probability a player picks up (orders up) the upcard, per
+        role and pickup grid value, over all deals of a holding and upcard
+
+        Returns
+        -------
+            np.array : (3 roles x len(pickup_grid)) probabilities
+        """
+        n_pickup = len(self.pickup_grid)
+        rates = zeros((len(ROLES), n_pickup))
+        for role in ROLES:
+            counts = zeros(n_pickup + 1, dtype=int64)
+            for ix in range(NUM_CARDS):
+                counts += _bincount(self.pickup_crit[:, ix, role], n_pickup + 1)
+            # held upcards are marked as never picked up, so aren't counted
+            rates[role] = counts.cumsum()[:n_pickup] / _n_offers()
+        return rates
+
+    def trump_call_rates(self) -> ndarray:
+        """
+        The exact probability a non-dealer calls trump in the second round of
+        bidding, per trump call grid value, over all deals of a holding and
+        turned down card
+
+        Returns
+        -------
+            np.array : len(trump_call_grid) probabilities
+        """
+        n_trump_call = len(self.trump_call_grid)
+        masks = all_hands()
+        counts = zeros(n_trump_call + 1, dtype=int64)
+        for passed in SUITS:
+            # the number of turned down cards of the suit, given the holding
+            n_passed = len(CARD_FACES) - _suit_counts(masks, passed)
+            counts += _bincount(self.trump_crit[:, passed], n_trump_call + 1, n_passed)
+        return counts.cumsum()[:n_trump_call] / counts.sum()
+
+
+def _check_grid(grid: Sequence[float], name: str) -> ndarray:
+    """
+    Validates an activation grid: non-empty, sorted, within [0,1], and
+    small enough to index with uint8
+    """
+    grid = asarray(grid, dtype=float)
+    if grid.ndim != 1 or len(grid) == 0 or len(grid) > 255:
+        raise ValueError(f"{name} must be a 1-d sequence of 1-255 values")
+    if (grid < 0).any() or (grid > 1).any():
+        raise ValueError(f"{name} values must be in [0,1]")
+    if (grid[1:] <= grid[:-1]).any():
+        raise ValueError(f"{name} must be strictly increasing")
+    return grid
+
+
+def _grid_ix(grid: ndarray, value: float, name: str) -> int:
+    """
+    Returns the index of an exact grid value
+    """
+    matches = (grid == value).nonzero()[0]
+    if len(matches) == 0:
+        raise ValueError(f"{name} {value} is not on the table's grid")
+    return int(matches[0])
+
+
+def _first_true(decisions: List[bool]) -> int:
+    """
+    Returns the index of the first True decision, len(decisions) if none.
+    Decisions are monotone over the grid, which is checked
+    """
+    first = decisions.index(True) if True in decisions else len(decisions)
+    if not all(decisions[first:]):
+        raise ValueError("Decisions are not monotone over the grid")
+    return first
+
+
+def _bincount(values: ndarray, n_bins: int, weights: ndarray = None) -> ndarray:
+    """
+    Integer counts of values in [0, n_bins), optionally weighted
+    """
+    counts = zeros(n_bins, dtype=int64)
+    if weights is None:
+        weights = ones_like(values, dtype=int64)
+    add.at(counts, values.astype(int64), weights)
+    return counts
+
+
+def _n_offers() -> int:
+    """
+    The number of (holding, upcard not in the holding) pairs
+    """
+    return NUM_HANDS * (NUM_CARDS - NUM_TRICKS)
+
+
+def _suit_counts(masks: ndarray, suit: int) -> ndarray:
+    """
+    The number of cards of a (printed) suit in each holding
+    """
+    suit_cards = masks & SUIT_MASKS[suit]
+    return sum((suit_cards >> ix) & 1 for ix in range(NUM_CARDS))
@@ -0,0 +1,267 @@
+"""
+Integer encodings of cards, for code paths that can't afford to work with
+`Card` objects (sampling, rollouts, lookup tables).
+
+Each card is assigned an index in [0, 24):
+    index = suit * len(CARD_FACES) + face
+
+A collection of cards (a player's holding, the set of played cards, ...) is
+stored as an int bitmask, where bit `index` is set if the card is present.
+"""
+from itertools import combinations
+from math import comb
+from typing import Iterable, List
+
+from numpy import array, asarray, int64, minimum, ndarray, zeros
+
+from .card import Card
+from .euchre import CARD_FACES, JACK, LEFT_SUIT, NUM_TRICKS, SUITS
+
+NUM_FACES = len(CARD_FACES)
+NUM_CARDS = len(SUITS) * NUM_FACES
+DECK_MASK = (1 << NUM_CARDS) - 1
+
+# the cards (by raw suit) belonging to each suit
+SUIT_MASKS = [
+    sum(1 << (suit * len(CARD_FACES) + face) for face in CARD_FACES)
+    for suit in SUITS
+]
+
+
+def card_ix(c: Card) -> int:
+    """
+    Returns the integer index of a card
+
+    Parameters
+    ----------
+        c : card.Card
+            The card under evaluation
+
+    Returns
+    -------
+        int : The index of the card, [0, 24)
+    """
+    return c.suit * NUM_FACES + c.face
+
+
+def ix_card(ix: int) -> Card:
+    """
+    Returns the card associated with an integer index
+
+    Parameters
+    ----------
+        ix : int, 0 <= ix < 24
+            The card index, from `card_ix`
+
+    Returns
+    -------
+        card.Card : The card represented by the index
+    """
+    if ix < 0 or ix >= NUM_CARDS:
+        raise ValueError(f"ix must be in [0,{NUM_CARDS}), received {ix}")
+    return Card(ix // len(CARD_FACES), ix % len(CARD_FACES))
+
+
+def cards_mask(cards: Iterable[Card]) -> int:
+    """
+    Returns the bitmask of a collection of cards
+
+    Parameters
+    ----------
+        cards : Iterable[card.Card]
+            The cards to encode
+
+    Returns
+    -------
+        int : The bitmask, with one bit set per card
+    """
+    mask = 0
+    for c in cards:
+        mask |= 1 << card_ix(c)
+    return mask
+
+
+def mask_ixs(mask: int) -> List[int]:
+    """
+    Returns the (ascending) indices of the cards set in a bitmask
+
+    Parameters
+    ----------
+        mask : int
+            The bitmask of cards
+
+    Returns
+    -------
+        List[int] : The card indices
+    """
+    ixs = []
+    while mask:
+        low = mask & -mask
+        ixs.append(low.bit_length() - 1)
+        mask ^= low
+    return ixs
+
+
+def mask_cards(mask: int) -> List[Card]:
+    """
+    Returns the cards set in a bitmask, ordered by index
+
+    Parameters
+    ----------
+        mask : int
+            The bitmask of cards
+
+    Returns
+    -------
+        List[card.Card] : The encoded cards
+    """
+    return [ix_card(ix) for ix in mask_ixs(mask)]
+
+
+def popcount(mask: int) -> int:
+    """
+    Returns the number of cards set in a bitmask
+    """
+    return bin(mask).count("1")
+
+
+def mask_select(mask: int, n: int) -> int:
+    """
+    Returns the index of the n-th (ascending, from 0) card set in a bitmask
+
+    Parameters
+    ----------
+        mask : int
+            The bitmask of cards
+
+        n : int, 0 <= n < popcount(mask)
+            The position of the card among those set
+
+    Returns
+    -------
+        int : The card index
+    """
+    for _ in range(n):
+        mask &= mask - 1
+    if not mask:
+        raise ValueError(f"n must be less than the number of cards set, received {n}")
+    return (mask & -mask).bit_length() - 1
+
+
+def left_bar_ix(trump: int) -> int:
+    """
+    Returns the index of the left bar for a trump suit
+    """
+    return LEFT_SUIT[trump] * len(CARD_FACES) + JACK
+
+
+def effective_suit(ix: int, trump: int) -> int:
+    """
+    Returns the suit a card belongs to during play, given the trump
+    suit (the left bar belongs to the trump suit)
+
+    Parameters
+    ----------
+        ix : int
+            The card index
+
+        trump : int
+            The trump suit, from euchre.SUITS
+
+    Returns
+    -------
+        int : The effective suit of the card, from euchre.SUITS
+    """
+    if ix == left_bar_ix(trump):
+        return trump
+    return ix // len(CARD_FACES)
+
+
+def _effective_suit_masks(trump: int) -> List[int]:
+    masks = SUIT_MASKS[:]
+    left_bit = 1 << left_bar_ix(trump)
+    masks[LEFT_SUIT[trump]] ^= left_bit
+    masks[trump] |= left_bit
+    return masks
+
+# EFFECTIVE_SUIT_MASKS[trump][suit] are the cards that play as `suit`
+# when `trump` is trump
+EFFECTIVE_SUIT_MASKS = [_effective_suit_masks(trump) for trump in SUITS]
+# EFFECTIVE_SUIT[trump, ix] is the effective suit of card `ix`
+EFFECTIVE_SUIT = array([[effective_suit(ix, trump) for ix in range(NUM_CARDS)]
+                        for trump in SUITS])
+
+
+def _trick_rank(ix: int, trump: int, lead: int) -> int:
+    """
+    The rank of a card within a trick (higher wins), given the trump suit
+    and the effective suit led:
+        trump: 7 (nine) - 11 (ace), 12 (left bar), 13 (right bar)
+        lead suit: 1 (nine) - 6 (ace)
+        any other card: 0
+    """
+    face = ix % len(CARD_FACES)
+    if EFFECTIVE_SUIT[trump, ix] == trump:
+        if ix == trump * len(CARD_FACES) + JACK:
+            return 13
+        if ix == left_bar_ix(trump):
+            return 12
+        return 7 + CARD_FACES.index(face) - (face > JACK)
+    if EFFECTIVE_SUIT[trump, ix] == lead:
+        return 1 + CARD_FACES.index(face)
+    return 0
+
+# TRICK_RANK[trump, lead, ix]
+TRICK_RANK = array([[[_trick_rank(ix, trump, lead) for ix in range(NUM_CARDS)]
+                        for lead in SUITS] for trump in SUITS])
+
+
+# BINOMIAL[n][k] = n choose k
+BINOMIAL = [[comb(n, k) for k in range(NUM_TRICKS + 1)] for n in range(NUM_CARDS + 1)]
+NUM_HANDS = BINOMIAL[NUM_CARDS][NUM_TRICKS]
+
+
+def hand_rank(mask: int) -> int:
+    """
+    Returns the rank of a five-card holding among all C(24,5) holdings
+    (the combinatorial number system, over ascending card indices)
+
+    Parameters
+    ----------
+        mask : int
+            The bitmask of the five cards held
+
+    Returns
+    -------
+        int : The holding's rank, [0, NUM_HANDS)
+    """
+    rank = 0
+    for k, ix in enumerate(mask_ixs(mask)):
+        rank += BINOMIAL[ix][k + 1]
+    return rank
+
+
+def hand_ranks(masks: ndarray) -> ndarray:
+    """
+    Vectorized `hand_rank`, over an array of five-card bitmasks
+    """
+    masks = asarray(masks, dtype=int64)
+    ranks = zeros(masks.shape, dtype=int64)
+    n_seen = zeros(masks.shape, dtype=int64)
+    binomial = array(BINOMIAL)
+    for ix in range(NUM_CARDS):
+        held = (masks >> ix) & 1
+        n_seen += held
+        ranks += held * binomial[ix, minimum(n_seen, NUM_TRICKS)]
+    return ranks
+
+
+def all_hands() -> ndarray:
+    """
+    Returns the bitmasks of all five-card holdings, ordered by `hand_rank`
+    """
+    masks = zeros(NUM_HANDS, dtype=int64)
+    for ixs in combinations(range(NUM_CARDS), NUM_TRICKS):
+        mask = sum(1 << ix for ix in ixs)
+        masks[hand_rank(mask)] = mask
+    return masks
@@ -0,0 +1,286 @@
+"""
+Empirical calibration of five-card holdings: for each suit-canonical holding,
+upcard face and seat relative to the dealer, the probability that the
+seat's team wins the hand and its expected net points, if the seat's team
+orders up the upcard. Estimated from heuristic rollouts of many random deals,
+split across worker processes.
+
+Holdings are made suit-canonical relative to the upcard: the upcard's suit
+is relabelled clubs and the left bar's suit spades, and the two other
+suits (which are interchangeable) are ordered to give the lower rank.
+
+The table is saved as a single .npy file, loaded memory-mapped, so queries
+are O(1) without reading the table into memory.
+"""
+from multiprocessing import Pool
+from typing import List, Tuple
+
+from numpy import (arange, argsort, array, bincount, int64, load as np_load, minimum,
+                   ndarray, save as np_save, stack, zeros)
+from numpy.random import SeedSequence, default_rng
+
+from .bidding_sim import exchange_with_kitty
+from .bitmask import NUM_CARDS, NUM_HANDS, card_ix, cards_mask, hand_ranks
+from .card import Card
+from .euchre import (CARD_FACES, CLUB, DIAMOND, HEART, LEFT_SUIT, NUM_PLAYERS, NUM_TRICKS,
+                     NUM_TRICKS_TO_WIN_HAND, SPADE, SUITS)
+from .hand import Hand
+from .rollout import HEURISTIC, POLICIES, rollout_batch
+
+# fields of the last table axis
+COUNT = 0
+WIN_PROB = 1
+EXPECTED_POINTS = 2
+# seat positions relative to the dealer (0 is left of the dealer)
+NUM_POSITIONS = NUM_PLAYERS
+DEALER_POSITION = NUM_PLAYERS - 1
+# deals simulated per task
+CHUNK_SIZE = 1 << 16
+
+# net points of the bidding team, by the number of tricks it wins
+NET_POINTS = array([Hand._calc_points(tricks, True) if tricks >= NUM_TRICKS_TO_WIN_HAND
+                    else -Hand._calc_points(NUM_TRICKS - tricks, False)
+                    for tricks in range(NUM_TRICKS + 1)])
+
+
+def _canonical_perms(upcard_suit: int) -> List[List[int]]:
+    """
+    The two suit relabellings (actual suit -> canonical suit) taking the
+    upcard's suit to clubs and the left bar's suit to spades
+    """
+    others = [s for s in SUITS if s not in (upcard_suit, LEFT_SUIT[upcard_suit])]
+    perms = []
+    for first, second in [others, others[::-1]]:
+        perm = [0] * len(SUITS)
+        perm[upcard_suit] = CLUB
+        perm[LEFT_SUIT[upcard_suit]] = SPADE
+        perm[first] = DIAMOND
+        perm[second] = HEART
+        perms.append(perm)
+    return perms
+
+# CANONICAL_PERMS[upcard suit, variant, suit]
+CANONICAL_PERMS = array([_canonical_perms(suit) for suit in SUITS])
+
+
+def canonical_ranks(hands: ndarray, upcard: ndarray) -> ndarray:
+    """
+    The rank (bitmask.hand_rank) of each holding, relabelled suit-canonically
+    relative to the upcard
+
+    Parameters
+    ----------
+        hands : np.array
+            Five-card bitmasks
+
+        upcard : np.array
+            The index of the upcard, per holding (broadcast against hands)
+
+    Returns
+    -------
+        np.array : The canonical ranks, [0, NUM_HANDS)
+    """
+    hands = array(hands, dtype=int64)
+    upcard_suit = array(upcard) // len(CARD_FACES)
+    suit_bits = (1 << len(CARD_FACES)) - 1
+    ranks = []
+    for variant in range(2):
+        relabelled = zeros(hands.shape, dtype=int64)
+        for suit in SUITS:
+            target = CANONICAL_PERMS[upcard_suit, variant, suit]
+            relabelled |= ((hands >> (suit * len(CARD_FACES))) & suit_bits) << (target * len(CARD_FACES))
+        ranks.append(hand_ranks(relabelled))
+    return minimum(*ranks)
+
+
+class CalibrationTable:
+    """
+    Empirical outcomes of ordering up the upcard, by holding
+
+    Attributes
+    ----------
+        table : np.array
+            (NUM_HANDS x 6 upcard faces x 4 positions x 3) float64: the
+            number of deals observed, the probability of winning the hand,
+            and the expected net points of the seat's team. Indexed by
+            canonical holding rank
+    """
+
+    def __init__(self, table: ndarray):
+        if table.shape != (NUM_HANDS, len(CARD_FACES), NUM_POSITIONS, 3):
+            raise ValueError(f"table has shape {table.shape}")
+        self.table = table
+
+    @classmethod
+    def build(cls, n_deals: int, n_workers: int = 1, seed: int = None,
+            policy: str = HEURISTIC) -> 'CalibrationTable':
+        """
+        Estimate the table from rollouts of random deals
+
+        Parameters
+        ----------
+            n_deals : int
+                The number of deals to simulate. Each deal is observed from
+                all four seats
+
+            n_workers : int, default = 1
+                The number of worker processes
+
+            seed : int, default = None
+                Seeds the simulation. Results don't depend on n_workers
+
+            policy : str, default = rollout.HEURISTIC
+                The trick play policy (see rollout.POLICIES)
+
+        Returns
+        -------
+            CalibrationTable : The estimated table
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"policy must be one of {POLICIES}, received {policy}")
+        sizes = [min(CHUNK_SIZE, n_deals - start) for start in range(0, n_deals, CHUNK_SIZE)]
+        tasks = list(zip(sizes, SeedSequence(seed).spawn(len(sizes)), [policy] * len(sizes)))
+        if n_workers > 1:
+            with Pool(n_workers) as pool:
+                partials = pool.map(_simulate_sums, tasks)
+        else:
+            partials = [_simulate_sums(task) for task in tasks]
+        counts = zeros(NUM_HANDS * len(CARD_FACES) * NUM_POSITIONS)
+        wins = zeros(counts.shape)
+        points = zeros(counts.shape)
+        for p_counts, p_wins, p_points in partials:
+            counts += p_counts
+            wins += p_wins
+            points += p_points
+        observed = counts.clip(min=1)
+        table = stack([counts, wins / observed, points / observed], axis=1)
+        return cls(table.reshape(NUM_HANDS, len(CARD_FACES), NUM_POSITIONS, 3))
+
+    def save(self, file_path: str) -> None:
+        """
+        Save the table to a .npy file
+
+        Parameters
+        ----------
+            file_path : str
+                The destination file
+
+        Returns
+        -------
+            None
+        """
+        np_save(file_path, self.table)
+
+    @classmethod
+    def load(cls, file_path: str, mmap: bool = True) -> 'CalibrationTable':
+        """
+        Load a table saved with `save`
+
+        Parameters
+        ----------
+            file_path : str
+                The source file
+
+            mmap : bool, default = True
+                If the table should be memory-mapped (read-only), rather
+                than read into memory
+
+        Returns
+        -------
+            CalibrationTable : The loaded table
+        """
+        return cls(np_load(file_path, mmap_mode="r" if mmap else None))
+
+    def lookup(self, cards: List[Card], upcard: Card, position: int) -> Tuple[int, float, float]:
+        """
+        Look up a holding
+
+        Parameters
+        ----------
+            cards : List[card.Card]
+                The five cards held
+
+            upcard : card.Card
+                The face-up kitty card
+
+            position : int
+                The seat's position relative to the dealer, 0 (left of the
+                dealer) - 3 (the dealer)
+
+        Returns
+        -------
+            int : The number of deals observed
+            float : The probability of the seat's team winning the hand
+            float : The expected net points of the seat's team
+        """
+        rank = int(canonical_ranks(cards_mask(cards), card_ix(upcard)))
+        count, win_prob, points = self.table[rank, upcard.face, position]
+        return int(count), float(win_prob), float(points)
+
+    def lookup_role(self, cards: List[Card], upcard: Card, is_dealer: bool,
+                    dealer_is_team_member: bool) -> Tuple[int, float, float]:
+        """
+        Look up a holding by the seat's role, as known to a Player during
+        bidding. The dealer's opponents' positions are pooled
+
+        Parameters
+        ----------
+            cards : List[card.Card]
+                The five cards held
+
+            upcard : card.Card
+                The face-up kitty card
+
+            is_dealer : bool
+                If the seat is the dealer's
+
+            dealer_is_team_member : bool
+                If the dealer is the seat's team member
+
+        Returns
+        -------
+            int : The number of deals observed
+            float : The probability of the seat's team winning the hand
+            float : The expected net points of the seat's team
+        """
+        if is_dealer:
+            return self.lookup(cards, upcard, DEALER_POSITION)
+        if dealer_is_team_member:
+            return self.lookup(cards, upcard, 1)
+        first = self.lookup(cards, upcard, 0)
+        third = self.lookup(cards, upcard, 2)
+        count = first[0] + third[0]
+        if count == 0:
+            return 0, 0.0, 0.0
+        return (count, (first[0] * first[1] + third[0] * third[1]) / count,
+                (first[0] * first[2] + third[0] * third[2]) / count)
+
+
+def _simulate_sums(task: Tuple[int, SeedSequence, str]) -> Tuple[ndarray, ndarray, ndarray]:
+    """
+    Simulate deals, ordering up the upcard and playing the hand out. Returns
+    the flattened per-cell observation counts, wins, and net point totals
+    """
+    n, seed, policy = task
+    rng = default_rng(seed)
+    deals = argsort(rng.random((n, NUM_CARDS)), axis=1)
+    hands = zeros((n, NUM_PLAYERS), dtype=int64)
+    for seat in range(NUM_PLAYERS):
+        hands[:, seat] = (1 << deals[:, NUM_TRICKS * seat:NUM_TRICKS * (seat + 1)]).sum(axis=1)
+    upcard = deals[:, NUM_PLAYERS * NUM_TRICKS]
+    # w.l.o.g. seat 3 deals, so seats are positions
+    dealer = DEALER_POSITION
+    held = exchange_with_kitty(hands, dealer, upcard, True)
+    # play doesn't depend on the bidder, so one rollout scores every seat
+    played = rollout_batch(held, upcard // len(CARD_FACES), (dealer + 1) % NUM_PLAYERS,
+                        0, policy, rng)
+    n_cells = NUM_HANDS * len(CARD_FACES) * NUM_POSITIONS
+    ranks = canonical_ranks(hands, upcard[:, None])
+    faces = upcard % len(CARD_FACES)
+    cells = (ranks * len(CARD_FACES) + faces[:, None]) * NUM_POSITIONS + arange(NUM_POSITIONS)
+    team_tricks = played.tricks[:, arange(NUM_PLAYERS) % 2]
+    counts = bincount(cells.ravel(), minlength=n_cells)
+    wins = bincount(cells.ravel(), weights=(team_tricks >= NUM_TRICKS_TO_WIN_HAND).ravel(),
+                    minlength=n_cells)
+    points = bincount(cells.ravel(), weights=NET_POINTS[team_tricks].ravel(), minlength=n_cells)
+    return counts, wins, points
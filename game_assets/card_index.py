@@ -0,0 +1,157 @@
+"""
+A player's cards, indexed for trick play once trump is known.
+
+Cards are kept sorted by the player's trump-relative strength, ties broken
+by their order in hand (the order `HeuristicPlayer` breaks ties by), both
+overall and within each suit that may be led: the cards that must follow
+when that suit leads. The weakest card is then the head of a list, the
+strongest found by bisection, and the weakest card that beats the trick's
+current winner by bisection on trick rank (or a scan of the followed suit,
+where strength doesn't increase with rank). Cards are added by bisection.
+
+Following mirrors `HeuristicPlayer.cards_in_suit`: a card follows the suit
+of its face, and the left bar also follows trump.
+"""
+from bisect import bisect_left, bisect_right, insort
+from typing import Sequence, Tuple
+
+from .bitmask import NUM_CARDS, NUM_FACES, TRICK_RANK, card_ix, left_bar_ix
+from .card import Card
+from .euchre import SUITS
+
+# an entry: (strength, order in hand, card index, card)
+Entry = Tuple[float, int, int, Card]
+
+# TRICK_RANK as lists, for scalar lookups
+_TRICK_RANK = TRICK_RANK.tolist()
+# FOLLOWS[trump][ix]: the suits led that card ix must follow
+FOLLOWS = [[(ix // NUM_FACES, trump) if ix == left_bar_ix(trump) else (ix // NUM_FACES,)
+            for ix in range(NUM_CARDS)] for trump in SUITS]
+
+
+def _strength(entry: Entry) -> float:
+    return entry[0]
+
+
+class CardIndex:
+    """
+    Cards held, sorted by strength under a trump suit
+    """
+
+    def __init__(self, cards: Sequence[Card], trump: int, strengths: Sequence[float]):
+        """
+        Parameters
+        ----------
+            cards : Sequence[card.Card]
+                The cards held, in hand order
+
+            trump : int
+                The trump suit, from euchre.SUITS
+
+            strengths : Sequence[float]
+                The strength of each card index (see bitmask.card_ix) under
+                trump
+        """
+        self.trump = trump
+        self.strengths = strengths
+        self._ranks = _TRICK_RANK[trump]
+        self._follows = FOLLOWS[trump]
+        self._entries = {}
+        for order, card in enumerate(cards):
+            ix = card_ix(card)
+            self._entries[ix] = (strengths[ix], order, ix, card)
+        self.cards = sorted(self._entries.values())
+        self._n_added = len(self.cards)
+        self.followers = [[], [], [], []]
+        for entry in self.cards:
+            for suit in self._follows[entry[2]]:
+                self.followers[suit].append(entry)
+        # if the ranks of each suit's followers increase with strength,
+        # checked on first use
+        self._ordered = [None] * len(SUITS)
+
+    def add(self, card: Card) -> None:
+        """
+        Add a card, after those already held
+        """
+        ix = card_ix(card)
+        entry = self._entries[ix] = (self.strengths[ix], self._n_added, ix, card)
+        self._n_added += 1
+        insort(self.cards, entry)
+        for suit in self._follows[ix]:
+            insort(self.followers[suit], entry)
+            self._ordered[suit] = None
+
+    def remove(self, card: Card) -> None:
+        """
+        Remove a held card
+        """
+        ix = card_ix(card)
+        entry = self._entries.pop(ix)
+        self.cards.remove(entry)
+        for suit in self._follows[ix]:
+            self.followers[suit].remove(entry)
+
+    def strongest(self) -> Card:
+        """
+        The strongest card (the first held, of equals)
+        """
+        return self.cards[bisect_left(self.cards, self.cards[-1][0], key=_strength)][3]
+
+    def weakest(self, lead: int = None) -> Card:
+        """
+        The weakest legal card (the first held, of equals)
+
+        Parameters
+        ----------
+            lead : int, default = None
+                The suit led, if any
+
+        Returns
+        -------
+            card.Card : the card
+        """
+        if lead is not None and self.followers[lead]:
+            return self.followers[lead][0][3]
+        return self.cards[0][3]
+
+    def trick_winner(self, lead: int, cards: Sequence[Card]) -> int:
+        """
+        The position of the winning card among a trick's cards, in order of
+        play
+        """
+        ranks = self._ranks[lead]
+        return max(range(len(cards)), key=lambda pos: ranks[card_ix(cards[pos])])
+
+    def weakest_winner(self, lead: int, best: Card) -> Card:
+        """
+        The weakest legal card beating a trick's winning card (the first
+        held, of equals)
+
+        Parameters
+        ----------
+            lead : int
+                The suit led
+
+            best : card.Card
+                The winning card
+
+        Returns
+        -------
+            card.Card : the card, or None if no legal card wins
+        """
+        # void in the suit led, only trump can win
+        suit = lead if self.followers[lead] else self.trump
+        followers = self.followers[suit]
+        ranks = self._ranks[lead]
+        rank = ranks[card_ix(best)]
+        if self._ordered[suit] is None:
+            self._ordered[suit] = all(ranks[a[2]] < ranks[b[2]]
+                                      for a, b in zip(followers, followers[1:]))
+        if self._ordered[suit]:
+            pos = bisect_right(followers, rank, key=lambda e: ranks[e[2]])
+            return followers[pos][3] if pos < len(followers) else None
+        return next((e[3] for e in followers if ranks[e[2]] > rank), None)
+
+    def __len__(self):
+        return len(self.cards)
@@ -0,0 +1,101 @@
+"""
+A bank of pre-shuffled decks, so tables (in any process) can replay the
+same sequence of deals: common random numbers when comparing
+configurations.
+
+Each deal is a deck order as card indices (see `bitmask.card_ix`): seat s
+is dealt cards [5s, 5s + 5) and card 20 is the face-up kitty card, as
+`Table._deal`.
+"""
+from typing import List
+
+from numpy import argsort, load as np_load, ndarray, save as np_save, uint8
+from numpy.random import default_rng
+
+from .bitmask import NUM_CARDS, ix_card
+from .card import Card
+
+# Card instances by index, shared by every deck dealt
+CARDS = [ix_card(ix) for ix in range(NUM_CARDS)]
+
+
+class DealBank:
+    """
+    A sequence of deck orders
+
+    Attributes
+    ----------
+        decks : np.array
+            (n_deals x 24) uint8 card indices, in deal order
+    """
+
+    def __init__(self, decks: ndarray):
+        if decks.ndim != 2 or decks.shape[1] != NUM_CARDS:
+            raise ValueError(f"decks has shape {decks.shape}")
+        self.decks = decks
+
+    @classmethod
+    def generate(cls, n_deals: int, seed: int = None) -> 'DealBank':
+        """
+        Shuffle n_deals decks
+
+        Parameters
+        ----------
+            n_deals : int
+                The number of deals
+
+            seed : int, default = None
+                Seeds the shuffles
+
+        Returns
+        -------
+            DealBank : the deals
+        """
+        rng = default_rng(seed)
+        return cls(argsort(rng.random((n_deals, NUM_CARDS)), axis=1).astype(uint8))
+
+    def __len__(self) -> int:
+        return len(self.decks)
+
+    def deck(self, deal_ix: int) -> List[Card]:
+        """
+        The deck of a deal
+
+        Parameters
+        ----------
+            deal_ix : int
+                The deal's index
+
+        Returns
+        -------
+            List[card.Card] : the deck, in deal order
+        """
+        if not 0 <= deal_ix < len(self.decks):
+            raise IndexError(f"Deal {deal_ix} is outside the bank of {len(self.decks)} deals")
+        return [CARDS[ix] for ix in self.decks[deal_ix].tolist()]
+
+    def save(self, file_path: str) -> None:
+        """
+        Save the bank to a .npy file
+        """
+        np_save(file_path, self.decks)
+
+    @classmethod
+    def load(cls, file_path: str, mmap: bool = True) -> 'DealBank':
+        """
+        Load a bank saved with `save`
+
+        Parameters
+        ----------
+            file_path : str
+                The source file
+
+            mmap : bool, default = True
+                If the bank should be memory-mapped (read-only, shared
+                between processes by the OS), rather than read into memory
+
+        Returns
+        -------
+            DealBank : The loaded bank
+        """
+        return cls(np_load(file_path, mmap_mode="r" if mmap else None))
@@ -0,0 +1,221 @@
+"""
+A VectorEuchreEnv sharded over worker processes.
+
+Playing the non-learning seats is CPU bound Python, so the tables are
+split into contiguous shards, each stepped by a worker process running a
+VectorEuchreEnv of its shard. Observations, legal-action masks, rewards,
+done flags and the actions themselves live in one shared memory block:
+workers write their shard's results straight into it, and the learner
+reads the whole arrays without copying. Pipes only carry the commands
+("reset", "step", ...) and their acknowledgements, which synchronize the
+steps.
+
+With the same seed, results are identical to a VectorEuchreEnv of the same
+size (each worker's tables are seeded as that slice of the tables).
+"""
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import Connection
+from multiprocessing.shared_memory import SharedMemory
+from traceback import format_exc
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from numpy import array_split, bool_, dtype, float64, int64, ndarray
+from numpy import prod as np_prod
+
+from .vector_env import N_ACTIONS, STATE_SIZE, VectorEuchreEnv
+from ..players.heuristic_player import HeuristicPlayer
+from ..players.player import Player
+
+RESET = "reset"
+STEP = "step"
+SCORES = "scores"
+CLOSE = "close"
+
+
+def _layout(n_envs: int) -> Tuple[List[Tuple[str, Tuple[int, ...], dtype, int]], int]:
+    """
+    The arrays of the shared block: (name, shape, dtype, byte offset) each,
+    8-byte aligned, and the block's size
+    """
+    arrays = [("observations", (n_envs, STATE_SIZE), dtype(float64)),
+              ("legal_masks", (n_envs, N_ACTIONS), dtype(bool_)),
+              ("rewards", (n_envs,), dtype(float64)),
+              ("dones", (n_envs,), dtype(bool_)),
+              ("actions", (n_envs,), dtype(int64))]
+    layout = []
+    offset = 0
+    for name, shape, array_dtype in arrays:
+        layout.append((name, shape, array_dtype, offset))
+        offset += -(-int(np_prod(shape)) * array_dtype.itemsize // 8) * 8
+    return layout, offset
+
+
+def _views(shm: SharedMemory, n_envs: int) -> Dict[str, ndarray]:
+    """
+    The arrays of a shared block, as views of its buffer
+    """
+    return {name: ndarray(shape, array_dtype, shm.buf, offset)
+            for name, shape, array_dtype, offset in _layout(n_envs)[0]}
+
+
+def _worker(conn: Connection, shm_name: str, n_envs: int, first_env: int, last_env: int,
+            env_kwargs: Dict) -> None:
+    """
+    Step the tables [first_env, last_env) on command, in the shared block
+    """
+    shm = SharedMemory(shm_name)
+    try:
+        views = _views(shm, n_envs)
+        shard = slice(first_env, last_env)
+        env = VectorEuchreEnv(last_env - first_env, first_env=first_env,
+                              buffers=[views[name][shard] for name in
+                                       ("observations", "legal_masks", "rewards", "dones")],
+                              **env_kwargs)
+        actions = views["actions"][shard]
+        while True:
+            command = conn.recv()
+            try:
+                if command == RESET:
+                    env.reset()
+                    conn.send(None)
+                elif command == STEP:
+                    env.step(actions)
+                    conn.send(None)
+                elif command == SCORES:
+                    conn.send([table.get_scores() for table in env.tables])
+                elif command == CLOSE:
+                    break
+            except Exception:
+                conn.send(RuntimeError(f"Worker of envs [{first_env}, {last_env}) failed:\n{format_exc()}"))
+    finally:
+        conn.close()
+        # the mapping is released as the worker exits, if views remain
+        try:
+            shm.close()
+        except BufferError:
+            pass
+
+
+class SubprocVectorEuchreEnv:
+    """
+    VectorEuchreEnv's interface, over tables stepped by worker processes.
+    The arrays returned are views of shared memory, overwritten by the next
+    step. Close the environment (or use it as a context manager) to stop
+    the workers & free the memory
+    """
+
+    def __init__(self, n_envs: int, n_workers: int = 2,
+                make_player: Callable[[int], Player] = HeuristicPlayer, learner_seat: int = 0,
+                pickup_act = 1/3, trump_call_act = 0.55, seed: int = None):
+        """
+        Parameters
+        ----------
+            n_envs : int
+                The number of tables
+
+            n_workers : int, default = 2
+                The number of worker processes (at most n_envs)
+
+            make_player, learner_seat, pickup_act, trump_call_act, seed
+                See VectorEuchreEnv. make_player must be picklable
+        """
+        if n_envs < 1:
+            raise ValueError(f"n_envs must be positive, received {n_envs}")
+        if n_workers < 1:
+            raise ValueError(f"n_workers must be positive, received {n_workers}")
+        self.n_envs = n_envs
+        self._shm = SharedMemory(create=True, size=_layout(n_envs)[1])
+        views = _views(self._shm, n_envs)
+        self.observations = views["observations"]
+        self.legal_masks = views["legal_masks"]
+        self.rewards = views["rewards"]
+        self.dones = views["dones"]
+        self._actions = views["actions"]
+        env_kwargs = {"make_player": make_player, "learner_seat": learner_seat,
+                      "pickup_act": pickup_act, "trump_call_act": trump_call_act, "seed": seed}
+        self._conns = []
+        self._workers = []
+        self.shards = [(int(shard[0]), int(shard[-1]) + 1)
+                       for shard in array_split(range(n_envs), min(n_workers, n_envs))]
+        for first_env, last_env in self.shards:
+            conn, worker_conn = Pipe()
+            worker = Process(target=_worker, daemon=True,
+                             args=(worker_conn, self._shm.name, n_envs, first_env, last_env,
+                                   env_kwargs))
+            worker.start()
+            worker_conn.close()
+            self._conns.append(conn)
+            self._workers.append(worker)
+        self._reset = False
+        self.closed = False
+
+    def _command(self, command: str) -> List:
+        """
+        Send a command to every worker, and wait for their replies
+        """
+        if self.closed:
+            raise RuntimeError("The environment is closed")
+        for conn in self._conns:
+            conn.send(command)
+        replies = [conn.recv() for conn in self._conns]
+        for reply in replies:
+            if isinstance(reply, Exception):
+                raise reply
+        return replies
+
+    def reset(self) -> Tuple[ndarray, ndarray]:
+        """
+        See VectorEuchreEnv.reset
+        """
+        self._command(RESET)
+        self._reset = True
+        return self.observations, self.legal_masks
+
+    def step(self, actions: Sequence[int]) -> Tuple[ndarray, ndarray, ndarray, ndarray]:
+        """
+        See VectorEuchreEnv.step
+        """
+        if not self._reset:
+            raise RuntimeError("reset must be called before step")
+        if len(actions) != self.n_envs:
+            raise ValueError(f"Expected {self.n_envs} actions, received {len(actions)}")
+        for env_ix, action in enumerate(actions):
+            action = int(action)
+            if not 0 <= action < N_ACTIONS or not self.legal_masks[env_ix, action]:
+                raise ValueError(f"Action {action} is not legal for env {env_ix}")
+        self._actions[:] = actions
+        self._command(STEP)
+        return self.observations, self.legal_masks, self.rewards, self.dones
+
+    def get_scores(self) -> List[Tuple[int, int]]:
+        """
+        The scores of each table, see Table.get_scores
+        """
+        return [scores for shard in self._command(SCORES) for scores in shard]
+
+    def close(self) -> None:
+        """
+        Stop the workers, and free the shared memory. The arrays returned
+        are invalid once closed
+        """
+        if self.closed:
+            return
+        for conn in self._conns:
+            conn.send(CLOSE)
+        for conn, worker in zip(self._conns, self._workers):
+            worker.join()
+            conn.close()
+        self.observations = self.legal_masks = self.rewards = self.dones = self._actions = None
+        self._shm.unlink()
+        # arrays still referenced keep the mapping until they're released
+        try:
+            self._shm.close()
+        except BufferError:
+            pass
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,246 @@
+"""
+A Gym-style vectorized environment of trick play, over N `Table`s.
+
+One seat of each table is the learner's. Its bidding (and discarding, as
+dealer) is RLTrickPlayer's heuristic; the other three seats are players of
+the given kind (e.g. HeuristicPlayer, RandomPlayer), driven internally.
+Each table runs its hands through `Table.hand_turns` (the hand loop of
+`Table.play_hand`), suspended at the learner's turn and resumed by `step`,
+so no table ever waits on another.
+
+An episode is a hand. `step` plays each learner's card, then the table
+until the learner's next turn: exactly one trick completes, whose reward
+(see RLTrickPlayer.set_last_reward) is the step's. After the hand's last
+trick the table is reset automatically, deal & bidding included, and the
+observation returned is the new hand's first.
+
+Observations are the learner's `RLTrickPlayer._get_state_repr` encoding
+(STATE_SIZE values). Actions are positions of that encoding's card space
+(N_ACTIONS, trump-relative, see RLTrickPlayer._get_card_repr_ix), and the
+legal-action masks mark the cards that may be played: by the engine's rule
+(see batched_player.legal_play_mask), following the printed suit led, as
+RandomPlayer's seats do. HeuristicPlayer's seats differ only in letting
+the left bar also follow trump (see card_index.FOLLOWS). Results are written
+into arrays the environment holds (or is given, see `VectorEuchreEnv`),
+and are overwritten by the next step.
+"""
+from typing import Callable, Generator, Sequence, Tuple
+
+from numpy import bool_, float64, ndarray, zeros
+from numpy.random import SeedSequence
+
+from ..bitmask import NUM_CARDS, card_ix, cards_mask, ix_card, mask_ixs
+from ..card import Card
+from ..euchre import NUM_PLAYERS, SUITS, TEAMS
+from ..hand import Hand
+from ..players.batched_player import legal_play_mask
+from ..players.heuristic_player import HeuristicPlayer
+from ..players.partial_rl_player import RLTrickPlayer
+from ..players.player import Player
+from ..table import Table
+from ..trick import Trick
+
+STATE_SIZE = 155
+N_ACTIONS = 25
+# CARD_ACTION[trump][ix]: the action playing card ix; ACTION_CARD the inverse
+# (-1 for the action of no card, the left bar's printed position)
+CARD_ACTION = [[RLTrickPlayer._get_card_repr_ix(ix_card(ix), trump) for ix in range(NUM_CARDS)]
+               for trump in SUITS]
+ACTION_CARD = [[row.index(action) if action in row else -1 for action in range(N_ACTIONS)]
+               for row in CARD_ACTION]
+
+
+class LearnerSeat(RLTrickPlayer):
+    """
+    The learner's seat at an environment's table: bids as RLTrickPlayer,
+    and plays the cards chosen by the environment's actions
+    """
+
+    def __init__(self, id: int, pickup_act = 1/3, trump_call_act = 0.55):
+        super().__init__(id, None, pickup_act, trump_call_act)
+
+    def play_card(self, active_hand: Hand, active_trick: Trick, dealer_seat: int, lead_seat: int) -> Card:
+        raise RuntimeError("The learner's cards are played by VectorEuchreEnv.step")
+
+    def play_ix(self, ix: int) -> Card:
+        """
+        Play the held card of index ix (see bitmask.card_ix)
+        """
+        for pos, card in enumerate(self.cards_held):
+            if card_ix(card) == ix:
+                played_card = self.cards_held.pop(pos)
+                self._remove_card_score(played_card)
+                return played_card
+        raise ValueError(f"{ix_card(ix)} is not held")
+
+
+class VectorEuchreEnv:
+    """
+    N tables of trick play, stepped together. See the module docstring
+
+    Attributes
+    ----------
+        tables : List[table.Table]
+            The tables, whose scores & event sinks may be used as usual
+
+        learners : List[LearnerSeat]
+            The learner's seat at each table
+    """
+
+    def __init__(self, n_envs: int, make_player: Callable[[int], Player] = HeuristicPlayer,
+                learner_seat: int = 0, pickup_act = 1/3, trump_call_act = 0.55,
+                seed: int = None, buffers: Sequence[ndarray] = None, first_env: int = 0):
+        """
+        Parameters
+        ----------
+            n_envs : int
+                The number of tables
+
+            make_player : Callable[[int], player.Player], default = HeuristicPlayer
+                Builds the non-learning players, from their ID
+
+            learner_seat : int, default = 0
+                The learner's seat at every table
+
+            pickup_act, trump_call_act : float, default = 1/3, 0.55
+                The learner's bidding thresholds, see HeuristicPlayer
+
+            seed : int, default = None
+                If provided, each table is seeded (see `Table`) from a seed
+                spawned from it, so runs are reproducible
+
+            buffers : Sequence[ndarray], default = None
+                The arrays results are written into: observations
+                (n_envs, STATE_SIZE) float64, legal-action masks
+                (n_envs, N_ACTIONS) bool, rewards (n_envs,) float64, done
+                flags (n_envs,) bool. Allocated if None
+
+            first_env : int, default = 0
+                The index of the first table, when the tables are a slice
+                of a larger vector (their seeds & player IDs are then those
+                of the larger vector's)
+        """
+        if n_envs < 1:
+            raise ValueError(f"n_envs must be positive, received {n_envs}")
+        if not 0 <= learner_seat < NUM_PLAYERS:
+            raise ValueError(f"learner_seat must be in [0, {NUM_PLAYERS}), received {learner_seat}")
+        self.n_envs = n_envs
+        self.learner_seat = learner_seat
+        if seed is None:
+            seeds = [None] * n_envs
+        else:
+            # as SeedSequence(seed).spawn, from the first table's
+            seeds = [int(SeedSequence(seed, spawn_key=(env_ix,)).generate_state(1)[0])
+                     for env_ix in range(first_env, first_env + n_envs)]
+        self.learners = []
+        self.tables = []
+        for env_ix in range(n_envs):
+            first_id = (first_env + env_ix) * NUM_PLAYERS
+            learner = LearnerSeat(first_id + learner_seat, pickup_act, trump_call_act)
+            players = [learner if seat == learner_seat else make_player(first_id + seat)
+                       for seat in range(NUM_PLAYERS)]
+            self.learners.append(learner)
+            self.tables.append(Table(*players, seed=seeds[env_ix]))
+        if buffers is None:
+            buffers = (zeros((n_envs, STATE_SIZE), dtype=float64),
+                       zeros((n_envs, N_ACTIONS), dtype=bool_),
+                       zeros(n_envs, dtype=float64),
+                       zeros(n_envs, dtype=bool_))
+        self.observations, self.legal_masks, self.rewards, self.dones = buffers
+        self._runs = [None] * n_envs
+        # the learner's turn at each table: (hand, trick)
+        self._turns = [None] * n_envs
+
+    def reset(self) -> Tuple[ndarray, ndarray]:
+        """
+        Abandon any hands in play, zero the scores, and play each table to
+        the learner's first turn of a new hand
+
+        Returns
+        -------
+            ndarray : the (n_envs, STATE_SIZE) observations
+            ndarray : the (n_envs, N_ACTIONS) legal-action masks
+        """
+        for env_ix, table in enumerate(self.tables):
+            table.scores = {team: 0 for team in table.scores}
+            self._runs[env_ix] = self._run(env_ix)
+            self._turns[env_ix] = next(self._runs[env_ix])
+            self._observe(env_ix)
+        self.rewards[:] = 0
+        self.dones[:] = False
+        return self.observations, self.legal_masks
+
+    def step(self, actions: Sequence[int]) -> Tuple[ndarray, ndarray, ndarray, ndarray]:
+        """
+        Play each learner's card, and each table to the learner's next turn
+
+        Parameters
+        ----------
+            actions : Sequence[int]
+                The action of each table, a legal position of N_ACTIONS
+
+        Returns
+        -------
+            ndarray : the (n_envs, STATE_SIZE) observations
+            ndarray : the (n_envs, N_ACTIONS) legal-action masks
+            ndarray : the (n_envs,) rewards of the tricks completed
+            ndarray : the (n_envs,) done flags, True where a hand ended (and
+                the table was reset)
+        """
+        if self._runs[0] is None:
+            raise RuntimeError("reset must be called before step")
+        if len(actions) != self.n_envs:
+            raise ValueError(f"Expected {self.n_envs} actions, received {len(actions)}")
+        for env_ix, action in enumerate(actions):
+            action = int(action)
+            if not 0 <= action < N_ACTIONS or not self.legal_masks[env_ix, action]:
+                raise ValueError(f"Action {action} is not legal for env {env_ix}")
+        for env_ix, action in enumerate(actions):
+            self._turns[env_ix] = self._runs[env_ix].send(int(action))
+            self._observe(env_ix)
+        return self.observations, self.legal_masks, self.rewards, self.dones
+
+    def _observe(self, env_ix: int) -> None:
+        """
+        Write a table's observation & legal-action mask, at the learner's
+        turn
+        """
+        active_hand, active_trick = self._turns[env_ix]
+        learner = self.learners[env_ix]
+        self.observations[env_ix] = learner._get_state_repr(active_hand, active_trick)
+        legal = legal_play_mask(cards_mask(learner.cards_held), active_trick)
+        mask = self.legal_masks[env_ix]
+        mask[:] = False
+        to_action = CARD_ACTION[active_hand.trump]
+        for ix in mask_ixs(legal):
+            mask[to_action[ix]] = True
+
+    def _run(self, env_ix: int) -> Generator[Tuple[Hand, Trick], int, None]:
+        """
+        Play a table's hands through `Table.hand_turns`, yielding (hand,
+        trick) at the learner's turns and receiving its actions. Each
+        trick's reward, and if it ended the hand, are written as it
+        completes
+        """
+        table = self.tables[env_ix]
+        learner = self.learners[env_ix]
+        while True:
+            turns = table.hand_turns(learner)
+            turn = next(turns)
+            round_hand = turn[0]
+            to_card = ACTION_CARD[round_hand.trump]
+            hand_won = None
+            while hand_won is None:
+                action = yield turn
+                # the learner plays once a trick: exactly one trick completes
+                try:
+                    turn = turns.send(learner.play_ix(to_card[action]))
+                except StopIteration:
+                    hand_won = learner.seat in TEAMS[round_hand.winning_team]
+                trick_won = (round_hand.tricks[-1].winning_player_seat - learner.seat) % 2 == 0
+                if hand_won is None:
+                    learner.set_last_reward(trick_won)
+                else:
+                    learner.set_last_reward(trick_won, hand_won, round_hand.points)
+                self.rewards[env_ix] = learner.last_reward
+                self.dones[env_ix] = hand_won is not None
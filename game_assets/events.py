@@ -0,0 +1,223 @@
+"""
+Typed events emitted by a `Table` as a hand is played, and sinks consuming
+them.
+
+Sinks are callables taking a single event, attached with
+`Table.subscribe`. Events are only constructed while a table has
+subscribers, so tables without subscribers play as before.
+
+Events, in the order emitted for a hand:
+    - DealEvent: the cards dealt, and the face-up kitty card
+    - PickupDecision: each kitty round decision
+    - TrumpSelection: the outcome of bidding
+    - CardPlayed: each card played
+    - TrickWon: each scored trick
+    - HandScored: the scored hand
+"""
+from collections import Counter
+from dataclasses import dataclass
+from struct import Struct
+from typing import BinaryIO, Iterator, List, Tuple, Union
+
+from .bitmask import card_ix, ix_card
+from .card import Card
+from .euchre import NUM_PLAYERS, NUM_TRICKS, TEAMS
+
+
+@dataclass(frozen=True)
+class DealEvent:
+    dealer: int
+    hands: Tuple[Tuple[Card, ...], ...]
+    kitty_face_up: Card
+
+
+@dataclass(frozen=True)
+class PickupDecision:
+    seat: int
+    kitty_card: Card
+    picked_up: bool
+
+
+@dataclass(frozen=True)
+class TrumpSelection:
+    bidder: int
+    trump: int
+    pick_up: bool
+    dealer: int
+
+
+@dataclass(frozen=True)
+class CardPlayed:
+    seat: int
+    card: Card
+    trick_number: int
+    lead_seat: int
+
+
+@dataclass(frozen=True)
+class TrickWon:
+    trick_number: int
+    winning_seat: int
+
+
+@dataclass(frozen=True)
+class HandScored:
+    bidder: int
+    trump: int
+    winning_team: int
+    points: int
+
+
+Event = Union[DealEvent, PickupDecision, TrumpSelection, CardPlayed, TrickWon, HandScored]
+EVENT_TYPES = [DealEvent, PickupDecision, TrumpSelection, CardPlayed, TrickWon, HandScored]
+
+
+class EventCounter:
+    """
+    Counts events by type name
+    """
+
+    def __init__(self):
+        self.counts = Counter()
+
+    def __call__(self, event: Event) -> None:
+        self.counts[type(event).__name__] += 1
+
+
+class EventRecorder:
+    """
+    Keeps every event, in order
+    """
+
+    def __init__(self):
+        self.events: List[Event] = []
+
+    def __call__(self, event: Event) -> None:
+        self.events.append(event)
+
+
+class RewardAssigner:
+    """
+    Assigns each seat a reward per trick, as `RLTrickPlayer.set_last_reward`
+    does: +/-0.1 for the seat's team winning/losing the trick and, on the
+    last trick of a hand, +/- the points awarded for winning/losing the hand.
+
+    If players are provided, those supporting `set_last_reward` are passed
+    their results as each trick is won.
+    """
+
+    def __init__(self, players: List = None):
+        """
+        Parameters
+        ----------
+            players : List[player.Player], default = None
+                The table's players, by seat
+        """
+        self.players = players or []
+        # rewards[seat] is the reward of each trick played
+        self.rewards: List[List[float]] = [[] for _ in range(NUM_PLAYERS)]
+        self._last_trick_winner = None
+
+    def __call__(self, event: Event) -> None:
+        if isinstance(event, TrickWon):
+            if event.trick_number < NUM_TRICKS - 1:
+                self._assign(event.winning_seat)
+            else:
+                # the hand's result is added when it is scored
+                self._last_trick_winner = event.winning_seat
+        elif isinstance(event, HandScored):
+            self._assign(self._last_trick_winner, event.winning_team, event.points)
+
+    def _assign(self, trick_winner: int, winning_team: int = None, hand_points: int = 0) -> None:
+        for seat in range(NUM_PLAYERS):
+            trick_won = (trick_winner - seat) % 2 == 0
+            hand_won = None if winning_team is None else seat in TEAMS[winning_team]
+            reward = ((2 ** (trick_won + 1)) - 3) / 10
+            if hand_won is not None:
+                reward += (2 ** (hand_won + 1) - 3) * hand_points
+            self.rewards[seat].append(reward)
+            if seat < len(self.players) and hasattr(self.players[seat], "set_last_reward"):
+                self.players[seat].set_last_reward(trick_won, hand_won, hand_points)
+
+
+# binary records: a type byte, then the event's fields (cards as indices)
+_RECORDS = {
+    DealEvent: Struct(f"<BB{NUM_PLAYERS * NUM_TRICKS + 1}B"),
+    PickupDecision: Struct("<BBBB"),
+    TrumpSelection: Struct("<BbBBB"),
+    CardPlayed: Struct("<BBBBB"),
+    TrickWon: Struct("<BBB"),
+    HandScored: Struct("<BbBBB"),
+}
+
+
+class BinaryEventLogger:
+    """
+    Writes events to a binary stream as compact fixed-size records (cards
+    as single byte indices). Read back with `read_events`
+    """
+
+    def __init__(self, stream: BinaryIO):
+        """
+        Parameters
+        ----------
+            stream : BinaryIO
+                The (binary, writable) destination
+        """
+        self.stream = stream
+
+    def __call__(self, event: Event) -> None:
+        self.stream.write(encode_event(event))
+
+
+def encode_event(event: Event) -> bytes:
+    """
+    Encode an event as a binary record
+    """
+    type_id = EVENT_TYPES.index(type(event))
+    record = _RECORDS[type(event)]
+    if isinstance(event, DealEvent):
+        cards = [card_ix(c) for hand in event.hands for c in hand]
+        return record.pack(type_id, event.dealer, *cards, card_ix(event.kitty_face_up))
+    if isinstance(event, PickupDecision):
+        return record.pack(type_id, event.seat, card_ix(event.kitty_card), event.picked_up)
+    if isinstance(event, TrumpSelection):
+        return record.pack(type_id, event.bidder, event.trump, event.pick_up, event.dealer)
+    if isinstance(event, CardPlayed):
+        return record.pack(type_id, event.seat, card_ix(event.card), event.trick_number,
+                        event.lead_seat)
+    if isinstance(event, TrickWon):
+        return record.pack(type_id, event.trick_number, event.winning_seat)
+    return record.pack(type_id, event.bidder, event.trump, event.winning_team, event.points)
+
+
+def read_events(stream: BinaryIO) -> Iterator[Event]:
+    """
+    Decode the events written by a BinaryEventLogger
+
+    Parameters
+    ----------
+        stream : BinaryIO
+            The (binary, readable) source
+
+    Returns
+    -------
+        Iterator[Event] : The events, in the order written
+    """
+    while type_byte := stream.read(1):
+        event_type = EVENT_TYPES[type_byte[0]]
+        record = _RECORDS[event_type]
+        fields = record.unpack(type_byte + stream.read(record.size - 1))[1:]
+        if event_type is DealEvent:
+            cards = [ix_card(ix) for ix in fields[1:]]
+            hands = tuple(tuple(cards[seat * NUM_TRICKS:(seat + 1) * NUM_TRICKS])
+                        for seat in range(NUM_PLAYERS))
+            yield DealEvent(fields[0], hands, cards[-1])
+        elif event_type is PickupDecision:
+            yield PickupDecision(fields[0], ix_card(fields[1]), bool(fields[2]))
+        elif event_type is TrumpSelection:
+            yield TrumpSelection(fields[0], fields[1], bool(fields[2]), fields[3])
+        elif event_type is CardPlayed:
+            yield CardPlayed(fields[0], ix_card(fields[1]), fields[2], fields[3])
+        else:
+            yield event_type(*fields)
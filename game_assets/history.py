@@ -0,0 +1,193 @@
+"""
+Compact binary hand histories.
+
+Each played hand is stored as a fixed-width record (numpy structured dtype):
+    dealer, upcard, pick_up, bidder, trump : the deal & bidding
+    cards : the 20 cards played (bitmask.card_ix), in play order
+    winners : the seat winning each trick
+    winning_team, points : the hand's result
+    dealt : (optional) the bitmask of each seat's dealt cards
+
+That's 32 bytes per hand, 48 with the dealt cards. The seat playing each
+card isn't stored, it follows from the dealer and trick winners (see
+`played_seats`).
+
+A file is an 8 byte header followed by records. `HistoryWriter` is a
+`Table` event sink appending records; `open_history` memory-maps a file
+as a structured array.
+"""
+from typing import BinaryIO, Union
+
+from numpy import arange, dtype, memmap, ndarray, uint8, zeros
+
+from .bitmask import card_ix, cards_mask
+from .euchre import NUM_PLAYERS, NUM_TRICKS
+from .events import CardPlayed, DealEvent, Event, HandScored, TrickWon, TrumpSelection
+
+MAGIC = b"EUHH"
+VERSION = 1
+HEADER_SIZE = 8
+# header flags
+WITH_DEALT = 1
+
+_FIELDS = [
+    ("dealer", "u1"),
+    ("upcard", "u1"),
+    ("pick_up", "?"),
+    ("bidder", "u1"),
+    ("trump", "u1"),
+    ("cards", "u1", (NUM_PLAYERS * NUM_TRICKS,)),
+    ("winners", "u1", (NUM_TRICKS,)),
+    ("winning_team", "u1"),
+    ("points", "u1"),
+]
+HAND_DTYPE = dtype(_FIELDS)
+HAND_DTYPE_DEALT = dtype(_FIELDS + [("dealt", "<u4", (NUM_PLAYERS,))])
+
+
+def _header(with_dealt: bool) -> bytes:
+    return MAGIC + bytes([VERSION, WITH_DEALT if with_dealt else 0]) + bytes(HEADER_SIZE - len(MAGIC) - 2)
+
+
+def _parse_header(header: bytes) -> dtype:
+    """
+    Returns the record dtype of a file, given its header
+    """
+    if len(header) != HEADER_SIZE or header[:len(MAGIC)] != MAGIC:
+        raise ValueError("Not a hand history file")
+    if header[len(MAGIC)] != VERSION:
+        raise ValueError(f"Unsupported hand history version {header[len(MAGIC)]}")
+    return HAND_DTYPE_DEALT if header[len(MAGIC) + 1] & WITH_DEALT else HAND_DTYPE
+
+
+class HistoryWriter:
+    """
+    Table event sink appending a record per scored hand to a history file.
+    Subscribe it to a table with `Table.subscribe`.
+    """
+
+    def __init__(self, file: Union[str, BinaryIO], with_dealt: bool = False,
+                buffer_hands: int = 4096):
+        """
+        Parameters
+        ----------
+            file : str or BinaryIO
+                The history file path (appended to, created if needed) or
+                an open binary stream (the header is written if the stream
+                is at position 0)
+
+            with_dealt : bool, default = False
+                If the dealt cards should be recorded. Must match an
+                existing file
+
+            buffer_hands : int, default = 4096
+                The number of hands buffered before writing
+        """
+        self.record_dtype = HAND_DTYPE_DEALT if with_dealt else HAND_DTYPE
+        if isinstance(file, str):
+            self.stream = open(file, "ab+")
+            self._owns_stream = True
+        else:
+            self.stream = file
+            self._owns_stream = False
+        if self.stream.tell() == 0:
+            self.stream.write(_header(with_dealt))
+        elif self._owns_stream:
+            self.stream.seek(0)
+            existing = _parse_header(self.stream.read(HEADER_SIZE))
+            self.stream.seek(0, 2)
+            if existing != self.record_dtype:
+                raise ValueError("with_dealt doesn't match the existing file")
+        self._buffer = zeros(buffer_hands, dtype=self.record_dtype)
+        self._n_buffered = 0
+        self._n_played = 0
+
+    def __call__(self, event: Event) -> None:
+        record = self._buffer[self._n_buffered]
+        if isinstance(event, CardPlayed):
+            record["cards"][self._n_played] = card_ix(event.card)
+            self._n_played += 1
+        elif isinstance(event, TrickWon):
+            record["winners"][event.trick_number] = event.winning_seat
+        elif isinstance(event, DealEvent):
+            record["dealer"] = event.dealer
+            record["upcard"] = card_ix(event.kitty_face_up)
+            if "dealt" in self.record_dtype.names:
+                record["dealt"] = [cards_mask(hand) for hand in event.hands]
+        elif isinstance(event, TrumpSelection):
+            record["pick_up"] = event.pick_up
+            record["bidder"] = event.bidder
+            record["trump"] = event.trump
+        elif isinstance(event, HandScored):
+            record["winning_team"] = event.winning_team
+            record["points"] = event.points
+            self._n_played = 0
+            self._n_buffered += 1
+            if self._n_buffered == len(self._buffer):
+                self.flush()
+
+    def flush(self) -> None:
+        """
+        Write any buffered hands
+        """
+        self.stream.write(self._buffer[:self._n_buffered].tobytes())
+        self.stream.flush()
+        self._buffer[:] = 0
+        self._n_buffered = 0
+
+    def close(self) -> None:
+        """
+        Write any buffered hands, and close the file (if opened by the writer)
+        """
+        self.flush()
+        if self._owns_stream:
+            self.stream.close()
+
+    def __enter__(self) -> 'HistoryWriter':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def open_history(file_path: str) -> ndarray:
+    """
+    Memory-map a history file
+
+    Parameters
+    ----------
+        file_path : str
+            The history file
+
+    Returns
+    -------
+        np.memmap : The (read-only) structured array of hand records
+    """
+    with open(file_path, "rb") as f:
+        record_dtype = _parse_header(f.read(HEADER_SIZE))
+        f.seek(0, 2)
+        n_bytes = f.tell() - HEADER_SIZE
+    if n_bytes == 0:
+        return zeros(0, dtype=record_dtype)
+    return memmap(file_path, dtype=record_dtype, mode="r", offset=HEADER_SIZE,
+                shape=(n_bytes // record_dtype.itemsize,))
+
+
+def played_seats(records: ndarray) -> ndarray:
+    """
+    The seat that played each card of each hand
+
+    Parameters
+    ----------
+        records : np.array
+            Hand records
+
+    Returns
+    -------
+        np.array : (n x 20) seats, aligned with records["cards"]
+    """
+    leads = zeros((len(records), NUM_TRICKS), dtype=uint8)
+    leads[:, 0] = (records["dealer"] + 1) % NUM_PLAYERS
+    leads[:, 1:] = records["winners"][:, :-1]
+    offsets = arange(NUM_PLAYERS)
+    return ((leads[:, :, None] + offsets) % NUM_PLAYERS).reshape(len(records), -1).astype(uint8)
@@ -0,0 +1,129 @@
+"""
+Optional per-phase timing and event counting for `Table.play_hand`.
+
+A `Table` constructed with an `Instrumentation` records the time spent in
+each phase of a hand (dealing, trump selection, trick play, trick and hand
+scoring) and counts decisions per player class, kitty pickups, stuck
+dealers and euchres. Tables without one time phases with a no-op timer.
+
+`PROCESS` is a per-process instance tables can share; instances from
+several workers are combined with `merge`.
+"""
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Iterable
+
+# timed phases of a hand
+DEAL = "deal"
+PICK_TRUMP = "pick_trump"
+PLAY_TRICK = "play_trick"
+SCORE_TRICK = "score_trick"
+SCORE_HAND = "score_hand"
+PHASES = [DEAL, PICK_TRUMP, PLAY_TRICK, SCORE_TRICK, SCORE_HAND]
+
+# counted events
+HANDS = "hands"
+KITTY_PICKUPS = "kitty_pickups"
+STUCK_DEALER = "stuck_dealer"
+EUCHRES = "euchres"
+
+
+@dataclass
+class Instrumentation:
+    """
+    Accumulated phase timings and event counts
+
+    Attributes
+    ----------
+        time_ns : Counter
+            Total nanoseconds spent in each phase
+
+        calls : Counter
+            The number of times each phase ran
+
+        events : Counter
+            Event counts: HANDS, KITTY_PICKUPS, STUCK_DEALER, EUCHRES, and
+            decisions by "<player class>.<method>"
+    """
+    time_ns: Counter = field(default_factory=Counter)
+    calls: Counter = field(default_factory=Counter)
+    events: Counter = field(default_factory=Counter)
+
+    def record_time(self, phase: str, elapsed_ns: int) -> None:
+        """
+        Record a run of a phase
+
+        Parameters
+        ----------
+            phase : str
+                The phase, from PHASES
+
+            elapsed_ns : int
+                The time the phase took, in nanoseconds
+
+        Returns
+        -------
+            None
+        """
+        self.time_ns[phase] += elapsed_ns
+        self.calls[phase] += 1
+
+    def count(self, event: str, n: int = 1) -> None:
+        """
+        Count occurrences of an event
+        """
+        self.events[event] += n
+
+    def merge(self, others: Iterable['Instrumentation']) -> 'Instrumentation':
+        """
+        Add the timings and counts of other instances (e.g. from other
+        workers) into this one
+
+        Parameters
+        ----------
+            others : Iterable[Instrumentation]
+                The instances to merge
+
+        Returns
+        -------
+            Instrumentation : this instance
+        """
+        for other in others:
+            self.time_ns.update(other.time_ns)
+            self.calls.update(other.calls)
+            self.events.update(other.events)
+        return self
+
+    def reset(self) -> None:
+        """
+        Clear all timings and counts
+        """
+        self.time_ns.clear()
+        self.calls.clear()
+        self.events.clear()
+
+    def phase_fractions(self) -> Dict[str, float]:
+        """
+        The fraction of the instrumented time spent in each phase. Trick
+        play time excludes trick scoring.
+        """
+        total = sum(self.time_ns.values())
+        return {phase: self.time_ns[phase] / total if total else 0.0 for phase in PHASES}
+
+    def summary(self) -> str:
+        """
+        A human readable summary of timings and counts
+        """
+        lines = []
+        fractions = self.phase_fractions()
+        for phase in PHASES:
+            calls = self.calls[phase]
+            mean_us = self.time_ns[phase] / calls / 1000 if calls else 0.0
+            lines.append(f"{phase:12s} {fractions[phase]:7.1%} {calls:>10d} calls {mean_us:10.2f}us/call")
+        for event, n in sorted(self.events.items()):
+            lines.append(f"{event:40s} {n:>10d}")
+        return "\n".join(lines)
+
+
+# shared by the tables of a process
+PROCESS = Instrumentation()
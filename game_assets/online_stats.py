@@ -0,0 +1,252 @@
+"""
+Streaming statistics of played hands, in memory independent of the number
+of samples.
+
+`OnlineAggregator` is a `Table` event sink (or is fed hands directly with
+`record_hand`) keeping:
+    - running means & variances (Welford) of net points per hand
+    - a histogram of points per hand
+    - euchre & march rates
+    - the mean (& variance) running score of each team per hand index,
+      across samples
+
+Aggregators from several workers are combined with `merge`, so long
+studies needn't keep every sample's scores.
+"""
+from typing import Iterable
+
+from numpy import concatenate, int64, ndarray, sqrt, zeros
+
+from .euchre import TEAMS
+from .events import Event, HandScored
+
+# points awarded for a hand (going alone isn't supported)
+MAX_HAND_POINTS = 2
+
+
+class RunningStats:
+    """
+    Running count, mean & variance (Welford's algorithm)
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, x: float) -> None:
+        """
+        Add an observation
+        """
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+
+    def merge(self, other: 'RunningStats') -> 'RunningStats':
+        """
+        Add the observations summarized by another instance (Chan et al.'s
+        pairwise update)
+
+        Returns
+        -------
+            RunningStats : this instance
+        """
+        if other.count == 0:
+            return self
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta ** 2 * self.count * other.count / count
+        self.count = count
+        return self
+
+    @property
+    def variance(self) -> float:
+        """
+        The sample variance (0 for fewer than 2 observations)
+        """
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return self.variance ** 0.5
+
+
+class ScoreCurve:
+    """
+    Running mean & variance of each team's score, per hand index. Grows with
+    the number of hands per sample, not the number of samples.
+    """
+
+    def __init__(self):
+        self.count = zeros(0, dtype=int64)
+        # (2 x n_hands): team zero, team one
+        self.mean = zeros((2, 0))
+        self.m2 = zeros((2, 0))
+
+    def _grow(self, n_hands: int) -> None:
+        extra = n_hands - len(self.count)
+        if extra > 0:
+            self.count = concatenate([self.count, zeros(extra, dtype=int64)])
+            self.mean = concatenate([self.mean, zeros((2, extra))], axis=1)
+            self.m2 = concatenate([self.m2, zeros((2, extra))], axis=1)
+
+    def update(self, hand_ix: int, scores: Iterable[int]) -> None:
+        """
+        Add the teams' scores after a sample's hand_ix'th hand
+        """
+        if hand_ix >= len(self.count):
+            self._grow(max(hand_ix + 1, 2 * len(self.count)))
+        self.count[hand_ix] += 1
+        for team, x in enumerate(scores):
+            delta = x - self.mean[team, hand_ix]
+            self.mean[team, hand_ix] += delta / self.count[hand_ix]
+            self.m2[team, hand_ix] += delta * (x - self.mean[team, hand_ix])
+
+    def merge(self, other: 'ScoreCurve') -> 'ScoreCurve':
+        """
+        Add the observations of another curve
+
+        Returns
+        -------
+            ScoreCurve : this instance
+        """
+        self._grow(len(other.count))
+        n = len(other.count)
+        count_a, count_b = self.count[:n], other.count
+        count = count_a + count_b
+        safe = count.clip(min=1)
+        delta = other.mean - self.mean[:, :n]
+        self.mean[:, :n] += delta * count_b / safe
+        self.m2[:, :n] += other.m2 + delta ** 2 * count_a * count_b / safe
+        self.count[:n] = count
+        return self
+
+    @property
+    def n_hands(self) -> int:
+        """
+        The number of hand indices observed
+        """
+        return int((self.count > 0).sum())
+
+    def mean_scores(self) -> ndarray:
+        """
+        (2 x n_hands) mean scores of team zero & team one
+        """
+        return self.mean[:, :self.n_hands]
+
+    def score_variance(self) -> ndarray:
+        """
+        (2 x n_hands) sample variances of the teams' scores
+        """
+        n = self.n_hands
+        return self.m2[:, :n] / (self.count[:n] - 1).clip(min=1)
+
+
+class OnlineAggregator:
+    """
+    Streaming statistics of played hands. Call `new_sample` when starting a
+    new sample (e.g. a fresh table)
+    """
+
+    def __init__(self):
+        self.hands = 0
+        # team zero's points less team one's, per hand
+        self.net_points = RunningStats()
+        # the bidding team's points less their opponents', per hand
+        self.bidder_net_points = RunningStats()
+        # points_histogram[p] hands were won for p points
+        self.points_histogram = zeros(MAX_HAND_POINTS + 1, dtype=int64)
+        self.euchres = 0
+        self.marches = 0
+        self.curve = ScoreCurve()
+        self.new_sample()
+
+    def new_sample(self) -> None:
+        """
+        Start a new sample: hand indices & running scores restart from 0
+        """
+        self._hand = 0
+        self._scores = [0, 0]
+
+    def __call__(self, event: Event) -> None:
+        if isinstance(event, HandScored):
+            self.record_hand(event.bidder, event.winning_team, event.points)
+
+    def record_hand(self, bidder: int, winning_team: int, points: int) -> None:
+        """
+        Add a hand of the current sample
+
+        Parameters
+        ----------
+            bidder : int
+                The seat that selected trump
+
+            winning_team : int
+                The team winning the hand
+
+            points : int
+                The points awarded the winning team
+
+        Returns
+        -------
+            None
+        """
+        bidder_won = bidder in TEAMS[winning_team]
+        self.hands += 1
+        self.net_points.update(points if winning_team == 0 else -points)
+        self.bidder_net_points.update(points if bidder_won else -points)
+        self.points_histogram[points] += 1
+        if not bidder_won:
+            self.euchres += 1
+        elif points == MAX_HAND_POINTS:
+            self.marches += 1
+        self._scores[winning_team] += points
+        self.curve.update(self._hand, self._scores)
+        self._hand += 1
+
+    def merge(self, others: Iterable['OnlineAggregator']) -> 'OnlineAggregator':
+        """
+        Add the statistics of other instances (e.g. from other workers)
+
+        Parameters
+        ----------
+            others : Iterable[OnlineAggregator]
+                The instances to merge
+
+        Returns
+        -------
+            OnlineAggregator : this instance
+        """
+        for other in others:
+            self.hands += other.hands
+            self.net_points.merge(other.net_points)
+            self.bidder_net_points.merge(other.bidder_net_points)
+            self.points_histogram += other.points_histogram
+            self.euchres += other.euchres
+            self.marches += other.marches
+            self.curve.merge(other.curve)
+        return self
+
+    @property
+    def euchre_rate(self) -> float:
+        return self.euchres / self.hands if self.hands else 0.0
+
+    @property
+    def march_rate(self) -> float:
+        return self.marches / self.hands if self.hands else 0.0
+
+    def mean_score_curves(self) -> ndarray:
+        """
+        (2 x n_hands) mean running scores of team zero & team one, by hand
+        index, as `np.mean(scores, axis=0)` of per-sample score arrays
+        """
+        return self.curve.mean_scores()
+
+    def score_curve_stderr(self) -> ndarray:
+        """
+        (2 x n_hands) standard errors of the mean running scores
+        """
+        n = self.curve.n_hands
+        return sqrt(self.curve.score_variance() / self.curve.count[:n].clip(min=1))
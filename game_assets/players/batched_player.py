@@ -0,0 +1,380 @@
+"""
+A batched extension of the Player interface, for policies deciding for many
+seats at once (e.g. one seat at each of thousands of tables).
+
+A BatchedPlayer plays `n_slots` seats. Each decision is passed as a batch
+of states, one per deciding seat (identified by its slot), and answered
+with an array of actions:
+    - play: the card index (see bitmask.card_ix) of the card played, given
+      (n, NUM_CARDS) masks of the legal cards
+    - kitty pickup: if the kitty card is to be picked up
+    - trump: the suit selected, or -1 to pass, given (n, 4) masks of the
+      legal suits
+    - exchange: the card index of the discarded card
+States carry the game objects scalar players decide from, and the bitmask
+of the cards the seat holds, so vectorized policies needn't track hands.
+
+Legal plays follow the engine's rule (as RandomPlayer): a card follows the
+printed suit of the card led (`Trick.leading_suit`), so the left bar
+follows its printed suit, not trump.
+
+Existing players are used in a batch through ScalarPlayerBatch (one
+scalar player per slot), and a slot of a BatchedPlayer is used at a `Table`
+through BatchSeat.
+"""
+from abc import ABC, abstractmethod
+from typing import List, NamedTuple, Sequence, Tuple
+
+from numpy import argmax, array, bool_, int64, ndarray, ones
+from numpy.random import Generator, default_rng
+
+from .player import Player
+from ..bitmask import NUM_CARDS, SUIT_MASKS, card_ix, cards_mask, ix_card
+from ..card import Card
+from ..euchre import SUITS
+from ..hand import Hand
+from ..trick import Trick
+
+# the bit of each card index, for mask arrays
+_CARD_BITS = array([1 << ix for ix in range(NUM_CARDS)], dtype=int64)
+
+
+class PlayState(NamedTuple):
+    slot: int
+    held_mask: int
+    active_hand: Hand
+    active_trick: Trick
+    dealer_seat: int
+    lead_seat: int
+
+
+class PickupState(NamedTuple):
+    slot: int
+    held_mask: int
+    kitty_card: Card
+    is_dealer: bool
+    dealer_is_team_member: bool
+
+
+class TrumpState(NamedTuple):
+    slot: int
+    held_mask: int
+    passed_card: Card
+    is_dealer: bool
+
+
+class ExchangeState(NamedTuple):
+    slot: int
+    held_mask: int
+    kitty_card: Card
+
+
+def legal_play_mask(held_mask: int, active_trick: Trick) -> int:
+    """
+    Returns the bitmask of the cards that may legally be played: those of
+    the printed suit led, if any are held, otherwise all
+
+    Parameters
+    ----------
+        held_mask : int
+            The bitmask of the cards held
+
+        active_trick : trick.Trick
+            The trick currently being played
+
+    Returns
+    -------
+        int : The bitmask of the legal cards
+    """
+    if active_trick.leading_suit is None:
+        return held_mask
+    following = held_mask & SUIT_MASKS[active_trick.leading_suit]
+    return following if following else held_mask
+
+
+def mask_rows(masks: Sequence[int]) -> ndarray:
+    """
+    Returns card bitmasks as an (n, NUM_CARDS) boolean array
+    """
+    return (array(masks, dtype=int64).reshape(-1, 1) & _CARD_BITS) != 0
+
+
+def trump_rows(states: Sequence[TrumpState]) -> ndarray:
+    """
+    Returns the (n, 4) boolean array of the suits each state may call (any
+    but the suit passed)
+    """
+    rows = ones((len(states), len(SUITS)), dtype=bool_)
+    for row, state in zip(rows, states):
+        row[state.passed_card.suit] = False
+    return rows
+
+
+class BatchedPlayer(ABC):
+    """
+    A player deciding for n_slots seats, in batches. See the module
+    docstring
+    """
+
+    def __init__(self, n_slots: int):
+        """
+        Parameters
+        ----------
+            n_slots : int
+                The number of seats played
+        """
+        if n_slots < 1:
+            raise ValueError(f"n_slots must be positive, received {n_slots}")
+        self.n_slots = n_slots
+
+    def assign_seat(self, slot: int, seat_ix: int) -> None:
+        """
+        Assign a slot its seat at a table. Ignored by default
+        """
+
+    def receive_cards(self, slot: int, cards: List[Card]) -> None:
+        """
+        Deal a slot its cards. Ignored by default (states carry the cards
+        held)
+        """
+
+    @abstractmethod
+    def play_cards_batch(self, states: Sequence[PlayState], legal_masks: ndarray) -> ndarray:
+        """
+        Select the cards played
+
+        Parameters
+        ----------
+            states : Sequence[PlayState]
+                A state per deciding seat
+
+            legal_masks : ndarray
+                The (n, NUM_CARDS) boolean masks of the legal cards
+
+        Returns
+        -------
+            ndarray : the (n,) card indices played
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def select_kitty_pickup_batch(self, states: Sequence[PickupState]) -> ndarray:
+        """
+        Decide if the kitty card is to be picked up
+
+        Parameters
+        ----------
+            states : Sequence[PickupState]
+                A state per deciding seat
+
+        Returns
+        -------
+            ndarray : the (n,) decisions, True to pick up
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def select_trump_batch(self, states: Sequence[TrumpState], legal_masks: ndarray) -> ndarray:
+        """
+        Select trump suits, after the kitty card was turned down. A dealer
+        may not pass
+
+        Parameters
+        ----------
+            states : Sequence[TrumpState]
+                A state per deciding seat
+
+            legal_masks : ndarray
+                The (n, 4) boolean masks of the suits that may be selected
+
+        Returns
+        -------
+            ndarray : the (n,) suits selected, -1 for a pass
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def exchange_with_kitty_batch(self, states: Sequence[ExchangeState]) -> ndarray:
+        """
+        Select the cards discarded by dealers picking up the kitty card.
+        The held masks don't include the kitty card
+
+        Parameters
+        ----------
+            states : Sequence[ExchangeState]
+                A state per deciding seat
+
+        Returns
+        -------
+            ndarray : the (n,) card indices discarded (possibly the kitty
+                card's)
+        """
+        raise NotImplementedError
+
+
+class ScalarPlayerBatch(BatchedPlayer):
+    """
+    Scalar players as a BatchedPlayer, the player of slot k deciding for
+    slot k. Decisions are the players' own (legal masks are not enforced),
+    made one state at a time
+    """
+
+    def __init__(self, players: Sequence[Player]):
+        """
+        Parameters
+        ----------
+            players : Sequence[player.Player]
+                The player of each slot
+        """
+        super().__init__(len(players))
+        self.players = list(players)
+
+    def assign_seat(self, slot: int, seat_ix: int) -> None:
+        self.players[slot].assign_seat(seat_ix)
+
+    def receive_cards(self, slot: int, cards: List[Card]) -> None:
+        self.players[slot].receive_cards(list(cards))
+
+    def play_cards_batch(self, states: Sequence[PlayState], legal_masks: ndarray) -> ndarray:
+        return array([card_ix(self.players[s.slot].play_card(s.active_hand, s.active_trick,
+                                                              s.dealer_seat, s.lead_seat))
+                      for s in states], dtype=int)
+
+    def select_kitty_pickup_batch(self, states: Sequence[PickupState]) -> ndarray:
+        return array([bool(self.players[s.slot].select_kitty_pickup(s.kitty_card, s.is_dealer,
+                                                                    s.dealer_is_team_member))
+                      for s in states], dtype=bool_)
+
+    def select_trump_batch(self, states: Sequence[TrumpState], legal_masks: ndarray) -> ndarray:
+        suits = []
+        for s in states:
+            suit, selected = self.players[s.slot].select_trump(s.passed_card, s.is_dealer)
+            suits.append(suit if selected else -1)
+        return array(suits, dtype=int)
+
+    def exchange_with_kitty_batch(self, states: Sequence[ExchangeState]) -> ndarray:
+        discards = []
+        for s in states:
+            player = self.players[s.slot]
+            player.exchange_with_kitty(s.kitty_card)
+            held = cards_mask(player.cards_held)
+            discard = (s.held_mask | 1 << card_ix(s.kitty_card)) & ~held
+            discards.append(discard.bit_length() - 1)
+        return array(discards, dtype=int)
+
+
+class RandomBatchedPlayer(BatchedPlayer):
+    """
+    A vectorized RandomPlayer: uniform legal plays, discards & suits, and
+    bids with probability action_prob (dealers always select a suit)
+    """
+
+    def __init__(self, n_slots: int, action_prob = 0.25, rng: Generator = None):
+        """
+        Parameters
+        ----------
+            n_slots : int
+                The number of seats played
+
+            action_prob : float 0 < x < 1
+                The probability of a kitty pickup or trump call when offered
+
+            rng : numpy.random.Generator, default = None
+                The random stream. A new (unseeded) Generator if None
+        """
+        super().__init__(n_slots)
+        self.action_prob = action_prob
+        self.rng = default_rng() if rng is None else rng
+
+    def _uniform_choice(self, masks: ndarray) -> ndarray:
+        """
+        A uniformly chosen True column of each row
+        """
+        draws = self.rng.random(masks.shape)
+        draws[~masks] = -1
+        return argmax(draws, axis=1)
+
+    def play_cards_batch(self, states: Sequence[PlayState], legal_masks: ndarray) -> ndarray:
+        return self._uniform_choice(legal_masks)
+
+    def select_kitty_pickup_batch(self, states: Sequence[PickupState]) -> ndarray:
+        return self.rng.random(len(states)) < self.action_prob
+
+    def select_trump_batch(self, states: Sequence[TrumpState], legal_masks: ndarray) -> ndarray:
+        calls = self.rng.random(len(states)) < self.action_prob
+        calls |= array([s.is_dealer for s in states], dtype=bool_)
+        suits = self._uniform_choice(legal_masks)
+        suits[~calls] = -1
+        return suits
+
+    def exchange_with_kitty_batch(self, states: Sequence[ExchangeState]) -> ndarray:
+        return self._uniform_choice(mask_rows([s.held_mask for s in states]))
+
+
+class BatchSeat(Player):
+    """
+    A slot of a BatchedPlayer, as a scalar Player (deciding in batches of
+    one), e.g. to seat a vectorized policy at a `Table`
+    """
+
+    def __init__(self, id: int, batched_player: BatchedPlayer, slot: int = 0):
+        """
+        Parameters
+        ----------
+            id : int
+                The player's ID
+
+            batched_player : BatchedPlayer
+                The player deciding
+
+            slot : int, default = 0
+                The slot played, in [0, batched_player.n_slots)
+        """
+        if not 0 <= slot < batched_player.n_slots:
+            raise ValueError(f"slot must be in [0, {batched_player.n_slots}), received {slot}")
+        self.player_id = id
+        self.seat = None
+        self.cards_held = []
+        self.batched_player = batched_player
+        self.slot = slot
+
+    def assign_seat(self, seat_ix: int):
+        super().assign_seat(seat_ix)
+        self.batched_player.assign_seat(self.slot, seat_ix)
+
+    def receive_cards(self, cards: List[Card]):
+        super().receive_cards(cards)
+        self.batched_player.receive_cards(self.slot, cards)
+
+    def exchange_with_kitty(self, kitty_card: Card) -> None:
+        state = ExchangeState(self.slot, cards_mask(self.cards_held), kitty_card)
+        discard = int(self.batched_player.exchange_with_kitty_batch([state])[0])
+        self.cards_held.append(kitty_card)
+        self.cards_held.pop(self._held_pos(discard))
+
+    def play_card(self, active_hand: Hand, active_trick: Trick, dealer_seat: int, lead_seat: int) -> Card:
+        held_mask = cards_mask(self.cards_held)
+        state = PlayState(self.slot, held_mask, active_hand, active_trick, dealer_seat, lead_seat)
+        legal = mask_rows([legal_play_mask(held_mask, active_trick)])
+        played = int(self.batched_player.play_cards_batch([state], legal)[0])
+        return self.cards_held.pop(self._held_pos(played))
+
+    def select_kitty_pickup(self, kitty_card: Card, is_dealer: bool,
+                            dealer_is_team_member: bool) -> bool:
+        state = PickupState(self.slot, cards_mask(self.cards_held), kitty_card, is_dealer,
+                            dealer_is_team_member)
+        return bool(self.batched_player.select_kitty_pickup_batch([state])[0])
+
+    def select_trump(self, passed_card: Card, is_dealer: bool) -> Tuple[int, bool]:
+        states = [TrumpState(self.slot, cards_mask(self.cards_held), passed_card, is_dealer)]
+        suit = int(self.batched_player.select_trump_batch(states, trump_rows(states))[0])
+        return suit, suit != -1
+
+    def _held_pos(self, ix: int) -> int:
+        """
+        The position in `cards_held` of the card of index ix
+        """
+        for pos, card in enumerate(self.cards_held):
+            if card_ix(card) == ix:
+                return pos
+        raise ValueError(f"{ix_card(ix)} is not held")
@@ -0,0 +1,70 @@
+from ..calibration import CalibrationTable
+from ..card import Card
+from .heuristic_player import HeuristicPlayer
+
+
+class CalibratedPlayer(HeuristicPlayer):
+    """
+    HeuristicPlayer that decides whether to order up the kitty card from
+    an empirical calibration table, rather than the hand strength
+    heuristic. Falls back to the heuristic for holdings observed too rarely.
+    Trump selection after the kitty card is turned down, and trick play,
+    are as HeuristicPlayer.
+    """
+
+    def __init__(self, id: int, calibration: CalibrationTable, min_points: float = 0.0,
+                min_count: int = 30, pickup_act = 1/3, trump_call_act = 0.55):
+        """
+        Parameters
+        ----------
+            id : int
+                The player's ID
+
+            calibration : calibration.CalibrationTable
+                The empirical outcomes of ordering up, by holding
+
+            min_points : float, default = 0.0
+                The player orders up when the expected net points of doing
+                so exceed this
+
+            min_count : int, default = 30
+                The number of observations of a holding required to use the
+                table; the heuristic decides otherwise
+
+            pickup_act : float, default = 1/3
+                See HeuristicPlayer, for the fallback decision
+
+            trump_call_act : float, default = 0.55
+                See HeuristicPlayer
+        """
+        super().__init__(id, pickup_act, trump_call_act)
+        self.calibration = calibration
+        self.min_points = min_points
+        self.min_count = min_count
+
+    def select_kitty_pickup(self, kitty_card: Card, is_dealer: bool,
+                            dealer_is_team_member: bool) -> bool:
+        """
+        Orders up the kitty card if the expected net points exceed
+        min_points, given the calibration table
+
+        Parameters
+        ----------
+            kitty_card : card.Card
+                The face-up card in the kitty
+
+            is_dealer : bool
+                If the player is in the dealer's seat
+
+            dealer_is_team_member : bool
+                If the dealer is the player's team member
+
+        Returns
+        -------
+            bool : True if the card is to be picked up, false otherwise
+        """
+        count, _, points = self.calibration.lookup_role(self.cards_held, kitty_card,
+                                                    is_dealer, dealer_is_team_member)
+        if count < self.min_count:
+            return super().select_kitty_pickup(kitty_card, is_dealer, dealer_is_team_member)
+        return points > self.min_points
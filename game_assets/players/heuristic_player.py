@@ -1,20 +1,42 @@
 from copy import deepcopy
-from typing import List, Tuple
+from typing import TYPE_CHECKING, List, Tuple
 
 from .player import Player
+from ..bitmask import NUM_CARDS, card_ix, ix_card
 from ..card import Card
+from ..card_index import CardIndex
 from ..euchre import SUITS, NINE, TEN, JACK, QUEEN, KING, ACE, LEFT_SUIT
 from ..hand import Hand
 from ..trick import Trick
 
+if TYPE_CHECKING:
+    from ..bidding_table import BiddingTable
+
 
 class HeuristicPlayer(Player):
     """
     Euchre player that leverages heuristics for decision-making. Doesn't
     take advantage of 'memory' (known played cards) when playing a trick
+    (see memory_heuristic_player.MemoryHeuristicPlayer)
+
+    The hand's score for each suit (the sum of its cards' integer scores)
+    is kept in `_suit_scores`: computed when cards are assigned, and updated
+    as cards are exchanged & played, so bidding reads rather than re-scores
+    the hand. Code changing the hand should assign `cards_held`, or update
+    the scores with `_add_card_score`/`_remove_card_score`.
+
+    Once trump is known the hand is indexed by card strength (a
+    `card_index.CardIndex`, in `_card_index`), answering trick play's
+    strongest, weakest and weakest-winning card queries without rescoring
+    the hand. It's built at the kitty exchange or first card played, and
+    updated as cards are played.
     """
 
-    def __init__(self, id: int, pickup_act = 1/3, trump_call_act = 0.55):
+    # an optional bidding_table.BiddingTable, answering bidding decisions by lookup
+    bidding_table = None
+
+    def __init__(self, id: int, pickup_act = 1/3, trump_call_act = 0.55,
+                bidding_table: 'BiddingTable' = None):
         """
         Parameters
         ----------
@@ -32,9 +54,16 @@ class HeuristicPlayer(Player):
                 free selection round. 1 is most aggresive, 0 is least.
                 Must be in range [0,1]
 
+            bidding_table : bidding_table.BiddingTable, default = None
+                If provided, bidding decisions are looked up rather than
+                computed. pickup_act and trump_call_act must be on the
+                table's grids.
+
         """
         self.player_id = id
         self.seat = None
+        # _card_rows[ix][suit] is the score of card ix relative to suit
+        self._card_rows = CARD_SUIT_SCORES
         self.cards_held = []
         if pickup_act > 1 or pickup_act < 0:
             raise ValueError(f"pickup_act must be in [0,1], received {pickup_act}")
@@ -42,6 +71,10 @@ class HeuristicPlayer(Player):
         if trump_call_act > 1 or trump_call_act < 0:
             raise ValueError(f"trump_call_act must be in [0,1], received {trump_call_act}")
         self.trump_call_thresh = trump_call_act
+        if bidding_table is not None:
+            self._pickup_ix = bidding_table.pickup_ix(pickup_act)
+            self._trump_call_ix = bidding_table.trump_call_ix(trump_call_act)
+            self.bidding_table = bidding_table
 
     def exchange_with_kitty(self, kitty_card: Card) -> None:
         """
@@ -57,9 +90,48 @@ class HeuristicPlayer(Player):
         -------
             None
         """
-        weak_ix = self._weakest_card_ix(kitty_card.suit)
-        weak_card = self.cards_held.pop(weak_ix)
+        # the kitty card's suit is trump: index the hand for play
+        index = CardIndex(self.cards_held, kitty_card.suit, self._card_strengths(kitty_card.suit))
+        weak_card = self.cards_held.pop(self._held_pos(index.weakest()))
         self.cards_held.append(kitty_card)
+        index.remove(weak_card)
+        index.add(kitty_card)
+        self._card_index = index
+        self._remove_card_score(weak_card)
+        self._add_card_score(kitty_card)
+
+    @property
+    def cards_held(self) -> List[Card]:
+        return self._cards_held
+
+    @cards_held.setter
+    def cards_held(self, cards: List[Card]) -> None:
+        self._cards_held = cards
+        self._card_index = None
+        scores = [0] * len(SUITS)
+        for card in cards:
+            row = self._card_rows[card_ix(card)]
+            for suit in SUITS:
+                scores[suit] += row[suit]
+        self._suit_scores = scores
+
+    def _add_card_score(self, card: Card) -> None:
+        """
+        Add a card, added to the hand, to the suit scores
+        """
+        row = self._card_rows[card_ix(card)]
+        scores = self._suit_scores
+        for suit in SUITS:
+            scores[suit] += row[suit]
+
+    def _remove_card_score(self, card: Card) -> None:
+        """
+        Remove a card, removed from the hand, from the suit scores
+        """
+        row = self._card_rows[card_ix(card)]
+        scores = self._suit_scores
+        for suit in SUITS:
+            scores[suit] -= row[suit]
 
     def cards_in_suit(self, suit: int, is_trump: bool = False) -> List[int]:
         """
@@ -112,47 +184,57 @@ class HeuristicPlayer(Player):
             card.Card : The card played by the player (popped from 'cards_held')
 
         """
-        played_card_ix = -1
+        trump = active_hand.trump
+        index = self._hand_index(trump)
         #if no cards have been played yet, play strongest card
         if len(active_trick.played_cards) == 0:
-            selected_card_strength = -1
-            for ix, card in enumerate(self.cards_held):
-                strength = _eval_card_strength(card, active_hand.trump)
-                if strength > selected_card_strength:
-                    played_card_ix = ix
-                    selected_card_strength = strength
+            played_card = index.strongest()
         # else, if cards have been played, find a winning card that doesn't
         # renege
         else:
             # identify the current winning card
-            best_ix = 0
-            for candidate_ix, played_card in enumerate(active_trick.played_cards[1:]):
-                if active_trick.played_cards[best_ix].card.lt_card(played_card.card, active_hand.trump, active_trick.leading_suit):
-                    best_ix = candidate_ix + 1
+            lead = active_trick.leading_suit
+            best = active_trick.played_cards[
+                index.trick_winner(lead, [played.card for played in active_trick.played_cards])]
             # is a team member winning ? if so, play worst card
-            best_card = active_trick.played_cards[best_ix].card
-            play_to_win = (active_trick.played_cards[best_ix].player_seat - self.seat) % 2 == 0
-            # get all cards legal for play
-            non_renege_ix = self.cards_in_suit(active_trick.leading_suit, active_trick.leading_suit == active_hand.trump)
-            # if unable to renege (no cards forced/all eligible)
-            if len(non_renege_ix) == 0:
-                non_renege_ix = list(range(len(self.cards_held)))
-            # play the best card in the scenrio:
+            play_to_win = (best.player_seat - self.seat) % 2 == 0
+            played_card = None
+            # play the weakest legal card that wins
             if play_to_win:
-                lowest_winning_value = 2
-                for ix, card in enumerate(self.cards_held):
-                    if ix in non_renege_ix:
-                        if best_card.lt_card(card, active_hand.trump, active_trick.leading_suit):
-                            card_strength = _eval_card_strength(card, active_hand.trump)
-                            if card_strength < lowest_winning_value:
-                                played_card_ix = ix
-                                lowest_winning_value = card_strength
+                played_card = index.weakest_winner(lead, best.card)
             # if no  card has beeen picked: either there wasn't
             # a winning card to select above, or we don't want to win
-            if played_card_ix == -1:
-                played_card_ix = self._weakest_card_ix(active_hand.trump, non_renege_ix)
+            if played_card is None:
+                played_card = index.weakest(lead)
 
-        return self.cards_held.pop(played_card_ix)
+        return self._release_card(index, played_card)
+
+    def _release_card(self, index: CardIndex, card: Card) -> Card:
+        """
+        Remove a card selected for play from the hand, its index & scores
+        """
+        self.cards_held.pop(self._held_pos(card))
+        index.remove(card)
+        self._remove_card_score(card)
+        return card
+
+    def _hand_index(self, trump: int) -> CardIndex:
+        """
+        The hand's CardIndex under trump, built if not yet indexed
+        """
+        index = self._card_index
+        if index is None or index.trump != trump:
+            index = self._card_index = CardIndex(self.cards_held, trump, self._card_strengths(trump))
+        return index
+
+    def _held_pos(self, card: Card) -> int:
+        """
+        The position in `cards_held` of a held card (the same object)
+        """
+        for pos, held in enumerate(self.cards_held):
+            if held is card:
+                return pos
+        raise ValueError(f"Card {card} not held")
 
     def select_kitty_pickup(self, kitty_card : Card, is_dealer: bool,
                             dealer_is_team_member: bool) -> bool:
@@ -175,6 +257,9 @@ class HeuristicPlayer(Player):
         -------
             bool : True if the card is to be picked up, false otherwise
         """
+        if self.bidding_table is not None:
+            return self.bidding_table.kitty_pickup(self.cards_held, kitty_card, is_dealer,
+                                                dealer_is_team_member, self._pickup_ix)
         pickup_signal = False
         if is_dealer:
             pickup_signal = self._select_kitty_pickup_dealer(kitty_card)
@@ -182,7 +267,7 @@ class HeuristicPlayer(Player):
             # evaluate the strength of the hand, relative to the kitty card's suit
             hand_str = self._eval_hand_strength(kitty_card.suit)
             # evaluate the strength of the kitty card
-            kitty_card_str = _eval_card_strength(kitty_card, kitty_card.suit)
+            kitty_card_str = self._card_strength(kitty_card, kitty_card.suit)
             if dealer_is_team_member:
                 # want kitty card to be strong, hand to be strong for suit
                 eval_score = (hand_str ** (1/2)) * (kitty_card_str ** (1/2))
@@ -215,6 +300,9 @@ class HeuristicPlayer(Player):
             int : The selected suit, if any (from euchre.SUITS). -1 if no suit selected
             bool : True if suit selected, false otherwise.
         """
+        if self.bidding_table is not None:
+            return self.bidding_table.select_trump(self.cards_held, passed_card, is_dealer,
+                                                self._trump_call_ix)
         # if player is the dealer
         max_suit = -1
         max_score = -1
@@ -265,14 +353,27 @@ class HeuristicPlayer(Player):
         -------
             float : The score/value of the hand, [0,1]
         """
-        MIN_SCORE = 1/6
-        MAX_SCORE = 49/12
+        return self._normalize_score(self._suit_scores[suit])
 
+    def _normalize_score(self, score: int) -> float:
+        """
+        Normalize a hand score (a sum of `_card_rows` scores) to a strength
+        """
+        return _normalize_hand_score(score)
+
+    def _card_strength(self, card: Card, suit: int) -> float:
+        """
+        The strength of a card relative to a suit, in [0,1]. See
+        `_eval_card_strength`
+        """
+        return _eval_card_strength(card, suit)
 
-        score = 0
-        for card in self.cards_held:
-            score += _eval_card_strength(card, suit)
-        return (score - MIN_SCORE)/(MAX_SCORE - MIN_SCORE)
+    def _card_strengths(self, suit: int) -> List[float]:
+        """
+        The strength of every card index relative to a suit (see
+        `_card_strength`), ordering the hand's `CardIndex`
+        """
+        return CARD_STRENGTHS[suit]
 
     def _weakest_card_ix(self, suit: int, elig: List[int] = []) -> int:
         """
@@ -291,13 +392,13 @@ class HeuristicPlayer(Player):
         -------
             int : The index of the card in self.cards_held
         """
-        if len(elig) == []:
+        if len(elig) == 0:
             elig = list(range(len(self.cards_held)))
         pos = -1
         strength = 2
         for ix, card in enumerate(self.cards_held):
             if ix in elig:
-                if (card_score := _eval_card_strength(card, suit)) < strength:
+                if (card_score := self._card_strength(card, suit)) < strength:
                     pos = ix
                     strength = card_score
         return pos
@@ -326,18 +427,71 @@ class HeuristicPlayer(Player):
                 if (candidate_score := self._eval_hand_strength(suit)) > strongest_score:
                     strongest_suit = suit
                     strongest_score = candidate_score
-        # pop the weakest card & evaluate
-        weak_card = self.cards_held.pop(weak_ix)
-        self.cards_held.append(kitty_card)
-        new_hand_score = self._eval_hand_strength(kitty_card.suit)
-        # post-eval, return the card to hand
-        self.cards_held.pop()
-        self.cards_held.append(weak_card)
+        # score the hand with the weakest card exchanged, without changing it
+        weak_card = self.cards_held[weak_ix]
+        new_score = (self._suit_scores[kitty_card.suit]
+                     - self._card_rows[card_ix(weak_card)][kitty_card.suit]
+                     + self._card_rows[card_ix(kitty_card)][kitty_card.suit])
+        new_hand_score = self._normalize_score(new_score)
         if new_hand_score > 0.6 and new_hand_score > strongest_score:
             return True
         return False
 
 
+MAX_CARD_SCORE = 12
+TRUMP_SCORES = {
+    JACK: 12,
+    "left": 11,
+    ACE: 10,
+    KING: 8,
+    QUEEN: 7,
+    TEN: 5,
+    NINE: 3
+}
+NONTRUMP_SCORES = {
+    ACE: 7,
+    KING: 5,
+    QUEEN: 3,
+    JACK: 2,
+    TEN: 1,
+    NINE: 0
+}
+
+
+def _normalize_hand_score(score: int) -> float:
+    """
+    Normalizes an integer hand score (the sum of `_card_score` over the
+    five cards held) to [0,1]. See `HeuristicPlayer._eval_hand_strength`
+    """
+    MIN_SCORE = 1/6
+    MAX_SCORE = 49/12
+    return (score / MAX_CARD_SCORE - MIN_SCORE)/(MAX_SCORE - MIN_SCORE)
+
+
+def _card_score(card: Card, suit: int) -> int:
+    """
+    Returns the integer score of a card, given the suit, out of
+    MAX_CARD_SCORE. See `_eval_card_strength`
+
+    Parameters
+    ----------
+        card : card.Card
+            The card under evaluation
+        suit : int, 0 <= v <= 3
+            The integer representing the suit to evaluate
+
+    Returns
+    -------
+        int : The score of the card, [0,12]
+    """
+    if card.is_trump(suit):
+        # check to see if the card is the left
+        if card.face == JACK and card.suit != suit:
+            return TRUMP_SCORES['left']
+        return TRUMP_SCORES[card.face]
+    return NONTRUMP_SCORES[card.face]
+
+
 def _eval_card_strength(card: Card, suit: int) -> float:
     """
     Evaluates the strength of a card, given the suit
@@ -373,31 +527,10 @@ def _eval_card_strength(card: Card, suit: int) -> float:
     -------
         float : The score/value of the card, [0,1]
     """
-    MAX_SCORE = 12
-    trump_scores = {
-        JACK: 12,
-        "left": 11,
-        ACE: 10,
-        KING: 8,
-        QUEEN: 7,
-        TEN: 5,
-        NINE: 3
-    }
-    nontrump_scores = {
-        ACE: 7,
-        KING: 5,
-        QUEEN: 3,
-        JACK: 2,
-        TEN: 1,
-        NINE: 0
-    }
-    if card.is_trump(suit):
-        # check to see if the card is the left
-        if card.face == JACK and card.suit != suit:
-            score = trump_scores['left']
-        else:
-            score = trump_scores[card.face]
-    else:
-        score = nontrump_scores[card.face]
+    return _card_score(card, suit) / MAX_CARD_SCORE
+
 
-    return score / MAX_SCORE
+# CARD_SUIT_SCORES[ix][suit] is the integer score of card ix relative to suit
+CARD_SUIT_SCORES = [[_card_score(ix_card(ix), suit) for suit in SUITS] for ix in range(NUM_CARDS)]
+# CARD_STRENGTHS[suit][ix] is the strength of card ix relative to suit
+CARD_STRENGTHS = [[_eval_card_strength(ix_card(ix), suit) for ix in range(NUM_CARDS)] for suit in SUITS]
@@ -0,0 +1,248 @@
+"""
+A HeuristicPlayer that remembers the cards played in the hand.
+
+What's known is kept as int bitmasks (see bitmask.py), updated from the
+cards played since the player's last decision, so no decision rescans the
+hand's history:
+    - the cards played, and those known to be out of the other players'
+      hands (its own, a turned-down kitty card, its discard as dealer)
+    - the suits each seat has shown void in, by failing to follow
+    - for each suit, the highest card still outstanding (neither played nor
+      known to be elsewhere), found by a pointer down the suit's cards that
+      only advances during a hand
+
+From these the player knows when a card is boss (e.g. its king, once the
+ace has been played), and whether a trick's winning card can still be
+beaten by a player yet to play.
+"""
+from typing import List
+
+from .heuristic_player import HeuristicPlayer
+from ..bitmask import NUM_CARDS, TRICK_RANK, card_ix, cards_mask
+from ..card import Card
+from ..card_index import FOLLOWS, CardIndex
+from ..euchre import NUM_PLAYERS, SUITS
+from ..hand import Hand
+from ..trick import PlayedCard, Trick
+
+_TRICK_RANK = TRICK_RANK.tolist()
+# FOLLOW_MASKS[trump][lead]: the cards that follow the suit led
+FOLLOW_MASKS = [[sum(1 << ix for ix in range(NUM_CARDS) if lead in FOLLOWS[trump][ix])
+                 for lead in SUITS] for trump in SUITS]
+# BEATS[trump][lead][ix]: the cards beating card ix, in a trick of the suit led
+BEATS = [[[sum(1 << other for other in range(NUM_CARDS)
+               if _TRICK_RANK[trump][lead][other] > _TRICK_RANK[trump][lead][ix])
+           for ix in range(NUM_CARDS)] for lead in SUITS] for trump in SUITS]
+# FOLLOW_ORDER[trump][suit]: the cards following suit, highest first
+FOLLOW_ORDER = [[sorted((ix for ix in range(NUM_CARDS) if suit in FOLLOWS[trump][ix]),
+                        key=lambda ix: -_TRICK_RANK[trump][suit][ix])
+                 for suit in SUITS] for trump in SUITS]
+
+
+class MemoryHeuristicPlayer(HeuristicPlayer):
+    """
+    HeuristicPlayer playing tricks with memory of the cards played. Bidding
+    is as HeuristicPlayer.
+
+    Leading, it plays its strongest boss card: trump, or an off-suit card
+    neither opponent is known to be able to trump. Otherwise its strongest
+    card, as HeuristicPlayer.
+
+    Following, it plays its weakest legal card when its partner is winning
+    the trick and no player yet to play can beat them. Otherwise it plays
+    the weakest card that wins, if any (when its partner is winning, only
+    a card no later player can beat). Failing that, its weakest legal card.
+    Note HeuristicPlayer instead plays to win when its partner is winning.
+    """
+
+    def __init__(self, id: int, pickup_act = 1/3, trump_call_act = 0.55):
+        """
+        Parameters
+        ----------
+            id : int
+                The player's ID
+
+            pickup_act : float, default = 1/3
+                See HeuristicPlayer
+
+            trump_call_act : float, default = 0.55
+                See HeuristicPlayer
+        """
+        super().__init__(id, pickup_act, trump_call_act)
+        self._hand = None
+        self._discard = None
+
+    def exchange_with_kitty(self, kitty_card: Card) -> None:
+        held = cards_mask(self.cards_held)
+        super().exchange_with_kitty(kitty_card)
+        # the discard is known to be in the kitty
+        self._discard = held & ~cards_mask(self.cards_held)
+
+    def play_card(self, active_hand: Hand, active_trick: Trick, dealer_seat: int, lead_seat: int) -> Card:
+        """
+        Select a card to play, removing it from the player's hand. See
+        HeuristicPlayer.play_card
+
+        Returns
+        -------
+            card.Card : The card played by the player (popped from 'cards_held')
+        """
+        self.observe(active_hand, active_trick)
+        trump = active_hand.trump
+        index = self._hand_index(trump)
+        played_cards = active_trick.played_cards
+        if len(played_cards) == 0:
+            return self._release_card(index, self._lead_card(index))
+        lead = active_trick.leading_suit
+        best = played_cards[index.trick_winner(lead, [played.card for played in played_cards])]
+        later_seats = [(self.seat + k) % NUM_PLAYERS for k in range(1, NUM_PLAYERS - len(played_cards))]
+        partner_winning = (best.player_seat - self.seat) % 2 == 0
+        played_card = None
+        if not partner_winning or self._can_be_beaten(card_ix(best.card), lead, later_seats):
+            played_card = index.weakest_winner(lead, best.card)
+            if (played_card is not None and partner_winning
+                    and self._can_be_beaten(card_ix(played_card), lead, later_seats)):
+                played_card = None
+        if played_card is None:
+            played_card = index.weakest(lead)
+        return self._release_card(index, played_card)
+
+    def observe(self, active_hand: Hand, active_trick: Trick) -> None:
+        """
+        Update the memory with the cards played since the last observation
+        (starting afresh on a new hand)
+
+        Parameters
+        ----------
+            active_hand : hand.Hand
+                The hand currently being played
+
+            active_trick : trick.Trick
+                The trick currently being played
+
+        Returns
+        -------
+            None
+        """
+        if active_hand is not self._hand:
+            self._new_hand(active_hand)
+        tricks = active_hand.tricks
+        while self._n_tricks < len(tricks):
+            self._observe_cards(tricks[self._n_tricks].played_cards)
+            self._n_tricks += 1
+            self._n_trick_cards = 0
+        self._observe_cards(active_trick.played_cards)
+
+    def _new_hand(self, active_hand: Hand) -> None:
+        """
+        Reset the memory for a hand, before any of the player's cards have
+        been played
+        """
+        self._hand = active_hand
+        self._trump = active_hand.trump
+        self._n_tricks = 0
+        self._n_trick_cards = 0
+        # the cards played
+        self.played = 0
+        # the suits led each seat has failed to follow
+        self.voids = [0] * NUM_PLAYERS
+        # the cards known not to be held by the other players
+        self.accounted = cards_mask(self.cards_held)
+        if not active_hand.kitty_picked_up:
+            self.accounted |= 1 << card_ix(active_hand.kitty_face_up)
+        if self._discard is not None:
+            self.accounted |= self._discard
+            self._discard = None
+        # positions in FOLLOW_ORDER of each suit's highest outstanding card
+        self._top = [0] * len(SUITS)
+
+    def _observe_cards(self, played_cards: List[PlayedCard]) -> None:
+        """
+        Observe a trick's cards not yet seen
+        """
+        if self._n_trick_cards >= len(played_cards):
+            return
+        lead = played_cards[0].card.suit
+        follow_mask = FOLLOW_MASKS[self._trump][lead]
+        for played in played_cards[self._n_trick_cards:]:
+            bit = 1 << card_ix(played.card)
+            self.played |= bit
+            self.accounted |= bit
+            if not bit & follow_mask:
+                self.voids[played.player_seat] |= 1 << lead
+        self._n_trick_cards = len(played_cards)
+
+    def highest_outstanding(self, suit: int) -> int:
+        """
+        The highest card following a suit that isn't accounted for (played,
+        held by the player, or known to be in the kitty)
+
+        Parameters
+        ----------
+            suit : int
+                The suit, from euchre.SUITS
+
+        Returns
+        -------
+            int : the card index, or -1 if every card is accounted for
+        """
+        order = FOLLOW_ORDER[self._trump][suit]
+        pos = self._top[suit]
+        while pos < len(order) and (self.accounted >> order[pos]) & 1:
+            pos += 1
+        self._top[suit] = pos
+        return order[pos] if pos < len(order) else -1
+
+    @property
+    def highest_unplayed_trump(self) -> int:
+        """
+        The highest trump that may be held by another player (-1 if none)
+        """
+        return self.highest_outstanding(self._trump)
+
+    def is_boss(self, card: Card) -> bool:
+        """
+        If a card beats every outstanding card of its (following) suit. The
+        left bar is considered as trump
+        """
+        ix = card_ix(card)
+        suit = FOLLOWS[self._trump][ix][-1]
+        top = self.highest_outstanding(suit)
+        ranks = _TRICK_RANK[self._trump][suit]
+        return top == -1 or ranks[ix] > ranks[top]
+
+    def _can_be_beaten(self, ix: int, lead: int, seats: List[int]) -> bool:
+        """
+        If any of seats may hold a card beating card ix, in a trick of the
+        suit led. A seat can follow with a higher card unless void in the
+        suit led, and trump unless void in trump
+        """
+        beaters = BEATS[self._trump][lead][ix] & ~self.accounted
+        if not beaters:
+            return False
+        follow_mask = FOLLOW_MASKS[self._trump][lead]
+        followers, ruffs = beaters & follow_mask, beaters & ~follow_mask
+        for seat in seats:
+            voids = self.voids[seat]
+            if followers and not (voids >> lead) & 1:
+                return True
+            if ruffs and not (voids >> self._trump) & 1:
+                return True
+        return False
+
+    def _lead_card(self, index: CardIndex) -> Card:
+        """
+        The strongest boss card that's safe to lead, else the strongest card
+        """
+        trump = self._trump
+        opponent_voids = [self.voids[(self.seat + 1) % NUM_PLAYERS],
+                          self.voids[(self.seat + 3) % NUM_PLAYERS]]
+        for entry in reversed(index.cards):
+            card = entry[3]
+            if not self.is_boss(card):
+                continue
+            suit = FOLLOWS[trump][entry[2]][-1]
+            if suit == trump or not any((v >> suit) & 1 and not (v >> trump) & 1
+                                        for v in opponent_voids):
+                return card
+        return index.strongest()
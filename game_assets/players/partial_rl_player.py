@@ -1,6 +1,6 @@
 from numpy import array,floor,zeros
 
-from .heuristic_player import HeuristicPlayer
+from .heuristic_player import CARD_SUIT_SCORES, HeuristicPlayer
 from ..models.trick_model import TrickModel
 from ..card import Card
 from ..hand import Hand
@@ -38,6 +38,7 @@ class RLTrickPlayer(HeuristicPlayer):
         """
         self.player_id = id
         self.seat = None
+        self._card_rows = CARD_SUIT_SCORES
         self.cards_held = []
         self.learning = False
         if pickup_act > 1 or pickup_act < 0:
@@ -53,8 +54,7 @@ class RLTrickPlayer(HeuristicPlayer):
     def last_reward(self):
         return self._last_reward
 
-    @attribute.setter
-    def last_reward(self, trick_won: bool, hand_won: bool = None,
+    def set_last_reward(self, trick_won: bool, hand_won: bool = None,
                         hand_points: int = 0) -> None:
         """
         Constructs and sets the reward associated with the last action -
@@ -85,7 +85,7 @@ class RLTrickPlayer(HeuristicPlayer):
         # winning a trick is +/- .1 points
         r_trick = ((2 ** (trick_won + 1)) -3)/10
         r_hand = 0
-        if hand_team_won is not None:
+        if hand_won is not None:
             r_hand = (2 ** (hand_won +1) -3) * hand_points
         self._last_reward = r_trick + r_hand
 
@@ -151,14 +151,16 @@ class RLTrickPlayer(HeuristicPlayer):
             card.Card : The card played by the player (popped from 'cards_held')
         """
         played_card_ix = self.trick_play_model.pred_card(self.cards_held, active_hand, active_trick)
-        if self.training:
+        if self.learning:
             # store the event to the memory buffer
             self.trick_play_model.add_to_buffer(self.cards_held, active_hand,
                                             active_trick, self.cards_held[played_card_ix])
             # perform a gradient fit step
             self.trick_play_model.step_fit()
 
-        return self.cards_held.pop(played_card_ix)
+        played_card = self.cards_held.pop(played_card_ix)
+        self._remove_card_score(played_card)
+        return played_card
 
     def _get_state_repr(self, active_hand: Hand, active_trick: Trick) -> array:
         """
@@ -210,9 +212,10 @@ class RLTrickPlayer(HeuristicPlayer):
         # if we entered the above loop, increment active trick range ix by 1
         t_ix += bool(active_hand.tricks)
         # assign positions to the ongoing trick
-        # if no tricks have been played and if no cards have been played:
-        if not (t_ix or active_trick.played_cards):
-                state[25] = self._get_initial_player_encoding(self.seat)
+        # if no cards have been played in the active trick, the player leads
+        if not active_trick.played_cards:
+            if t_ix < euchre.NUM_TRICKS:
+                state[(26 * (t_ix + 1)) -1] = self._get_initial_player_encoding(self.seat)
         else:
             state[(26 * (t_ix + 1)) -1] =\
               self._get_initial_player_encoding(active_trick.played_cards[0].player_seat)
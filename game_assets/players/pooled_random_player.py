@@ -0,0 +1,179 @@
+"""
+A RandomPlayer drawing its uniform variates in blocks.
+
+Each decision of RandomPlayer makes a NumPy call for a single draw, whose
+overhead dwarfs the decision itself. PooledRandomPlayer instead draws a
+block of uniform variates from its Generator at once, and consumes them
+one per decision (as a Python list, so each is a plain float). Blocks
+start small and double up to the pool size, as a stream may be short
+lived (seeded tables give each player a new stream every hand). Choices
+among n options take the n-th part of the unit interval a variate falls
+in.
+
+The cards held are also kept as a bitmask (see bitmask.py), so the legal
+cards are a mask, and a card is chosen among them by popcount & select.
+"""
+from typing import List, Tuple
+
+from numpy.random import Generator, default_rng
+
+from .random_player import RandomPlayer
+from ..bitmask import SUIT_MASKS, card_ix, mask_select, popcount
+from ..card import Card
+from ..euchre import SUITS
+from ..hand import Hand
+from ..trick import Trick
+
+# the first block drawn from a stream
+MIN_BLOCK = 16
+# OTHER_SUITS[suit]: the suits that may be called when suit was turned down
+OTHER_SUITS = [[s for s in SUITS if s != suit] for suit in SUITS]
+
+
+class PooledRandomPlayer(RandomPlayer):
+    """
+    RandomPlayer consuming uniform variates from a pre-drawn pool.
+    Decisions have the same distributions as RandomPlayer's (though not the
+    same draws, for a given stream).
+
+    The pool is discarded when `rng` is replaced (as seeded tables do each
+    hand), so a player's decisions depend only on its stream.
+    """
+
+    def __init__(self, id: int, action_prob = 0.25, rng: Generator = None,
+                 pool_size: int = 1024):
+        """
+        Parameters
+        ----------
+            id : int
+                The player's ID
+
+            action_prob : float 0 < x < 1
+                The probability of taking an kitty selection or trump
+                picking action when offered
+
+            rng : numpy.random.Generator, default = None
+                The player's random stream. If None, a new (unseeded)
+                Generator. Seeded tables (see `Table`) replace it each hand
+
+            pool_size : int, default = 1024
+                The most variates drawn at once
+        """
+        if pool_size < 1:
+            raise ValueError(f"pool_size must be positive, received {pool_size}")
+        self.pool_size = pool_size
+        super().__init__(id, action_prob, default_rng() if rng is None else rng)
+
+    @property
+    def rng(self) -> Generator:
+        return self._rng
+
+    @rng.setter
+    def rng(self, rng: Generator) -> None:
+        self._rng = rng
+        self._pool = []
+        self._pool_pos = 0
+        self._block = min(MIN_BLOCK, self.pool_size)
+
+    @property
+    def cards_held(self) -> List[Card]:
+        return self._cards_held
+
+    @cards_held.setter
+    def cards_held(self, cards: List[Card]) -> None:
+        self._cards_held = cards
+        self._held = {card_ix(card): card for card in cards}
+        self._held_mask = 0
+        for ix in self._held:
+            self._held_mask |= 1 << ix
+
+    def exchange_with_kitty(self, kitty_card: Card) -> Card:
+        """
+        Method controlling dealer's adding of kitty_card to the hand,
+        and discarding of a card. Picks at random.
+
+        Parameters
+        ----------
+            kitty_card : card.Card
+                The face-up card in the kitty added to hand
+
+        Returns
+        -------
+            None
+        """
+        removed_card = self.cards_held.pop(int(self._random() * len(self.cards_held)))
+        self.cards_held.append(kitty_card)
+        removed_ix, kitty_ix = card_ix(removed_card), card_ix(kitty_card)
+        del self._held[removed_ix]
+        self._held[kitty_ix] = kitty_card
+        self._held_mask ^= 1 << removed_ix | 1 << kitty_ix
+        return removed_card
+
+    def play_card(self, active_hand: Hand, active_trick: Trick, dealer_seat: int, lead_seat: int) -> Card:
+        """
+        Randomly selects a valid card to play, and plays it. As
+        RandomPlayer, a card follows the suit led by its printed suit.
+
+        Parameters
+        ----------
+            active_hand : hand.Hand
+                The hand currently being played
+
+            active_trick : trick.Trick
+                The trick currently being played
+
+            dealer_seat : int
+                The seat of the dealer player, 0-3
+
+            lead_seat : int
+                The seat of the player who started the trick
+
+        Returns
+        -------
+            Card.card : The card played by the player (popped from 'cards_held')
+        """
+        legal = self._held_mask
+        lead = active_trick.leading_suit
+        if lead is not None and legal & SUIT_MASKS[lead]:
+            legal &= SUIT_MASKS[lead]
+        ix = mask_select(legal, int(self._random() * popcount(legal)))
+        self._held_mask ^= 1 << ix
+        played_card = self._held.pop(ix)
+        self.cards_held.remove(played_card)
+        return played_card
+
+    def select_trump(self, passed_card: Card, is_dealer: bool) -> Tuple[int, bool]:
+        """
+        If the player is the dealer (or otherwise with probability
+        action_prob), picks a trump suit at random (will not pick passed
+        suit).
+
+        Parameters
+        ----------
+            passed_card : card
+                The card passed in the kitty round (turned down)
+
+            is_dealer : bool
+                If the player is in the dealer's seat (is stuck)
+
+        Returns
+        -------
+            int : The selected suit, if any (from euchre.SUITS)
+            bool : True if suit selected, false otherwise.
+        """
+        if is_dealer or self._random() < self.action_prob:
+            suits = OTHER_SUITS[passed_card.suit]
+            return suits[int(self._random() * len(suits))], True
+        return None, False
+
+    def _random(self) -> float:
+        """
+        The next uniform draw from [0, 1), refilling the pool when spent
+        """
+        if self._pool_pos == len(self._pool):
+            self._pool = self._rng.random(self._block).tolist()
+            self._pool_pos = 0
+            self._block = min(2 * self._block, self.pool_size)
+        u = self._pool[self._pool_pos]
+        self._pool_pos += 1
+        return u
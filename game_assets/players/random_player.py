@@ -1,4 +1,4 @@
-from numpy.random import choice, randint, random
+from numpy.random import Generator, choice, randint, random
 from typing import Tuple
 
 from ..card import Card
@@ -12,7 +12,7 @@ class RandomPlayer(Player):
     Euchre player that chooses cards randomly
     """
 
-    def __init__(self, id: int, action_prob = 0.25):
+    def __init__(self, id: int, action_prob = 0.25, rng: Generator = None):
         """
         Parameters
         ----------
@@ -22,11 +22,16 @@ class RandomPlayer(Player):
             action_prob : float 0 < x < 1
                 The probability of taking an kitty selection or trump
                 picking action when offered
+
+            rng : numpy.random.Generator, default = None
+                The player's random stream. If None, numpy's global state is
+                used. Seeded tables (see `Table`) replace it each hand
         """
         self.player_id = id
         self.seat = None
         self.cards_held = []
         self.action_prob = action_prob
+        self.rng = rng
 
     def exchange_with_kitty(self, kitty_card: Card) -> Card:
         """
@@ -42,7 +47,10 @@ class RandomPlayer(Player):
         -------
             None
         """
-        card_ix = randint(low = 0, high = len(self.cards_held))
+        if self.rng is None:
+            card_ix = randint(low = 0, high = len(self.cards_held))
+        else:
+            card_ix = int(self.rng.integers(len(self.cards_held)))
         removed_card = self.cards_held.pop(card_ix)
         self.cards_held.append(kitty_card)
         return removed_card
@@ -75,7 +83,7 @@ class RandomPlayer(Player):
         eligible_ix = range(len(self.cards_held))
         if active_trick.leading_suit in [c.suit for c in self.cards_held]:
             eligible_ix = [i for i,c in enumerate(self.cards_held) if c.suit == active_trick.leading_suit]
-        play_ix = choice(eligible_ix)
+        play_ix = choice(eligible_ix) if self.rng is None else self.rng.choice(eligible_ix)
         return self.cards_held.pop(play_ix)
 
     def select_kitty_pickup(self, kitty_card : Card, is_dealer: bool,
@@ -99,7 +107,7 @@ class RandomPlayer(Player):
             bool : True if the card is to be picked up, false otherwise
         """
         # 25% chance of calling pick up
-        if random() < self.action_prob:
+        if self._random() < self.action_prob:
             return True
         return False
 
@@ -122,7 +130,14 @@ class RandomPlayer(Player):
             bool : True if suit selected, false otherwise.
         """
         # if stuck, or 25% chance otherwise
-        if is_dealer or random() < self.action_prob:
-            return choice([s for s in SUITS if s != passed_card.suit]), True
+        if is_dealer or self._random() < self.action_prob:
+            suits = [s for s in SUITS if s != passed_card.suit]
+            return (choice(suits) if self.rng is None else self.rng.choice(suits)), True
         else:
             return None, False
+
+    def _random(self) -> float:
+        """
+        A uniform draw from [0, 1), from the player's stream
+        """
+        return random() if self.rng is None else self.rng.random()
@@ -0,0 +1,197 @@
+"""
+A HeuristicPlayer whose card scores are a tunable weight vector, with a
+matrix evaluator scoring batches of hands against batches of weights.
+
+The 13 weights score a card relative to a suit, in the order of
+WEIGHT_NAMES: the seven trump cards (right & left bars, ace, king, queen,
+ten, nine), then the six off-suit faces (ace, king, queen, jack, ten, nine).
+A hand's strength for a suit is the sum of its cards' weights, normalized
+to [0, 1] by bounds: by default the exact minimum & maximum over all
+holdings & suits.
+
+DEFAULT_WEIGHTS with HEURISTIC_BOUNDS reproduces HeuristicPlayer.
+"""
+from itertools import combinations
+from typing import List, Tuple
+
+from numpy import (arange, array, asarray, atleast_2d, einsum, eye, float64, int8, isfinite,
+                   ndarray)
+
+from ..bitmask import NUM_CARDS, card_ix, ix_card
+from ..card import Card
+from ..euchre import ACE, JACK, KING, NINE, NUM_TRICKS, QUEEN, SUITS, TEN
+from .heuristic_player import MAX_CARD_SCORE, NONTRUMP_SCORES, TRUMP_SCORES, HeuristicPlayer
+
+TRUMP_WEIGHT_KEYS = [JACK, "left", ACE, KING, QUEEN, TEN, NINE]
+NONTRUMP_WEIGHT_KEYS = [ACE, KING, QUEEN, JACK, TEN, NINE]
+WEIGHT_NAMES = ["trump_right", "trump_left", "trump_ace", "trump_king", "trump_queen",
+                "trump_ten", "trump_nine", "off_ace", "off_king", "off_queen", "off_jack",
+                "off_ten", "off_nine"]
+NUM_WEIGHTS = len(WEIGHT_NAMES)
+NUM_TRUMP_WEIGHTS = len(TRUMP_WEIGHT_KEYS)
+
+# HeuristicPlayer's card scores & hand strength normalization
+DEFAULT_WEIGHTS = array([TRUMP_SCORES[k] for k in TRUMP_WEIGHT_KEYS]
+                        + [NONTRUMP_SCORES[k] for k in NONTRUMP_WEIGHT_KEYS]) / MAX_CARD_SCORE
+HEURISTIC_BOUNDS = (1/6, 49/12)
+
+
+def _card_feature(card: Card, suit: int) -> int:
+    """
+    The weight index scoring a card, relative to a suit
+    """
+    if card.is_trump(suit):
+        if card.face == JACK and card.suit != suit:
+            return TRUMP_WEIGHT_KEYS.index("left")
+        return TRUMP_WEIGHT_KEYS.index(card.face)
+    return NUM_TRUMP_WEIGHTS + NONTRUMP_WEIGHT_KEYS.index(card.face)
+
+
+# CARD_FEATURE[suit, ix] is the weight index of card ix, relative to suit
+CARD_FEATURE = array([[_card_feature(ix_card(ix), suit) for ix in range(NUM_CARDS)]
+                      for suit in SUITS])
+# one-hot weight indices: CARD_ONEHOT[suit, ix] is a row of eye(NUM_WEIGHTS)
+CARD_ONEHOT = eye(NUM_WEIGHTS, dtype=int8)[CARD_FEATURE]
+
+# features of every holding, computed on first use of score_bounds
+_ALL_FEATURES = None
+
+
+def hand_features(hands: ndarray) -> ndarray:
+    """
+    Count the cards of each hand scored by each weight, per suit
+
+    Parameters
+    ----------
+        hands : np.array
+            (n x 5) card indices (see bitmask.card_ix)
+
+    Returns
+    -------
+        np.array : (n x 4 x NUM_WEIGHTS) int8 counts. A hand's score for a
+            suit is its counts' dot product with the weights
+    """
+    hands = asarray(hands)
+    return CARD_ONEHOT[arange(len(SUITS))[None, :, None], hands[:, None, :]].sum(axis=2, dtype=int8)
+
+
+def score_bounds(weights: ndarray) -> Tuple[ndarray, ndarray]:
+    """
+    The least & greatest hand scores over every holding & suit
+
+    Parameters
+    ----------
+        weights : np.array
+            (NUM_WEIGHTS,) or (k x NUM_WEIGHTS) weight vectors
+
+    Returns
+    -------
+        Tuple[np.array, np.array] : (k,) minimum & maximum scores
+    """
+    global _ALL_FEATURES
+    if _ALL_FEATURES is None:
+        holdings = array(list(combinations(range(NUM_CARDS), NUM_TRICKS)))
+        _ALL_FEATURES = hand_features(holdings).reshape(-1, NUM_WEIGHTS)
+    scores = _ALL_FEATURES @ atleast_2d(weights).T.astype(float64)
+    return scores.min(axis=0), scores.max(axis=0)
+
+
+def hand_strengths(features: ndarray, weights: ndarray, bounds: Tuple = None) -> ndarray:
+    """
+    Normalized strengths of a batch of hands under a batch of weight
+    vectors, in one operation
+
+    Parameters
+    ----------
+        features : np.array
+            (n x 4 x NUM_WEIGHTS) counts, from hand_features
+
+        weights : np.array
+            (k x NUM_WEIGHTS) weight vectors
+
+        bounds : Tuple, default = None
+            (minimum, maximum) scores normalized to 0 & 1, scalars or (k,)
+            arrays. The exact bounds of each weight vector if None
+
+    Returns
+    -------
+        np.array : (n x 4 x k) strengths of each hand, for each suit &
+            weight vector
+    """
+    weights = atleast_2d(weights).astype(float64)
+    low, high = score_bounds(weights) if bounds is None else bounds
+    scores = einsum("nsw,kw->nsk", features, weights)
+    return (scores - low) / (asarray(high) - low)
+
+
+def check_weights(weights: ndarray) -> ndarray:
+    """
+    Validate a weight vector: finite & non-negative, with positive trump
+    weights (the face-up kitty card's strength divides pickup decisions)
+
+    Returns
+    -------
+        np.array : the weights, as floats
+    """
+    weights = asarray(weights, dtype=float64)
+    if weights.shape != (NUM_WEIGHTS,):
+        raise ValueError(f"weights must have shape ({NUM_WEIGHTS},), received {weights.shape}")
+    if not isfinite(weights).all() or (weights < 0).any():
+        raise ValueError("weights must be finite and non-negative")
+    if (weights[:NUM_TRUMP_WEIGHTS] <= 0).any():
+        raise ValueError("trump weights must be positive")
+    return weights
+
+
+class WeightedHeuristicPlayer(HeuristicPlayer):
+    """
+    HeuristicPlayer scoring cards by a weight vector. Bidding thresholds
+    and play are as HeuristicPlayer, with card strengths the weights
+    relative to the largest, and hand strengths normalized by bounds.
+    """
+
+    def __init__(self, id: int, weights: ndarray = DEFAULT_WEIGHTS, pickup_act = 1/3,
+                trump_call_act = 0.55, bounds: Tuple[float, float] = None):
+        """
+        Parameters
+        ----------
+            id : int
+                The player's ID
+
+            weights : np.array, default = DEFAULT_WEIGHTS
+                (NUM_WEIGHTS,) card weights, ordered as WEIGHT_NAMES
+
+            pickup_act : float, default = 1/3
+                See HeuristicPlayer
+
+            trump_call_act : float, default = 0.55
+                See HeuristicPlayer
+
+            bounds : Tuple[float, float], default = None
+                The (minimum, maximum) hand scores normalized to 0 & 1. The
+                exact bounds of the weights if None
+        """
+        super().__init__(id, pickup_act, trump_call_act)
+        self.weights = check_weights(weights)
+        if bounds is None:
+            low, high = score_bounds(self.weights)
+            bounds = (float(low[0]), float(high[0]))
+        if bounds[1] <= bounds[0]:
+            raise ValueError(f"bounds must be increasing, received {bounds}")
+        self.bounds = bounds
+        # scores are kept per suit as cards are assigned, exchanged & played
+        self._card_rows = self.weights[CARD_FEATURE].T.tolist()
+        self._suit_strengths = (self.weights[CARD_FEATURE] / self.weights.max()).tolist()
+
+    def _card_strength(self, card: Card, suit: int) -> float:
+        return self._suit_strengths[suit][card_ix(card)]
+
+    def _card_strengths(self, suit: int) -> List[float]:
+        return self._suit_strengths[suit]
+
+    def _normalize_score(self, score: float) -> float:
+        """
+        Normalize a sum of weights by the bounds
+        """
+        low, high = self.bounds
+        return (score - low) / (high - low)
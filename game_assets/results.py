@@ -0,0 +1,247 @@
+"""
+Columnar storage of simulation results, for analyses.
+
+A results directory holds shards, `shard_00000/` etc., each with one `.npy`
+file per column. `ResultsWriter` is a `Table` event sink buffering a row per
+scored hand and writing a shard whenever its buffer fills, so long sweeps
+stream to disk in flat memory. `SimulationResults` loads columns lazily,
+as a memory map per shard: analyses can stream a column shard by shard,
+and only `SimulationResults.column` copies it into one in-memory array.
+
+Columns (a row per hand):
+    sample, hand : the sample (e.g. a fresh table) and the hand's index
+        within it
+    dealer, bidder, trump, pick_up : the hand's bidding
+    winning_team, points : the hand's result
+    team_zero_score, team_one_score : the sample's running scores after
+        the hand
+"""
+import os
+from typing import Dict, Iterable, List
+
+from numpy import bool_, concatenate, int32, load, ndarray, save, uint8, zeros
+
+from .euchre import TEAM_ONE_ID, TEAM_ZERO_ID
+from .events import Event, HandScored, TrumpSelection
+
+COLUMNS: Dict[str, type] = {
+    "sample": int32,
+    "hand": int32,
+    "dealer": uint8,
+    "bidder": uint8,
+    "trump": uint8,
+    "pick_up": bool_,
+    "winning_team": uint8,
+    "points": uint8,
+    "team_zero_score": int32,
+    "team_one_score": int32,
+}
+SHARD_PREFIX = "shard_"
+
+
+def _shard_dirs(directory: str) -> List[str]:
+    if not os.path.isdir(directory):
+        return []
+    return sorted(os.path.join(directory, d) for d in os.listdir(directory)
+                  if d.startswith(SHARD_PREFIX))
+
+
+def _load_shard(shard_dir: str, name: str) -> ndarray:
+    """
+    A shard's column, memory-mapped
+    """
+    return load(os.path.join(shard_dir, f"{name}.npy"), mmap_mode="r")
+
+
+class ResultsWriter:
+    """
+    Table event sink writing a row per scored hand to a results directory.
+    Call `new_sample` when starting a new sample (e.g. a fresh table).
+    """
+
+    def __init__(self, directory: str, shard_size: int = 1 << 16):
+        """
+        Parameters
+        ----------
+            directory : str
+                The results directory. Created if needed; shards are added
+                after any already present, and samples numbered after
+                theirs
+
+            shard_size : int, default = 65536
+                The number of hands per shard
+        """
+        if shard_size < 1:
+            raise ValueError("shard_size must be positive")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        shard_dirs = _shard_dirs(directory)
+        self._n_shards = len(shard_dirs)
+        self._buffer = {name: zeros(shard_size, dtype=col_type) for name, col_type in COLUMNS.items()}
+        self._n_buffered = 0
+        # continue the numbering of samples already written
+        self.sample = max((int(samples.max()) for samples in
+                           (_load_shard(d, "sample") for d in shard_dirs) if len(samples)),
+                          default=-1)
+        self.new_sample()
+
+    def new_sample(self) -> None:
+        """
+        Start a new sample: hand indices & running scores restart from 0
+        """
+        self.sample += 1
+        self._hand = 0
+        self._scores = [0, 0]
+        self._selection = None
+
+    def __call__(self, event: Event) -> None:
+        if isinstance(event, TrumpSelection):
+            self._selection = event
+        elif isinstance(event, HandScored):
+            self.record_hand(self._selection.dealer, event.bidder, event.trump,
+                            self._selection.pick_up, event.winning_team, event.points)
+
+    def record_hand(self, dealer: int, bidder: int, trump: int, pick_up: bool,
+                    winning_team: int, points: int) -> None:
+        """
+        Add a hand of the current sample (e.g. from a runner not using a
+        `Table`)
+        """
+        self._scores[winning_team] += points
+        row = {
+            "sample": self.sample,
+            "hand": self._hand,
+            "dealer": dealer,
+            "bidder": bidder,
+            "trump": trump,
+            "pick_up": pick_up,
+            "winning_team": winning_team,
+            "points": points,
+            "team_zero_score": self._scores[TEAM_ZERO_ID],
+            "team_one_score": self._scores[TEAM_ONE_ID],
+        }
+        for name, value in row.items():
+            self._buffer[name][self._n_buffered] = value
+        self._hand += 1
+        self._n_buffered += 1
+        if self._n_buffered == len(self._buffer["sample"]):
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Write any buffered hands as a new shard
+        """
+        if self._n_buffered == 0:
+            return
+        shard_dir = os.path.join(self.directory, f"{SHARD_PREFIX}{self._n_shards:05d}")
+        os.makedirs(shard_dir)
+        for name, column in self._buffer.items():
+            save(os.path.join(shard_dir, f"{name}.npy"), column[:self._n_buffered])
+        self._n_shards += 1
+        self._n_buffered = 0
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> 'ResultsWriter':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class SimulationResults:
+    """
+    Lazily loaded columns of a results directory
+    """
+
+    def __init__(self, directory: str):
+        """
+        Parameters
+        ----------
+            directory : str
+                The results directory
+        """
+        self.shards = _shard_dirs(directory)
+        if not self.shards:
+            raise ValueError(f"No results shards in {directory}")
+        self._columns: Dict[str, List[ndarray]] = {}
+
+    @property
+    def columns(self) -> List[str]:
+        return list(COLUMNS)
+
+    def __len__(self) -> int:
+        return sum(len(part) for part in self["sample"])
+
+    def __getitem__(self, name: str) -> List[ndarray]:
+        """
+        A column, as a memory map per shard. Each is loaded at most once
+        """
+        if name not in COLUMNS:
+            raise KeyError(name)
+        if name not in self._columns:
+            self._columns[name] = self.load_column(name)
+        return self._columns[name]
+
+    def load_column(self, name: str, shards: Iterable[int] = None) -> List[ndarray]:
+        """
+        Load a column, by memory-mapping its shard files
+
+        Parameters
+        ----------
+            name : str
+                The column
+            shards : Iterable[int], default = None
+                The shards to read, all if None
+
+        Returns
+        -------
+            List[np.array] : The column's values, a memory map per shard
+        """
+        if name not in COLUMNS:
+            raise KeyError(name)
+        shard_dirs = self.shards if shards is None else [self.shards[i] for i in shards]
+        return [_load_shard(d, name) for d in shard_dirs]
+
+    def column(self, name: str, shards: Iterable[int] = None) -> ndarray:
+        """
+        A column's values, concatenated into one in-memory array
+
+        Parameters
+        ----------
+            name : str
+                The column
+            shards : Iterable[int], default = None
+                The shards to read, all if None
+
+        Returns
+        -------
+            np.array : The column's values
+        """
+        parts = self[name] if shards is None else self.load_column(name, shards)
+        return concatenate(parts)
+
+    def running_scores(self, team: int) -> ndarray:
+        """
+        A team's running scores, per sample & hand
+
+        Parameters
+        ----------
+            team : int
+                TEAM_ZERO_ID or TEAM_ONE_ID
+
+        Returns
+        -------
+            np.array : (m_samples x n_hands) scores. Requires each sample to
+                have the same number of hands
+        """
+        if team not in (TEAM_ZERO_ID, TEAM_ONE_ID):
+            raise ValueError(f"Unknown team {team}")
+        n_rows = len(self)
+        n_hands = max(int(part.max()) for part in self["hand"] if len(part)) + 1
+        n_samples = n_rows // n_hands
+        if n_samples * n_hands != n_rows:
+            raise ValueError("Samples have differing numbers of hands")
+        scores = self.column("team_zero_score" if team == TEAM_ZERO_ID else "team_one_score")
+        return scores.reshape(n_samples, n_hands)
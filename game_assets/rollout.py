@@ -0,0 +1,306 @@
+"""
+Fast trick-play rollouts on packed (bitmask) states, for Monte Carlo
+evaluation. Two forms are provided:
+    - `rollout`: plays a single hand using python ints
+    - `rollout_batch`: plays many hands at once, vectorized with numpy
+
+Each seat follows one of the policies:
+    - "random": plays uniformly from its legal cards
+    - "heuristic": mirrors `HeuristicPlayer.play_card`
+
+The suit led is the printed suit of the first card, as in `Trick`. Random
+seats follow it by printed suit, as `RandomPlayer` does; heuristic seats
+also count the left bar as following a trump lead, as `HeuristicPlayer`
+does (see `card_index.FOLLOWS`).
+
+Internally, hands are re-packed so that bit positions are ordered by the
+heuristic strength of the cards under trump (ties by card index). The
+weakest card in a mask is then its lowest set bit, the strongest is in the
+group of equally strong cards holding its highest set bit, and 'the weakest
+card that wins' is the lowest set bit of the mask of cards beating the
+current best card. Ties between equally strong cards go to the lowest card
+index; `HeuristicPlayer` breaks them by position in hand.
+"""
+from dataclasses import dataclass
+from random import Random
+from typing import List, Sequence, Tuple, Union
+
+from numpy import (arange, argsort, array, asarray, broadcast_to, frexp, int64, lexsort,
+                   ndarray, take_along_axis, where, zeros)
+from numpy.random import Generator, default_rng
+
+from .bitmask import NUM_CARDS, NUM_FACES, TRICK_RANK, ix_card, popcount
+from .card_index import FOLLOWS
+from .euchre import NUM_PLAYERS, NUM_TRICKS, NUM_TRICKS_TO_WIN_HAND, SUITS
+from .players.heuristic_player import _eval_card_strength
+
+RANDOM = "random"
+HEURISTIC = "heuristic"
+POLICIES = [RANDOM, HEURISTIC]
+
+
+# STRENGTH[trump, ix]: the heuristic strength of each card
+STRENGTH = array([[_eval_card_strength(ix_card(ix), trump) for ix in range(NUM_CARDS)]
+                    for trump in SUITS])
+
+# ORDER[trump, pos]: the card index at each bit position of a packed hand
+ORDER = array([lexsort((arange(NUM_CARDS), STRENGTH[trump])) for trump in SUITS])
+# POSITION[trump, ix]: the bit position of each card index
+POSITION = argsort(ORDER, axis=1)
+# tables over bit positions, rather than card indices
+_POS_SUIT = ORDER // NUM_FACES
+# _POS_FOLLOW_MASK[policy, trump, lead]: mask of the positions following lead,
+# by index into POLICIES
+_POS_FOLLOW_MASK = array([[[sum(1 << pos for pos in range(NUM_CARDS)
+                                if (lead in FOLLOWS[trump][ORDER[trump, pos]] if policy == HEURISTIC
+                                    else _POS_SUIT[trump, pos] == lead))
+                            for lead in SUITS] for trump in SUITS] for policy in POLICIES],
+                        dtype=int64)
+_POS_RANK = array([[TRICK_RANK[trump, lead, ORDER[trump]] for lead in SUITS]
+                    for trump in SUITS])
+# _POS_BEATS[trump, lead, pos]: mask of the positions outranking pos
+_POS_BEATS = array([[[sum(1 << other for other in range(NUM_CARDS)
+                            if _POS_RANK[trump, lead, other] > _POS_RANK[trump, lead, pos])
+                        for pos in range(NUM_CARDS)] for lead in SUITS] for trump in SUITS],
+                    dtype=int64)
+
+# _POS_TIES[trump, pos]: mask of the positions as strong as pos
+_POS_TIES = array([[sum(1 << other for other in range(NUM_CARDS)
+                        if STRENGTH[trump, ORDER[trump, other]] == STRENGTH[trump, ORDER[trump, pos]])
+                    for pos in range(NUM_CARDS)] for trump in SUITS], dtype=int64)
+# bits set in each 12-bit integer
+_POPCOUNT_12 = array([popcount(i) for i in range(1 << 12)])
+
+_POS_SUIT_L = _POS_SUIT.tolist()
+_POS_FOLLOW_MASK_L = _POS_FOLLOW_MASK.tolist()
+_POS_RANK_L = _POS_RANK.tolist()
+_POS_BEATS_L = _POS_BEATS.tolist()
+_POS_TIES_L = _POS_TIES.tolist()
+
+
+@dataclass
+class RolloutResult:
+    """
+    The outcome of played hand(s), indexed by team id. For batched
+    rollouts, each field has a leading dimension over hands.
+    """
+    tricks: Union[List[int], ndarray]
+    points: Union[List[int], ndarray]
+
+
+def rollout(hands: Sequence[int], trump: int, lead_seat: int, bidder: int,
+            policy: Union[str, Sequence[str]] = RANDOM, rng: Random = None,
+            tricks_won: Tuple[int, int] = (0, 0)) -> RolloutResult:
+    """
+    Play the remaining tricks of a hand
+
+    Parameters
+    ----------
+        hands : Sequence[int]
+            The card bitmask held by each seat. All seats must hold the
+            same number of cards
+
+        trump : int
+            The trump suit, from euchre.SUITS
+
+        lead_seat : int
+            The seat leading the next trick
+
+        bidder : int
+            The seat of the player who chose trump
+
+        policy : str or Sequence[str], default = "random"
+            The policy for all seats, or for each seat
+
+        rng : random.Random, default = None
+            Source of randomness for the random policy
+
+        tricks_won : Tuple[int, int], default = (0,0)
+            Tricks already won by each team
+
+    Returns
+    -------
+        RolloutResult : tricks won and points awarded, by team
+    """
+    policies = _seat_policies(policy)
+    is_random = [p == RANDOM for p in policies]
+    follow_masks = [_POS_FOLLOW_MASK_L[POLICIES.index(p)][trump] for p in policies]
+    rng = Random() if rng is None else rng
+    position = POSITION[trump].tolist()
+    packed = []
+    for mask in hands:
+        packed.append(sum(1 << position[ix] for ix in range(NUM_CARDS) if (mask >> ix) & 1))
+    won = list(tricks_won)
+    pos_suit = _POS_SUIT_L[trump]
+    ties = _POS_TIES_L[trump]
+    for _ in range(popcount(packed[lead_seat])):
+        best_seat = lead_seat
+        for offset in range(NUM_PLAYERS):
+            seat = (lead_seat + offset) % NUM_PLAYERS
+            legal = packed[seat]
+            if offset and (follow := legal & follow_masks[seat][lead]):
+                legal = follow
+            if is_random[seat]:
+                for _ in range(rng.randrange(popcount(legal))):
+                    legal &= legal - 1
+                pos = (legal & -legal).bit_length() - 1
+            elif not offset:
+                strongest = legal & ties[legal.bit_length() - 1]
+                pos = (strongest & -strongest).bit_length() - 1
+            else:
+                if (best_seat - seat) % 2 == 0 and (winners := legal & beats[best_pos]):
+                    legal = winners
+                pos = (legal & -legal).bit_length() - 1
+            packed[seat] ^= 1 << pos
+            if not offset:
+                lead = pos_suit[pos]
+                rank = _POS_RANK_L[trump][lead]
+                beats = _POS_BEATS_L[trump][lead]
+                best_pos = pos
+            elif rank[pos] > rank[best_pos]:
+                best_pos = pos
+                best_seat = seat
+        won[best_seat % 2] += 1
+        lead_seat = best_seat
+    points = [0, 0]
+    winner = int(won[1] >= NUM_TRICKS_TO_WIN_HAND)
+    points[winner] = _points(won[winner], bidder % 2 == winner)
+    return RolloutResult(won, points)
+
+
+def rollout_batch(hands: ndarray, trump: Union[int, ndarray], lead_seat: Union[int, ndarray],
+                bidder: Union[int, ndarray], policy: Union[str, Sequence[str]] = RANDOM,
+                rng: Generator = None, tricks_won: ndarray = None) -> RolloutResult:
+    """
+    Play the remaining tricks of many hands at once
+
+    Parameters
+    ----------
+        hands : np.array
+            n x 4 array of the card bitmask held by each seat. All seats, in
+            all hands, must hold the same number of cards
+
+        trump : int or np.array
+            The trump suit of each hand, from euchre.SUITS
+
+        lead_seat : int or np.array
+            The seat leading the next trick of each hand
+
+        bidder : int or np.array
+            The seat of the player who chose trump in each hand
+
+        policy : str or Sequence[str], default = "random"
+            The policy for all seats, or for each seat
+
+        rng : numpy.random.Generator, default = None
+            Source of randomness for the random policy
+
+        tricks_won : np.array, default = None
+            n x 2 array of tricks already won by each team. Zero if not provided
+
+    Returns
+    -------
+        RolloutResult : n x 2 arrays of tricks won and points awarded, by team
+    """
+    policies = _seat_policies(policy)
+    seat_is_random = array([p == RANDOM for p in policies])
+    seat_policy = array([POLICIES.index(p) for p in policies])
+    rng = default_rng() if rng is None else rng
+    hands = asarray(hands, dtype=int64)
+    n = hands.shape[0]
+    rows = arange(n)
+    trump = broadcast_to(asarray(trump), (n,))
+    lead_seat = broadcast_to(asarray(lead_seat), (n,)).copy()
+    bidder = broadcast_to(asarray(bidder), (n,))
+    won = zeros((n, 2), dtype=int64)
+    if tricks_won is not None:
+        won += tricks_won
+    # re-pack each hand into bit positions ordered by strength
+    bits = (hands[:, :, None] >> arange(NUM_CARDS)) & 1
+    packed = (take_along_axis(bits, ORDER[trump][:, None, :], axis=2)
+                << arange(NUM_CARDS)).sum(axis=2)
+    pos_suit = _POS_SUIT[trump]
+    n_tricks = popcount(int(hands[0, 0])) if n else 0
+    for _ in range(n_tricks):
+        best_seat = lead_seat
+        for offset in range(NUM_PLAYERS):
+            seat = (lead_seat + offset) % NUM_PLAYERS
+            legal = packed[rows, seat]
+            if offset:
+                follow = legal & _POS_FOLLOW_MASK[seat_policy[seat], trump, lead]
+                legal = where(follow != 0, follow, legal)
+            pos = None
+            if seat_is_random.any():
+                pos = _random_pos(legal, rng)
+            if not seat_is_random.all():
+                if not offset:
+                    heuristic_pos = _low_pos(legal & _POS_TIES[trump, _high_pos(legal)])
+                else:
+                    play_to_win = (best_seat - seat) % 2 == 0
+                    winners = legal & _POS_BEATS[trump, lead, best_pos]
+                    heuristic_pos = _low_pos(where(play_to_win & (winners != 0), winners, legal))
+                pos = heuristic_pos if pos is None else where(seat_is_random[seat], pos, heuristic_pos)
+            packed[rows, seat] ^= 1 << pos
+            if not offset:
+                lead = pos_suit[rows, pos]
+                rank = _POS_RANK[trump, lead]
+                best_pos = pos
+            else:
+                better = rank[rows, pos] > rank[rows, best_pos]
+                best_pos = where(better, pos, best_pos)
+                best_seat = where(better, seat, best_seat)
+        won[rows, best_seat % 2] += 1
+        lead_seat = best_seat
+    points = zeros((n, 2), dtype=int64)
+    winner = (won[:, 1] >= NUM_TRICKS_TO_WIN_HAND).astype(int64)
+    winner_tricks = won[rows, winner]
+    points[rows, winner] = where((winner_tricks == NUM_TRICKS) | (bidder % 2 != winner), 2, 1)
+    return RolloutResult(won, points)
+
+
+def _points(num_tricks_won: int, is_bidder: bool) -> int:
+    """
+    Points awarded to the team winning the hand; see `Hand._calc_points`
+    """
+    if num_tricks_won == NUM_TRICKS or not is_bidder:
+        return 2
+    return 1
+
+
+def _seat_policies(policy: Union[str, Sequence[str]]) -> List[str]:
+    """
+    Expand and validate the policy specification to one policy per seat
+    """
+    policies = [policy] * NUM_PLAYERS if isinstance(policy, str) else list(policy)
+    if len(policies) != NUM_PLAYERS:
+        raise ValueError(f"Expected {NUM_PLAYERS} policies, received {len(policies)}")
+    for name in policies:
+        if name not in POLICIES:
+            raise ValueError(f"policy must be one of {POLICIES}, received {name}")
+    return policies
+
+
+def _low_pos(masks: ndarray) -> ndarray:
+    """
+    The position of the lowest set bit of each (non-zero) mask
+    """
+    return frexp((masks & -masks).astype(float))[1] - 1
+
+
+def _high_pos(masks: ndarray) -> ndarray:
+    """
+    The position of the highest set bit of each (non-zero) mask
+    """
+    return frexp(masks.astype(float))[1] - 1
+
+
+def _random_pos(masks: ndarray, rng: Generator) -> ndarray:
+    """
+    The position of a uniformly selected set bit of each (non-zero) mask
+    """
+    counts = _POPCOUNT_12[masks & 0xFFF] + _POPCOUNT_12[masks >> 12]
+    skip = (rng.random(masks.shape) * counts).astype(int64)
+    masks = masks.copy()
+    for n_skipped in range(NUM_TRICKS - 1):
+        masks = where(skip > n_skipped, masks & (masks - 1), masks)
+    return _low_pos(masks)
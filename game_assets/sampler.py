@@ -0,0 +1,291 @@
+from math import factorial
+from typing import Dict, List, Tuple
+
+from numpy import arange, argsort, array, cumsum, int64, ndarray, where, zeros
+from numpy.random import Generator, default_rng
+
+from .bitmask import (DECK_MASK, NUM_CARDS, SUIT_MASKS, card_ix, cards_mask, mask_cards,
+                      mask_ixs, popcount)
+from .card import Card
+from .card_index import FOLLOWS
+from .euchre import NUM_PLAYERS, NUM_TRICKS, SUITS
+from .hand import Hand
+from .trick import Trick
+
+# the holder index used for the kitty in sampled deals
+KITTY = NUM_PLAYERS
+KITTY_SIZE = NUM_CARDS - (NUM_PLAYERS * NUM_TRICKS)
+
+
+class HiddenHandSampler:
+    """
+    Samples the cards hidden from one seat (the other players' hands and the
+    kitty), uniformly over all deals consistent with what that seat has seen:
+        - its own cards
+        - the face-up kitty card (held by the dealer if picked up, otherwise
+          in the kitty)
+        - the cards played so far, and the suits each seat has shown void
+          in by failing to follow the lead
+
+    Voids follow the engine's rule: the suit led is the printed suit of the
+    first card (`Trick.leading_suit`), and a card follows it as in
+    `card_index.FOLLOWS` (its printed suit, and for the left bar trump
+    too). A seat failing to follow holds no card of the printed suit led.
+    That holds whether the seat follows as HeuristicPlayer (whose left bar
+    may also follow trump) or by printed suit only, as RandomPlayer, so
+    neither player's play contradicts the voids.
+
+    Unseen cards are grouped by the set of holders that may hold them (cards
+    of a printed suit share that set). Every allocation of group sizes to
+    holders is enumerated and weighted by the number of deals it admits, so
+    deals are drawn uniformly without rejection.
+    """
+
+    def __init__(self, seat: int, cards_held: List[Card], trump: int,
+                dealer_seat: int, kitty_face_up: Card, kitty_picked_up: bool,
+                known_kitty: List[Card] = [], rng: Generator = None):
+        """
+        Parameters
+        ----------
+            seat : int
+                The seat of the observing player
+
+            cards_held : List[card.Card]
+                The observing player's five cards, after any kitty exchange
+
+            trump : int
+                The trump suit, from euchre.SUITS
+
+            dealer_seat : int
+                The seat of the dealer, 0-3
+
+            kitty_face_up : card.Card
+                The face-up card evaluated in the first round of bidding
+
+            kitty_picked_up : bool
+                If the face-up card was picked up by the dealer
+
+            known_kitty : List[card.Card], default = []
+                Any other cards known to be in the kitty (e.g. the card the
+                observing dealer discarded)
+
+            rng : numpy.random.Generator, default = None
+                The source of randomness. A fresh generator if not provided
+        """
+        if len(cards_held) != NUM_TRICKS:
+            raise ValueError(f"Expected {NUM_TRICKS} cards held, received {len(cards_held)}")
+        self.seat = seat
+        self.trump = trump
+        self.dealer_seat = dealer_seat
+        self.rng = default_rng() if rng is None else rng
+        # cards known to be held by each holder (seats, then the kitty)
+        self.fixed = [0] * (NUM_PLAYERS + 1)
+        self.fixed[seat] = cards_mask(cards_held)
+        upcard_bit = 1 << card_ix(kitty_face_up)
+        if not kitty_picked_up:
+            self.fixed[KITTY] |= upcard_bit
+        elif dealer_seat != seat:
+            self.fixed[dealer_seat] |= upcard_bit
+        self.fixed[KITTY] |= cards_mask(known_kitty)
+        # the number of cards each holder currently holds
+        self.capacity = [NUM_TRICKS] * NUM_PLAYERS + [KITTY_SIZE]
+        known = 0
+        for h_fixed in self.fixed:
+            if known & h_fixed:
+                raise ValueError("A card can't be known to be held twice")
+            known |= h_fixed
+        self.unknown = DECK_MASK & ~known
+        # bitmask of the suits led (by suit id) each holder is void in
+        self.voids = [0] * (NUM_PLAYERS + 1)
+        self._n_seen = 0
+        self._allocations = None
+
+    def observe(self, played_card: Card, player_seat: int, lead_card: Card) -> None:
+        """
+        Track a played card
+
+        Parameters
+        ----------
+            played_card : card.Card
+                The card played
+
+            player_seat : int
+                The seat of the player that played the card
+
+            lead_card : card.Card
+                The card that started the trick (may be played_card)
+
+        Returns
+        -------
+            None
+        """
+        bit = 1 << card_ix(played_card)
+        if self.fixed[player_seat] & bit:
+            self.fixed[player_seat] ^= bit
+        elif self.unknown & bit:
+            self.unknown ^= bit
+        else:
+            raise ValueError(f"{played_card} can't be held by seat {player_seat}")
+        self.capacity[player_seat] -= 1
+        if lead_card.suit not in FOLLOWS[self.trump][card_ix(played_card)]:
+            self.voids[player_seat] |= 1 << lead_card.suit
+        self._allocations = None
+        self._n_seen += 1
+
+    def update(self, active_hand: Hand, active_trick: Trick) -> None:
+        """
+        Track any cards played since the last update
+
+        Parameters
+        ----------
+            active_hand : hand.Hand
+                The hand currently being played
+
+            active_trick : trick.Trick
+                The trick currently being played
+
+        Returns
+        -------
+            None
+        """
+        n_seen = 0
+        for played_trick in active_hand.tricks + [active_trick]:
+            for played_card in played_trick.played_cards:
+                if n_seen >= self._n_seen:
+                    self.observe(played_card.card, played_card.player_seat,
+                                played_trick.played_cards[0].card)
+                n_seen += 1
+
+    @property
+    def n_deals(self) -> int:
+        """
+        The number of deals of the unseen cards consistent with observations
+        """
+        return sum(self._get_allocations()[2])
+
+    def sample(self, n: int) -> ndarray:
+        """
+        Draw deals uniformly from those consistent with observations
+
+        Parameters
+        ----------
+            n : int
+                The number of deals to draw
+
+        Returns
+        -------
+            np.array : n x 5 int64 array of card bitmasks. Columns 0-3 are the
+                cards held by each seat, column 4 (KITTY) the kitty
+        """
+        holders, groups, weights, allocations = self._get_allocations()
+        total = sum(weights)
+        probs = array([w / total for w in weights])
+        choices = self.rng.choice(len(weights), size=n, p=probs)
+        masks = zeros((n, NUM_PLAYERS + 1), dtype=int64)
+        masks[:] = array(self.fixed, dtype=int64)
+        for g_ix, group in enumerate(groups):
+            if not group:
+                continue
+            # shuffle the group's cards, then hand out consecutive runs of
+            # the shuffled cards, sized by the selected allocation
+            shuffled = array(group, dtype=int64)[argsort(self.rng.random((n, len(group))), axis=1)]
+            bounds = cumsum(allocations[choices, g_ix, :], axis=1)
+            holder_pos = (arange(len(group))[None, :, None] >= bounds[:, None, :]).sum(axis=2)
+            bits = (1 << shuffled)
+            for h_pos, h in enumerate(holders):
+                masks[:, h] |= where(holder_pos == h_pos, bits, 0).sum(axis=1)
+        return masks
+
+    def sample_cards(self) -> Tuple[List[List[Card]], List[Card]]:
+        """
+        Draw a single deal, as cards
+
+        Returns
+        -------
+            List[List[card.Card]] : the cards held by each seat
+            List[card.Card] : the cards in the kitty
+        """
+        masks = self.sample(1)[0]
+        return [mask_cards(int(m)) for m in masks[:NUM_PLAYERS]], mask_cards(int(masks[KITTY]))
+
+    def _get_allocations(self) -> Tuple[List[int], List[List[int]], List[int], ndarray]:
+        """
+        Enumerate the allocations of unseen cards to holders, recomputing
+        only if a card has been observed since the last enumeration.
+
+        Returns
+        -------
+            List[int] : the holders the unseen cards are allocated over
+            List[List[int]] : groups of unseen card indices, by shared holder
+                eligibility
+            List[int] : the number of deals admitted by each allocation
+            np.array : (n allocations x n groups x n holders) card counts
+        """
+        if self._allocations is None:
+            holders = [h for h in range(NUM_PLAYERS + 1) if h != self.seat]
+            caps = tuple(self.capacity[h] - popcount(self.fixed[h]) for h in holders)
+            # group unseen cards by the holders that may hold them
+            groups: Dict[Tuple[bool, ...], List[int]] = {}
+            for suit in SUITS:
+                allowed = tuple(not (self.voids[h] >> suit) & 1 for h in holders)
+                groups.setdefault(allowed, []).extend(mask_ixs(self.unknown & SUIT_MASKS[suit]))
+            allowed_sets = list(groups.keys())
+            group_cards = [groups[a] for a in allowed_sets]
+            found = _enumerate_allocations([len(g) for g in group_cards], allowed_sets, caps)
+            if not found:
+                raise ValueError("No deal is consistent with the observed cards")
+            weights = [w for _, w in found]
+            allocations = array([alloc for alloc, _ in found], dtype=int64)
+            self._allocations = (holders, group_cards, weights, allocations)
+        return self._allocations
+
+
+def _enumerate_allocations(sizes: List[int], allowed: List[Tuple[bool, ...]],
+                        caps: Tuple[int, ...]) -> List[Tuple[List[Tuple[int, ...]], int]]:
+    """
+    Enumerate the ways of splitting groups of cards across holders, such that
+    each holder receives exactly its capacity.
+
+    Parameters
+    ----------
+        sizes : List[int]
+            The number of cards in each group
+
+        allowed : List[Tuple[bool, ...]]
+            For each group, the holders that may receive its cards
+
+        caps : Tuple[int, ...]
+            The number of cards each holder must receive
+
+    Returns
+    -------
+        List[Tuple[List[Tuple[int,...]], int]] : Each allocation (per group,
+            the count received by each holder) with the number of deals it
+            admits (the product of the multinomial coefficients of each group)
+    """
+    if sum(sizes) != sum(caps):
+        return []
+    if not sizes:
+        return [([], 1)]
+    found = []
+    for split in _splits(sizes[0], allowed[0], caps):
+        remaining = tuple(c - s for c, s in zip(caps, split))
+        n_ways = factorial(sizes[0])
+        for s in split:
+            n_ways //= factorial(s)
+        for rest, rest_ways in _enumerate_allocations(sizes[1:], allowed[1:], remaining):
+            found.append(([split] + rest, n_ways * rest_ways))
+    return found
+
+
+def _splits(n: int, allowed: Tuple[bool, ...], caps: Tuple[int, ...]) -> List[Tuple[int, ...]]:
+    """
+    All ways of dividing n cards between holders, respecting eligibility and
+    holder capacity
+    """
+    if not caps:
+        return [()] if n == 0 else []
+    first_max = min(n, caps[0]) if allowed[0] else 0
+    return [(first,) + rest
+            for first in range(first_max + 1)
+            for rest in _splits(n - first, allowed[1:], caps[1:])]
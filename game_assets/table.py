@@ -1,12 +1,20 @@
 from itertools import product
 from random import shuffle
-from typing import Dict, Tuple
+from time import perf_counter_ns
+from typing import Any, Callable, Dict, Generator, Tuple
 
+from numpy.random import SeedSequence, default_rng
+
+from .bitmask import NUM_CARDS
 from .card import Card
+from .deal_bank import CARDS, DealBank
+from .events import CardPlayed, DealEvent, Event, HandScored, PickupDecision, TrickWon, TrumpSelection
 from .hand import Hand
+from .instrumentation import (DEAL, EUCHRES, HANDS, KITTY_PICKUPS, PICK_TRUMP, PLAY_TRICK,
+                              SCORE_HAND, SCORE_TRICK, STUCK_DEALER, Instrumentation)
 from .players.player import Player
 from .trick import Trick
-from .euchre import NUM_PLAYERS, NUM_TRICKS, SUITS, CARD_FACES, TEAM_ZERO_ID, TEAM_ONE_ID
+from .euchre import NUM_PLAYERS, NUM_TRICKS, SUITS, CARD_FACES, TEAMS, TEAM_ZERO_ID, TEAM_ONE_ID
 
 class Table:
     """
@@ -17,13 +25,35 @@ class Table:
                 p1: Player,
                 p2: Player,
                 p3: Player,
-                p4: Player):
+                p4: Player,
+                instrumentation: Instrumentation = None,
+                deals: DealBank = None,
+                first_deal: int = 0,
+                seed: int = None):
         """
         Set up the table with the scorer and
         four players. Players [1,3] and [2,4] are on teams
 
         Parameters
         ----------
+            instrumentation : instrumentation.Instrumentation, default = None
+                If provided, hands are timed by phase, and events counted,
+                into this instance (e.g. instrumentation.PROCESS)
+
+            deals : deal_bank.DealBank, default = None
+                If provided, hands are dealt from the bank's decks, in order,
+                rather than shuffled
+
+            first_deal : int, default = 0
+                The index of the first hand's deal (in the bank, and in the
+                seed schedule)
+
+            seed : int, default = None
+                If provided, each hand's deck shuffle (unless dealt from a
+                bank) and the `rng` of each player having one are seeded
+                from (seed, deal index). Tables with the same seed then see
+                the same deals & random streams for a deal, whatever
+                happened in earlier hands: common random numbers
 
         Returns
         -------
@@ -41,6 +71,12 @@ class Table:
             TEAM_ONE_ID: 0
         }
         self.deck = [Card(suit, face) for suit, face in product(SUITS, CARD_FACES)]
+        self.instrumentation = instrumentation
+        self.deals = deals
+        self.deal_ix = first_deal
+        self.seed = seed
+        # event sinks, see `subscribe`
+        self.sinks = []
 
     def get_scores(self) -> Tuple[int,int]:
         """
@@ -56,6 +92,36 @@ class Table:
         """
         return [self.scores[k] for k in [TEAM_ZERO_ID, TEAM_ONE_ID]]
 
+    def subscribe(self, sink: Callable[[Event], None]) -> None:
+        """
+        Attach a sink, called with each event (see `events`) as hands are
+        played
+
+        Parameters
+        ----------
+            sink : Callable[[events.Event], None]
+                The event consumer
+
+        Returns
+        -------
+            None
+        """
+        self.sinks.append(sink)
+
+    def unsubscribe(self, sink: Callable[[Event], None]) -> None:
+        """
+        Detach a sink attached with `subscribe`
+        """
+        self.sinks.remove(sink)
+
+    def _emit(self, event: Event) -> None:
+        """
+        Pass an event to every sink. Callers check for sinks first, so
+        events aren't built without subscribers
+        """
+        for sink in self.sinks:
+            sink(event)
+
     def play_hand(self):
         """
         Play a hand (5 tricks) of euchre.
@@ -68,23 +134,94 @@ class Table:
         -------
             None
         """
+        _exhaust(self.hand_turns())
+
+    def hand_turns(self, player: Player = None) -> Generator[Tuple[Hand, Trick], Card, None]:
+        """
+        Play a hand as `play_hand`, but suspended at a player's turns: at
+        each, (hand, trick) is yielded, and the card the player plays is
+        sent back (removed from its hand by the caller), in place of calling
+        its `play_card`. With no player, the hand plays through.
+
+        Parameters
+        ----------
+            player : player.Player, default = None
+                The player whose cards are played by the caller
+
+        Returns
+        -------
+            Generator[Tuple[hand.Hand, trick.Trick], card.Card, None] : the
+                player's turns
+        """
+        timer = _NO_TIMER if self.instrumentation is None else _PhaseTimer(self.instrumentation)
         # deal out cards
+        start = timer.start()
         kitty_face_up = self._deal()
+        timer.stop(DEAL, start)
+        start = timer.start()
         pick_vals = self._pick_trump(kitty_face_up)
+        timer.stop(PICK_TRUMP, start)
         round_hand = Hand(pick_vals["bidder"],pick_vals["trump"],
                             kitty_face_up, pick_vals["pick_up"])
         for _ in range(NUM_TRICKS):
             # play the trick
-            played_trick = self._play_trick(round_hand)
+            start = timer.start()
+            played_trick = yield from self._trick_turns(round_hand, player)
+            timer.stop(PLAY_TRICK, start)
             # score the trick
+            start = timer.start()
             played_trick.score_trick(pick_vals["trump"])
+            timer.stop(SCORE_TRICK, start)
             round_hand.add_trick(played_trick)
+            if self.sinks:
+                self._emit(TrickWon(len(round_hand.tricks) - 1, played_trick.winning_player_seat))
+        start = timer.start()
         round_hand.score_hand()
+        timer.stop(SCORE_HAND, start)
+        if self.sinks:
+            self._emit(HandScored(round_hand.bidder, round_hand.trump, round_hand.winning_team,
+                                round_hand.points))
+        if self.instrumentation is not None:
+            self._count_hand(self.instrumentation, pick_vals, round_hand)
         # increment scores
         self.scores[round_hand.winning_team] += round_hand.points
         # pass the deal
         self._pass_deal()
 
+    def _count_hand(self, instrumentation: Instrumentation, pick_vals: Dict, round_hand: Hand) -> None:
+        """
+        Count a played hand's events & decisions, before the deal passes
+        """
+        self._count_bidding(instrumentation, pick_vals)
+        for player in self.players:
+            instrumentation.count(f"{type(player).__name__}.play_card", NUM_TRICKS)
+        instrumentation.count(HANDS)
+        if pick_vals["bidder"] not in TEAMS[round_hand.winning_team]:
+            instrumentation.count(EUCHRES)
+
+    def _count_bidding(self, instrumentation: Instrumentation, pick_vals: Dict) -> None:
+        """
+        Count the bidding decisions made by each player, kitty pickups, and
+        stuck dealers, given the outcome of `_pick_trump`
+        """
+        start_ix = (self.dealer + 1) % NUM_PLAYERS
+        player_order = list(range(start_ix, NUM_PLAYERS)) + list(range(start_ix))
+        bidder_pos = player_order.index(pick_vals["bidder"])
+        if pick_vals["pick_up"]:
+            kitty_callers = player_order[:bidder_pos + 1]
+            trump_callers = []
+            instrumentation.count(KITTY_PICKUPS)
+            instrumentation.count(f"{type(self.players[self.dealer]).__name__}.exchange_with_kitty")
+        else:
+            kitty_callers = player_order
+            trump_callers = player_order[:bidder_pos + 1]
+            if pick_vals["bidder"] == self.dealer:
+                instrumentation.count(STUCK_DEALER)
+        for player in kitty_callers:
+            instrumentation.count(f"{type(self.players[player]).__name__}.select_kitty_pickup")
+        for player in trump_callers:
+            instrumentation.count(f"{type(self.players[player]).__name__}.select_trump")
+
     def _deal(self) -> Card:
         """
         Deal a hand of cards
@@ -98,15 +235,40 @@ class Table:
             Card : the face-up card in the kitty
 
         """
-        # shuffle the deck
-        shuffle(self.deck)
+        if self.seed is not None:
+            deal_seq = self._seed_hand()
+        if self.deals is not None:
+            self.deck = self.deals.deck(self.deal_ix)
+        elif self.seed is not None:
+            self.deck = [CARDS[ix] for ix in default_rng(deal_seq).permutation(NUM_CARDS).tolist()]
+        else:
+            # shuffle the deck
+            shuffle(self.deck)
+        self.deal_ix += 1
         # hand out cards
         for p_ix, player in enumerate(self.players):
             start_ix = p_ix * NUM_TRICKS
             player.receive_cards(self.deck[start_ix:start_ix + NUM_TRICKS])
+        if self.sinks:
+            self._emit(DealEvent(self.dealer, tuple(tuple(p.cards_held) for p in self.players),
+                                self.deck[NUM_PLAYERS * NUM_TRICKS]))
         # return the kitty, which is the 21st card in the deck
         return self.deck[NUM_PLAYERS * NUM_TRICKS]
 
+    def _seed_hand(self) -> SeedSequence:
+        """
+        Seed the players' RNGs for the current deal, from the seed schedule
+
+        Returns
+        -------
+            SeedSequence : seeds the deal's shuffle
+        """
+        deal_seq, *player_seqs = SeedSequence([self.seed, self.deal_ix]).spawn(1 + NUM_PLAYERS)
+        for player, player_seq in zip(self.players, player_seqs):
+            if hasattr(player, "rng"):
+                player.rng = default_rng(player_seq)
+        return deal_seq
+
     def _pick_trump(self, kitty_card) -> Dict:
         """
         Have the four players perform trump selection (the calling round)
@@ -136,13 +298,15 @@ class Table:
 
         # kitty round
         for p_ix, player in enumerate(player_order):
-            # first and third
-            if p_ix % 2 != 0:
+            # first and third are the dealer's opponents, the dealer is last
+            if p_ix % 2 == 0:
                 pick_up = self.players[player].select_kitty_pickup(kitty_card, False, False)
-            elif p_ix == 2:
+            elif p_ix == 1:
                 pick_up = self.players[player].select_kitty_pickup(kitty_card, False, True)
             else:
                 pick_up = self.players[player].select_kitty_pickup(kitty_card, True, True)
+            if self.sinks:
+                self._emit(PickupDecision(player, kitty_card, pick_up))
             if pick_up:
                 selector = player
                 self.players[self.dealer].exchange_with_kitty(kitty_card)
@@ -160,6 +324,8 @@ class Table:
                     trump_suit = suit
                     selector = player
                     break
+        if self.sinks:
+            self._emit(TrumpSelection(selector, trump_suit, pick_up, self.dealer))
         return {"trump": trump_suit, "bidder": selector, "pick_up": pick_up}
 
     def _play_trick(self, active_hand: Hand) -> Trick:
@@ -172,8 +338,15 @@ class Table:
                 The hand currently under play
         Returns
         -------
-            trick.Trick : the played & scored trick
+            trick.Trick : the played (unscored) trick
+
+        """
+        return _exhaust(self._trick_turns(active_hand))
 
+    def _trick_turns(self, active_hand: Hand, player: Player = None) -> Generator[Tuple[Hand, Trick], Card, Trick]:
+        """
+        Play a single trick, suspended at a player's turn (see `hand_turns`),
+        returning the trick
         """
         active_trick = Trick()
         # establish who plays first
@@ -184,8 +357,13 @@ class Table:
             first_player = active_hand.tricks[-1].winning_player_seat
         # each player plays their cards
         for p in self.players[first_player:] + self.players[:first_player]:
-            played_card = p.play_card(active_hand, active_trick, self.dealer, first_player)
+            if p is player:
+                played_card = yield active_hand, active_trick
+            else:
+                played_card = p.play_card(active_hand, active_trick, self.dealer, first_player)
             active_trick.add_card(played_card, p.seat)
+            if self.sinks:
+                self._emit(CardPlayed(p.seat, played_card, len(active_hand.tricks), first_player))
 
         return active_trick
 
@@ -194,3 +372,43 @@ class Table:
         Pass the deal to the next dealer (positional)
         """
         self.dealer = (self.dealer + 1) % NUM_PLAYERS
+
+
+class _PhaseTimer:
+    """
+    Times the phases of a hand into an Instrumentation
+    """
+
+    def __init__(self, instrumentation: Instrumentation):
+        self.instrumentation = instrumentation
+
+    def start(self) -> int:
+        return perf_counter_ns()
+
+    def stop(self, phase: str, start: int) -> None:
+        self.instrumentation.record_time(phase, perf_counter_ns() - start)
+
+
+class _NoTimer:
+    """
+    A disabled _PhaseTimer
+    """
+
+    def start(self) -> int:
+        return 0
+
+    def stop(self, phase: str, start: int) -> None:
+        pass
+
+_NO_TIMER = _NoTimer()
+
+
+def _exhaust(turns: Generator) -> Any:
+    """
+    Run a generator of turns no caller plays, returning its value
+    """
+    try:
+        next(turns)
+    except StopIteration as stop:
+        return stop.value
+    raise RuntimeError("A turn was yielded with no player to take it")
@@ -0,0 +1,70 @@
+import unittest
+
+from numpy import argmax, array_equal
+from numpy.random import default_rng
+
+from game_assets.envs.subproc_env import SubprocVectorEuchreEnv, _layout
+from game_assets.envs.vector_env import N_ACTIONS, STATE_SIZE, VectorEuchreEnv
+from game_assets.euchre import NUM_TRICKS
+from game_assets.players.random_player import RandomPlayer
+
+
+def play(env, n_steps: int):
+    """
+    Step an environment with seeded random legal actions, returning copies
+    of its results
+    """
+    observations, masks = env.reset()
+    rng = default_rng(0)
+    trace = [(observations.copy(), masks.copy())]
+    for _ in range(n_steps):
+        actions = argmax(rng.random(masks.shape) * masks, axis=1)
+        observations, masks, rewards, dones = env.step(actions)
+        trace.append((observations.copy(), masks.copy(), rewards.copy(), dones.copy()))
+    return trace
+
+
+class TestSubprocVectorEuchreEnv(unittest.TestCase):
+
+    def test_layout(self):
+        layout, size = _layout(5)
+        offsets = [offset for _, _, _, offset in layout]
+        self.assertEqual(offsets, sorted(offsets))
+        self.assertTrue(all(offset % 8 == 0 for offset in offsets))
+        self.assertGreaterEqual(size, 5 * (STATE_SIZE * 8 + N_ACTIONS + 8 + 1 + 8))
+
+    def test_matches_vector_env(self):
+        """
+        Sharded tables play as the same tables in process
+        """
+        for n_workers, make_player in [(2, RandomPlayer), (3, None)]:
+            with self.subTest(n_workers=n_workers):
+                kwargs = {} if make_player is None else {"make_player": make_player}
+                expected_env = VectorEuchreEnv(5, seed=1, **kwargs)
+                expected = play(expected_env, 3 * NUM_TRICKS)
+                with SubprocVectorEuchreEnv(5, n_workers, seed=1, **kwargs) as env:
+                    self.assertEqual(len(env.shards), n_workers)
+                    trace = play(env, 3 * NUM_TRICKS)
+                    self.assertEqual(env.get_scores(),
+                                     [table.get_scores() for table in expected_env.tables])
+                for step, step_expected in zip(trace, expected):
+                    for result, result_expected in zip(step, step_expected):
+                        self.assertTrue(array_equal(result, result_expected))
+
+    def test_invalid(self):
+        with SubprocVectorEuchreEnv(2, 2) as env:
+            with self.assertRaises(RuntimeError):
+                env.step([0, 0])
+            _, masks = env.reset()
+            with self.assertRaises(ValueError):
+                env.step([int((~masks[0]).nonzero()[0][0]), int(masks[1].nonzero()[0][0])])
+        self.assertTrue(env.closed)
+        env.close()
+        with self.assertRaises(RuntimeError):
+            env.reset()
+        with self.assertRaises(ValueError):
+            SubprocVectorEuchreEnv(2, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import unittest
+
+from numpy import argmax, array_equal
+from numpy.random import default_rng
+
+from game_assets.bitmask import NUM_CARDS, card_ix
+from game_assets.envs.vector_env import (ACTION_CARD, CARD_ACTION, N_ACTIONS, STATE_SIZE,
+                                         VectorEuchreEnv)
+from game_assets.euchre import NUM_TRICKS, SUITS
+from game_assets.events import RewardAssigner
+from game_assets.players.random_player import RandomPlayer
+
+
+def random_actions(rng, masks):
+    return argmax(rng.random(masks.shape) * masks, axis=1)
+
+
+class TestVectorEuchreEnv(unittest.TestCase):
+
+    def test_action_tables(self):
+        for trump in SUITS:
+            with self.subTest(trump=trump):
+                self.assertEqual(sorted(CARD_ACTION[trump]), sorted(set(CARD_ACTION[trump])))
+                for ix in range(NUM_CARDS):
+                    self.assertEqual(ACTION_CARD[trump][CARD_ACTION[trump][ix]], ix)
+                self.assertEqual(ACTION_CARD[trump].count(-1), N_ACTIONS - NUM_CARDS)
+
+    def test_episodes(self):
+        """
+        Hands end every NUM_TRICKS steps, with the rewards RewardAssigner
+        gives the learner's seat
+        """
+        for learner_seat, make_player in [(0, None), (3, RandomPlayer)]:
+            with self.subTest(learner_seat=learner_seat):
+                kwargs = {} if make_player is None else {"make_player": make_player}
+                env = VectorEuchreEnv(4, learner_seat=learner_seat, seed=0, **kwargs)
+                assigners = [RewardAssigner() for _ in env.tables]
+                for table, assigner in zip(env.tables, assigners):
+                    table.subscribe(assigner)
+                observations, masks = env.reset()
+                self.assertEqual(observations.shape, (4, STATE_SIZE))
+                rng = default_rng(1)
+                rewards = []
+                for step in range(10 * NUM_TRICKS):
+                    observations, masks, step_rewards, dones = env.step(random_actions(rng, masks))
+                    rewards.append(step_rewards.copy())
+                    self.assertEqual(dones.tolist(), [(step + 1) % NUM_TRICKS == 0] * 4)
+                    self.assertTrue(masks.any(axis=1).all())
+                for env_ix, assigner in enumerate(assigners):
+                    self.assertEqual([r[env_ix] for r in rewards],
+                                     assigner.rewards[learner_seat])
+
+    def test_legal_masks(self):
+        """
+        Legal actions are the learner's held cards that follow the printed
+        suit led, as the engine's
+        """
+        env = VectorEuchreEnv(8, make_player=RandomPlayer, seed=2)
+        _, masks = env.reset()
+        rng = default_rng(3)
+        for _ in range(4 * NUM_TRICKS):
+            for env_ix, learner in enumerate(env.learners):
+                hand, trick = env._turns[env_ix]
+                held = [ACTION_CARD[hand.trump][a] for a in masks[env_ix].nonzero()[0]]
+                follows = [c for c in learner.cards_held if c.suit == trick.leading_suit]
+                expected = follows if follows else learner.cards_held
+                self.assertEqual(sorted(held), sorted(card_ix(c) for c in expected))
+                self.assertTrue(array_equal(env.observations[env_ix],
+                                            learner._get_state_repr(hand, trick)))
+            _, masks, _, _ = env.step(random_actions(rng, masks))
+
+    def test_seeded(self):
+        runs = []
+        for _ in range(2):
+            env = VectorEuchreEnv(3, seed=4)
+            observations, masks = env.reset()
+            rng = default_rng(5)
+            trace = [observations.copy()]
+            for _ in range(3 * NUM_TRICKS):
+                observations, masks, _, _ = env.step(random_actions(rng, masks))
+                trace.append(observations.copy())
+            runs.append(trace)
+        for a, b in zip(*runs):
+            self.assertTrue(array_equal(a, b))
+
+    def test_invalid(self):
+        env = VectorEuchreEnv(2)
+        with self.assertRaises(RuntimeError):
+            env.step([0, 0])
+        _, masks = env.reset()
+        with self.assertRaises(ValueError):
+            env.step([0])
+        illegal = [int((~masks[0]).nonzero()[0][0]), int(masks[1].nonzero()[0][0])]
+        with self.assertRaises(ValueError):
+            env.step(illegal)
+        with self.assertRaises(ValueError):
+            VectorEuchreEnv(0)
+        with self.assertRaises(ValueError):
+            VectorEuchreEnv(1, learner_seat=4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -638,4 +638,4 @@ class TestInvertCardReprIx(unittest.TestCase):
             trial_agent = RLTrickPlayer(0, None)
             with self.subTest(test=i):
                 with self.assertRaises(TypeError):
-                    trial_agent._invert_card_repr_ix(tc.card_ix, tc.trump_suit)\
+                    trial_agent._invert_card_repr_ix(tc.card_ix, tc.trump_suit)
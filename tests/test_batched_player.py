@@ -0,0 +1,150 @@
+from collections import Counter
+import unittest
+
+from numpy.random import default_rng
+
+from game_assets.bitmask import card_ix, cards_mask
+from game_assets.card import Card
+from game_assets.euchre import CLUB, DIAMOND, HEART, JACK, NUM_PLAYERS, SPADE, SUITS
+from game_assets.players.batched_player import (BatchSeat, ExchangeState, PlayState,
+                                                RandomBatchedPlayer, ScalarPlayerBatch,
+                                                TrumpState, legal_play_mask, mask_rows,
+                                                trump_rows)
+from game_assets.players.heuristic_player import HeuristicPlayer
+from game_assets.table import Table
+from game_assets.trick import Trick
+
+
+class TestLegalPlayMask(unittest.TestCase):
+
+    def test_follows_printed_suit(self):
+        """
+        Cards follow the printed suit led, as the engine's: the left bar
+        (of clubs) follows spades
+        """
+        left_bar, ace_spades, ace_hearts = Card(SPADE, JACK), Card(SPADE, 5), Card(HEART, 5)
+        held = cards_mask([left_bar, ace_spades, ace_hearts])
+        for lead_card, expected in [(Card(CLUB, 1), [left_bar, ace_spades, ace_hearts]),
+                                    (Card(SPADE, 1), [left_bar, ace_spades]),
+                                    (Card(HEART, 1), [ace_hearts]),
+                                    (Card(DIAMOND, 1), [left_bar, ace_spades, ace_hearts])]:
+            with self.subTest(lead_card=lead_card):
+                trick = Trick()
+                trick.add_card(lead_card, 0)
+                self.assertEqual(legal_play_mask(held, trick), cards_mask(expected))
+        self.assertEqual(legal_play_mask(held, Trick()), held)
+
+    def test_mask_rows(self):
+        rows = mask_rows([0b101, 1 << 23])
+        self.assertEqual(rows.shape, (2, 24))
+        self.assertEqual(rows[0].nonzero()[0].tolist(), [0, 2])
+        self.assertEqual(rows[1].nonzero()[0].tolist(), [23])
+        self.assertEqual(mask_rows([]).shape, (0, 24))
+
+
+class TestRandomBatchedPlayer(unittest.TestCase):
+
+    def setUp(self):
+        self.player = RandomBatchedPlayer(8, 0.25, default_rng(0))
+        self.rng = default_rng(1)
+
+    def test_plays_legal(self):
+        masks = [int(m) for m in self.rng.integers(1, 1 << 24, 500)]
+        states = [PlayState(k % 8, m, None, None, 0, 0) for k, m in enumerate(masks)]
+        for _ in range(5):
+            played = self.player.play_cards_batch(states, mask_rows(masks))
+            for mask, ix in zip(masks, played):
+                self.assertTrue((mask >> int(ix)) & 1)
+
+    def test_plays_uniform(self):
+        masks = [0b1011] * 9000
+        counts = Counter(self.player.play_cards_batch([None] * 9000, mask_rows(masks)).tolist())
+        self.assertEqual(set(counts), {0, 1, 3})
+        for n in counts.values():
+            self.assertAlmostEqual(n / 9000, 1 / 3, delta=0.03)
+
+    def test_select_trump(self):
+        states = [TrumpState(k % 8, 0, Card(k % 4, 0), k % 2 == 0) for k in range(4000)]
+        suits = self.player.select_trump_batch(states, trump_rows(states))
+        for state, suit in zip(states, suits):
+            self.assertNotEqual(suit, state.passed_card.suit)
+            if state.is_dealer:
+                self.assertIn(suit, SUITS)
+        calls = [suit != -1 for state, suit in zip(states, suits) if not state.is_dealer]
+        self.assertAlmostEqual(sum(calls) / len(calls), 0.25, delta=0.03)
+
+    def test_exchange(self):
+        masks = [int(m) for m in self.rng.integers(1, 1 << 24, 500)]
+        states = [ExchangeState(0, m, Card(0, 0)) for m in masks]
+        for mask, ix in zip(masks, self.player.exchange_with_kitty_batch(states)):
+            self.assertTrue((mask >> int(ix)) & 1)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            RandomBatchedPlayer(0)
+        with self.assertRaises(ValueError):
+            BatchSeat(0, self.player, 8)
+
+
+class TestScalarPlayerBatch(unittest.TestCase):
+
+    def test_table_unchanged(self):
+        """
+        Heuristic players play identically when seated through a batch
+        """
+        batch = ScalarPlayerBatch([HeuristicPlayer(i) for i in range(NUM_PLAYERS)])
+        tables = [Table(*[HeuristicPlayer(i) for i in range(NUM_PLAYERS)], seed=0),
+                  Table(*[BatchSeat(i, batch, i) for i in range(NUM_PLAYERS)], seed=0)]
+        events = [[], []]
+        for table, sink in zip(tables, events):
+            table.subscribe(sink.append)
+            for _ in range(300):
+                table.play_hand()
+        self.assertEqual(events[0], events[1])
+        self.assertEqual(tables[0].get_scores(), tables[1].get_scores())
+
+    def test_exchange_returns_discard(self):
+        player = HeuristicPlayer(0)
+        hand = [Card(HEART, 0), Card(HEART, 5), Card(CLUB, 4), Card(CLUB, 5), Card(SPADE, JACK)]
+        batch = ScalarPlayerBatch([player])
+        batch.receive_cards(0, hand)
+        kitty = Card(CLUB, JACK)
+        discard = batch.exchange_with_kitty_batch([ExchangeState(0, cards_mask(hand), kitty)])
+        self.assertEqual(discard.tolist(), [card_ix(Card(HEART, 0))])
+        self.assertIn(kitty, player.cards_held)
+
+
+class TestBatchSeat(unittest.TestCase):
+
+    def test_random_table(self):
+        """
+        Seats of a vectorized random player play whole hands
+        """
+        batch = RandomBatchedPlayer(NUM_PLAYERS, rng=default_rng(2))
+        seats = [BatchSeat(i, batch, i) for i in range(NUM_PLAYERS)]
+        table = Table(*seats)
+        for _ in range(200):
+            table.play_hand()
+            for seat in seats:
+                self.assertEqual(seat.cards_held, [])
+        self.assertGreater(sum(table.get_scores()), 0)
+
+    def test_select_trump_pass(self):
+        """
+        A pass is (-1, False), as HeuristicPlayer's
+        """
+        seat = BatchSeat(0, RandomBatchedPlayer(1, action_prob=0.0, rng=default_rng(0)))
+        seat.receive_cards([Card(SPADE, face) for face in range(5)])
+        heuristic = HeuristicPlayer(1, trump_call_act=0.0)
+        heuristic.receive_cards([Card(HEART, 0)] + [Card(DIAMOND, face) for face in range(4)])
+        passed_card = Card(CLUB, 1)
+        self.assertEqual(seat.select_trump(passed_card, False), (-1, False))
+        self.assertEqual(seat.select_trump(passed_card, False),
+                         heuristic.select_trump(passed_card, False))
+        suit, selected = seat.select_trump(passed_card, True)
+        self.assertTrue(selected)
+        self.assertNotEqual(suit, CLUB)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+import unittest
+
+from benchmarks.engine import PLAYER_MIXES, compare_results, run_benchmarks
+
+
+class TestBenchmarks(unittest.TestCase):
+
+    def test_run(self):
+        """
+        Every op is timed, with ordered percentiles
+        """
+        results = run_benchmarks(n=20)
+        self.assertEqual(len(results), 6 + len(PLAYER_MIXES))
+        for op, result in results.items():
+            with self.subTest(op=op):
+                self.assertGreater(result["ops_per_sec"], 0)
+                self.assertLessEqual(result["p50_us"], result["p90_us"])
+                self.assertLessEqual(result["p90_us"], result["p99_us"])
+
+    def test_compare(self):
+        """
+        Only median latency increases beyond the threshold are flagged
+        """
+        baseline = {"a": {"p50_us": 1.0}, "b": {"p50_us": 2.0}, "c": {"p50_us": 1.0}}
+        current = {"a": {"p50_us": 1.05}, "b": {"p50_us": 3.0}, "d": {"p50_us": 9.0}}
+        regressions = compare_results(current, baseline, threshold=0.1)
+        self.assertEqual(len(regressions), 1)
+        self.assertTrue(regressions[0].startswith("b:"))
+
+
+if __name__ == '__main__':
+    unittest.main()
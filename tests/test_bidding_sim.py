@@ -0,0 +1,103 @@
+import unittest
+
+from numpy.random import default_rng
+
+from game_assets import euchre
+from game_assets.bidding_sim import OutcomeModel, exchanged_hands, simulate_bidding
+from game_assets.bidding_table import BiddingTable
+from game_assets.bitmask import cards_mask, ix_card, mask_cards
+from game_assets.players.heuristic_player import HeuristicPlayer
+from game_assets.table import Table
+
+
+class TestSimulateBidding(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.table = BiddingTable.build()
+        cls.pickup_act = [0.05, 0.35, 0.6, 0.9]
+        cls.trump_call_act = [0.4, 0.55, 0.2, 0.7]
+        cls.result = simulate_bidding(3000, cls.pickup_act, cls.trump_call_act, cls.table,
+                                    rng=default_rng(0), keep_hands=True)
+
+    def test_matches_table(self):
+        """
+        Bidding matches Table._pick_trump between HeuristicPlayers
+        """
+        players = [HeuristicPlayer(seat, p, tc)
+                    for seat, (p, tc) in enumerate(zip(self.pickup_act, self.trump_call_act))]
+        h_table = Table(*players)
+        held = exchanged_hands(self.result)
+        for i in range(len(self.result.bidder)):
+            h_table.dealer = int(self.result.dealer[i])
+            for player, mask in zip(players, self.result.hands[i]):
+                player.receive_cards(mask_cards(int(mask)))
+            pick_vals = h_table._pick_trump(ix_card(int(self.result.upcard[i])))
+            with self.subTest(deal=i):
+                self.assertEqual(pick_vals["bidder"], self.result.bidder[i])
+                self.assertEqual(pick_vals["trump"], self.result.trump[i])
+                self.assertEqual(pick_vals["pick_up"], self.result.pick_up[i])
+                self.assertEqual([cards_mask(p.cards_held) for p in players], held[i].tolist())
+
+    def test_rates(self):
+        """
+        Every deal is called exactly once; the dealer deals in turn
+        """
+        self.assertAlmostEqual(self.result.call_rates().sum(), 1)
+        self.assertAlmostEqual(self.result.position_call_rates().sum(), 1)
+        self.assertEqual(self.result.dealer[:5].tolist(), [0, 1, 2, 3, 0])
+        stuck = self.result.position_call_rates()[1, euchre.NUM_PLAYERS - 1]
+        self.assertAlmostEqual(self.result.stuck_rate(), stuck)
+        self.assertTrue((self.result.pickup_rates() <= self.result.call_rates()).all())
+
+    def test_dealer_suit_rates(self):
+        """
+        Calls on the upcard's suit, by position, counted deal by deal
+        """
+        counts = [0] * euchre.NUM_PLAYERS
+        for trump, upcard, position in zip(self.result.trump, self.result.upcard, self.result.position):
+            if trump == ix_card(int(upcard)).suit:
+                counts[position] += 1
+        rates = self.result.dealer_suit_rates()
+        self.assertEqual(rates.tolist(), [n / len(self.result.bidder) for n in counts])
+        self.assertGreater(rates[euchre.NUM_PLAYERS - 1], 0)
+        # only the first round can call the upcard's suit
+        self.assertEqual(rates.tolist(), self.result.position_call_rates()[0].tolist())
+
+    def test_chunks(self):
+        """
+        Results are assembled over chunks of deals
+        """
+        result = simulate_bidding(70000, 0.35, 0.55, self.table, rng=default_rng(1))
+        self.assertEqual(len(result.bidder), 70000)
+        self.assertIsNone(result.hands)
+
+    def test_off_grid(self):
+        """
+        Activations must be on the table's grids
+        """
+        with self.assertRaises(ValueError):
+            simulate_bidding(10, 0.37, 0.55, self.table)
+
+
+class TestOutcomeModel(unittest.TestCase):
+
+    def test_fit(self):
+        """
+        Stronger bidders win more, and a model requires hands
+        """
+        result = simulate_bidding(20000, 0.35, 0.55, rng=default_rng(2), keep_hands=True)
+        model = OutcomeModel.fit(result)
+        self.assertEqual(model.counts.sum(), 20000)
+        expected = model.expected_points(result)
+        self.assertEqual(expected.shape, (20000,))
+        strong = result.bidder_score >= 40
+        self.assertGreater(expected[strong].mean(), expected[~strong].mean())
+        self.assertAlmostEqual(model.team_net_points(result).sum(), 0)
+        result.hands = None
+        with self.assertRaises(ValueError):
+            OutcomeModel.fit(result)
+
+
+if __name__ == '__main__':
+    unittest.main()
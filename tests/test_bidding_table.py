@@ -0,0 +1,113 @@
+from itertools import product
+import os
+import tempfile
+import unittest
+
+from numpy.random import default_rng
+
+from game_assets.bidding_table import DEALER, OPPONENT, PARTNER, BiddingTable
+from game_assets.bitmask import NUM_HANDS, all_hands, hand_rank, hand_ranks, ix_card, mask_cards
+from game_assets.card import Card
+from game_assets.players.heuristic_player import HeuristicPlayer
+
+
+class TestHandRank(unittest.TestCase):
+
+    def test_rank_round_trip(self):
+        """
+        all_hands lists every holding once, in rank order
+        """
+        masks = all_hands()
+        self.assertEqual(len(set(masks.tolist())), NUM_HANDS)
+        self.assertTrue((hand_ranks(masks) == range(NUM_HANDS)).all())
+        for rank in [0, 1, 1000, NUM_HANDS - 1]:
+            self.assertEqual(hand_rank(int(masks[rank])), rank)
+
+
+class TestBiddingTable(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.table = BiddingTable.build()
+
+    def test_matches_player(self):
+        """
+        Table decisions match the player's computed decisions
+        """
+        rng = default_rng(0)
+        masks = all_hands()
+        grid = self.table.pickup_grid
+        for _ in range(400):
+            cards = mask_cards(int(masks[rng.integers(NUM_HANDS)]))
+            # order affects the player's tie-breaks, so shuffle
+            cards = [cards[i] for i in rng.permutation(len(cards))]
+            upcard = ix_card(int(rng.choice([ix for ix in range(24) if ix_card(ix) not in cards])))
+            pickup_act = float(grid[rng.integers(len(grid))])
+            trump_call_act = float(self.table.trump_call_grid[rng.integers(len(grid))])
+            computed = HeuristicPlayer(0, pickup_act, trump_call_act)
+            looked_up = HeuristicPlayer(0, pickup_act, trump_call_act, self.table)
+            for player in [computed, looked_up]:
+                player.receive_cards(cards)
+            for is_dealer, partner in product([False, True], [False, True]):
+                with self.subTest(cards=cards, upcard=upcard, is_dealer=is_dealer, partner=partner):
+                    self.assertEqual(looked_up.select_kitty_pickup(upcard, is_dealer, partner),
+                                    computed.select_kitty_pickup(upcard, is_dealer, partner))
+            for is_dealer in [False, True]:
+                with self.subTest(cards=cards, passed=upcard, is_dealer=is_dealer):
+                    self.assertEqual(looked_up.select_trump(upcard, is_dealer),
+                                    computed.select_trump(upcard, is_dealer))
+            self.assertEqual(computed.cards_held, looked_up.cards_held)
+
+    def test_off_grid(self):
+        """
+        A player can't use a table for activations off its grid
+        """
+        with self.assertRaises(ValueError):
+            HeuristicPlayer(0, 0.37, 0.55, self.table)
+
+    def test_default_player(self):
+        """
+        A player of the default activations bids with the default table
+        """
+        computed = HeuristicPlayer(0)
+        looked_up = HeuristicPlayer(0, bidding_table=self.table)
+        cards = [Card(0, 0), Card(0, 3), Card(1, 3), Card(2, 5), Card(3, 1)]
+        for player in [computed, looked_up]:
+            player.receive_cards(list(cards))
+        for upcard in [Card(0, 5), Card(1, 5), Card(2, 0)]:
+            for is_dealer, partner in product([False, True], [False, True]):
+                with self.subTest(upcard=upcard, is_dealer=is_dealer, partner=partner):
+                    self.assertEqual(looked_up.select_kitty_pickup(upcard, is_dealer, partner),
+                                    computed.select_kitty_pickup(upcard, is_dealer, partner))
+            self.assertEqual(looked_up.select_trump(upcard, False), computed.select_trump(upcard, False))
+
+    def test_rates(self):
+        """
+        Rates are probabilities, non-decreasing in activation
+        """
+        pickup = self.table.pickup_rates()
+        self.assertEqual(pickup.shape, (3, len(self.table.pickup_grid)))
+        for role in [OPPONENT, PARTNER]:
+            self.assertTrue((pickup[role][1:] >= pickup[role][:-1]).all())
+        # the dealer's decision doesn't depend on pickup_act
+        self.assertEqual(len(set(pickup[DEALER].tolist())), 1)
+        call = self.table.trump_call_rates()
+        self.assertTrue((call[1:] >= call[:-1]).all())
+        self.assertTrue(0 <= call[0] and call[-1] <= 1)
+
+    def test_save_load(self):
+        """
+        A saved table loads with identical contents
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "table.npz")
+            self.table.save(path)
+            loaded = BiddingTable.load(path)
+        self.assertTrue((loaded.pickup_crit == self.table.pickup_crit).all())
+        self.assertTrue((loaded.trump_suit == self.table.trump_suit).all())
+        self.assertTrue((loaded.trump_crit == self.table.trump_crit).all())
+        self.assertTrue((loaded.pickup_grid == self.table.pickup_grid).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
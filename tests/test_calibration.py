@@ -0,0 +1,133 @@
+import os
+import tempfile
+import unittest
+
+from numpy import memmap, zeros
+from numpy.random import default_rng
+
+from game_assets import euchre
+from game_assets.bitmask import NUM_HANDS, card_ix, cards_mask, mask_cards
+from game_assets.calibration import (COUNT, EXPECTED_POINTS, NET_POINTS, WIN_PROB,
+                                     CalibrationTable, canonical_ranks)
+from game_assets.card import Card
+from game_assets.players.calibrated_player import CalibratedPlayer
+from game_assets.players.heuristic_player import HeuristicPlayer
+
+
+def relabel(mask: int, perm) -> int:
+    """
+    Relabel the suits of the cards in a bitmask
+    """
+    return cards_mask([Card(perm[c.suit], c.face) for c in mask_cards(mask)])
+
+
+class TestCanonicalRanks(unittest.TestCase):
+
+    def test_symmetric_holdings_share_rank(self):
+        """
+        Relabelling suits (keeping the left bar pairs) doesn't change the
+        canonical rank, where the upcard is relabelled with the holding
+        """
+        # suit permutations mapping left bar pairs to left bar pairs
+        perms = [[euchre.HEART, euchre.SPADE, euchre.CLUB, euchre.DIAMOND],
+                [euchre.CLUB, euchre.HEART, euchre.DIAMOND, euchre.SPADE],
+                [euchre.DIAMOND, euchre.CLUB, euchre.SPADE, euchre.HEART]]
+        rng = default_rng(0)
+        for _ in range(200):
+            ixs = rng.choice(24, size=6, replace=False).tolist()
+            mask = cards_mask(Card(ix // 6, ix % 6) for ix in ixs[:5])
+            upcard = Card(ixs[5] // 6, ixs[5] % 6)
+            rank = canonical_ranks(mask, card_ix(upcard))
+            for perm in perms:
+                moved = Card(perm[upcard.suit], upcard.face)
+                with self.subTest(mask=mask, upcard=upcard, perm=perm):
+                    self.assertEqual(canonical_ranks(relabel(mask, perm), card_ix(moved)), rank)
+
+    def test_net_points(self):
+        """
+        Bidders score 1 or 2 points, or are euchred for 2
+        """
+        self.assertEqual(NET_POINTS.tolist(), [-2, -2, -2, 1, 1, 2])
+
+
+class TestCalibrationTable(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.calibration = CalibrationTable.build(20000, seed=0)
+
+    def test_build(self):
+        """
+        Each deal is observed from four seats; estimates are in range
+        """
+        table = self.calibration.table
+        self.assertEqual(table[..., COUNT].sum(), 4 * 20000)
+        self.assertTrue(((table[..., WIN_PROB] >= 0) & (table[..., WIN_PROB] <= 1)).all())
+        self.assertTrue(((table[..., EXPECTED_POINTS] >= -2) & (table[..., EXPECTED_POINTS] <= 2)).all())
+
+    def test_workers(self):
+        """
+        Results don't depend on the number of workers
+        """
+        serial = CalibrationTable.build(70000, seed=1)
+        parallel = CalibrationTable.build(70000, n_workers=2, seed=1)
+        self.assertTrue((serial.table == parallel.table).all())
+
+    def test_save_load(self):
+        """
+        Saved tables load memory-mapped, with identical lookups
+        """
+        cards = [Card(euchre.HEART, euchre.JACK), Card(euchre.HEART, euchre.ACE),
+                Card(euchre.DIAMOND, euchre.JACK), Card(euchre.CLUB, euchre.NINE),
+                Card(euchre.SPADE, euchre.TEN)]
+        upcard = Card(euchre.HEART, euchre.KING)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "calibration.npy")
+            self.calibration.save(path)
+            loaded = CalibrationTable.load(path)
+            self.assertIsInstance(loaded.table, memmap)
+            for position in range(euchre.NUM_PLAYERS):
+                self.assertEqual(loaded.lookup(cards, upcard, position),
+                                self.calibration.lookup(cards, upcard, position))
+            del loaded
+
+
+class TestCalibratedPlayer(unittest.TestCase):
+
+    def setUp(self):
+        self.cards = [Card(euchre.HEART, euchre.NINE), Card(euchre.CLUB, euchre.TEN),
+                    Card(euchre.CLUB, euchre.NINE), Card(euchre.SPADE, euchre.NINE),
+                    Card(euchre.DIAMOND, euchre.TEN)]
+        self.upcard = Card(euchre.HEART, euchre.ACE)
+        self.table = zeros((NUM_HANDS, 6, 4, 3))
+
+    def test_uses_table(self):
+        """
+        With enough observations, the player orders up on expected points
+        """
+        rank = canonical_ranks(cards_mask(self.cards), card_ix(self.upcard))
+        self.table[rank, self.upcard.face, :, COUNT] = 100
+        self.table[rank, self.upcard.face, :, EXPECTED_POINTS] = [0.5, -0.5, 0.5, 0.1]
+        player = CalibratedPlayer(0, CalibrationTable(self.table))
+        player.receive_cards(self.cards)
+        self.assertTrue(player.select_kitty_pickup(self.upcard, False, False))
+        self.assertFalse(player.select_kitty_pickup(self.upcard, False, True))
+        self.assertTrue(player.select_kitty_pickup(self.upcard, True, True))
+        player.min_points = 0.2
+        self.assertFalse(player.select_kitty_pickup(self.upcard, True, True))
+
+    def test_falls_back(self):
+        """
+        Unobserved holdings are decided by the heuristic
+        """
+        player = CalibratedPlayer(0, CalibrationTable(self.table))
+        heuristic = HeuristicPlayer(1)
+        for p in [player, heuristic]:
+            p.receive_cards(self.cards)
+        for is_dealer, partner in [(False, False), (False, True), (True, True)]:
+            self.assertEqual(player.select_kitty_pickup(self.upcard, is_dealer, partner),
+                            heuristic.select_kitty_pickup(self.upcard, is_dealer, partner))
+
+
+if __name__ == '__main__':
+    unittest.main()
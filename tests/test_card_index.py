@@ -0,0 +1,85 @@
+import unittest
+
+from numpy.random import default_rng
+
+from game_assets.bitmask import card_ix, ix_card
+from game_assets.card_index import CardIndex
+from game_assets.euchre import SUITS
+from game_assets.players.heuristic_player import CARD_STRENGTHS, HeuristicPlayer
+
+
+def _first_min(cards, strengths):
+    """
+    The first of the weakest cards, by scan
+    """
+    return min(cards, key=lambda c: strengths[card_ix(c)])
+
+
+class TestCardIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = default_rng(0)
+
+    def _deal(self, n):
+        return [ix_card(ix) for ix in self.rng.permutation(24)[:n].tolist()]
+
+    def _check(self, index, cards, trump, strengths):
+        """
+        Compare each query with a scan of the cards, as HeuristicPlayer
+        selected them
+        """
+        player = HeuristicPlayer(0)
+        player.cards_held = list(cards)
+        strongest = max(cards, key=lambda c: strengths[card_ix(c)])
+        self.assertIs(index.strongest(), strongest)
+        self.assertIs(index.weakest(), _first_min(cards, strengths))
+        for lead in SUITS:
+            legal = [cards[ix] for ix in player.cards_in_suit(lead, lead == trump)] or cards
+            self.assertIs(index.weakest(lead), _first_min(legal, strengths))
+            for best in self._deal(24):
+                # a trick's winning card is trump, or of the suit led
+                if best in cards or not (best.is_trump(trump) or best.suit == lead):
+                    continue
+                winners = [c for c in legal if best.lt_card(c, trump, lead)]
+                expected = _first_min(winners, strengths) if winners else None
+                self.assertIs(index.weakest_winner(lead, best), expected)
+
+    def test_queries(self):
+        """
+        Queries match a scan, with heuristic & arbitrary strengths
+        """
+        for trial in range(200):
+            trump = trial % len(SUITS)
+            for strengths in (CARD_STRENGTHS[trump], self.rng.integers(0, 4, 24).tolist()):
+                with self.subTest(trial=trial, strengths=strengths):
+                    cards = self._deal(5)
+                    index = CardIndex(cards, trump, strengths)
+                    self._check(index, cards, trump, strengths)
+                    # exchange a card, then play the hand out
+                    kitty = next(c for c in self._deal(24) if c not in cards)
+                    index.remove(cards.pop(int(self.rng.integers(5))))
+                    cards.append(kitty)
+                    index.add(kitty)
+                    while cards:
+                        self._check(index, cards, trump, strengths)
+                        index.remove(cards.pop(int(self.rng.integers(len(cards)))))
+                    self.assertEqual(len(index), 0)
+
+    def test_trick_winner(self):
+        """
+        The trick winner matches Card.lt_card
+        """
+        for trial in range(500):
+            trump = trial % len(SUITS)
+            cards = self._deal(4)
+            lead = cards[0].suit
+            index = CardIndex([], trump, CARD_STRENGTHS[trump])
+            best = 0
+            for pos in range(1, 4):
+                if cards[best].lt_card(cards[pos], trump, lead):
+                    best = pos
+            self.assertEqual(index.trick_winner(lead, cards), best)
+
+
+if __name__ == '__main__':
+    unittest.main()
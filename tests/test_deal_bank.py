@@ -0,0 +1,113 @@
+import os
+import random
+import tempfile
+import unittest
+
+from game_assets.bitmask import card_ix
+from game_assets.deal_bank import DealBank
+from game_assets.euchre import NUM_PLAYERS, NUM_TRICKS
+from game_assets.events import DealEvent, EventRecorder
+from game_assets.players.heuristic_player import HeuristicPlayer
+from game_assets.players.random_player import RandomPlayer
+from game_assets.table import Table
+
+
+class TestDealBank(unittest.TestCase):
+
+    def setUp(self):
+        self.bank = DealBank.generate(50, seed=1)
+
+    def test_decks(self):
+        """
+        Each deal is a permutation of the deck; seeds reproduce banks
+        """
+        self.assertEqual(self.bank.decks.shape, (50, 24))
+        for deck in self.bank.decks:
+            self.assertEqual(sorted(deck.tolist()), list(range(24)))
+        self.assertTrue((DealBank.generate(50, seed=1).decks == self.bank.decks).all())
+        self.assertEqual([card_ix(c) for c in self.bank.deck(3)], self.bank.decks[3].tolist())
+        with self.assertRaises(IndexError):
+            self.bank.deck(50)
+
+    def test_save_load(self):
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "bank.npy")
+            self.bank.save(path)
+            for mmap in [True, False]:
+                with self.subTest(mmap=mmap):
+                    self.assertTrue((DealBank.load(path, mmap).decks == self.bank.decks).all())
+
+    def test_table_deals_from_bank(self):
+        """
+        Tables deal the bank's decks in order, from first_deal, regardless
+        of the players
+        """
+        for players in [[HeuristicPlayer(i) for i in range(NUM_PLAYERS)],
+                        [RandomPlayer(i) for i in range(NUM_PLAYERS)]]:
+            with self.subTest(player=type(players[0]).__name__):
+                random.seed(0)
+                recorder = EventRecorder()
+                table = Table(*players, deals=self.bank, first_deal=10)
+                table.subscribe(recorder)
+                for _ in range(5):
+                    table.play_hand()
+                deals = [e for e in recorder.events if isinstance(e, DealEvent)]
+                for deal_ix, event in enumerate(deals, start=10):
+                    deck = self.bank.decks[deal_ix].tolist()
+                    self.assertEqual([card_ix(c) for hand in event.hands for c in hand],
+                                     deck[:NUM_PLAYERS * NUM_TRICKS])
+                    self.assertEqual(card_ix(event.kitty_face_up), deck[NUM_PLAYERS * NUM_TRICKS])
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            DealBank(self.bank.decks[:, :5])
+
+
+if __name__ == '__main__':
+    unittest.main()
+
+
+class TestSeedSchedule(unittest.TestCase):
+
+    def _deals(self, table, n_hands):
+        recorder = EventRecorder()
+        table.subscribe(recorder)
+        for _ in range(n_hands):
+            table.play_hand()
+        return [e for e in recorder.events if isinstance(e, DealEvent)]
+
+    def test_reproducible(self):
+        """
+        Seeded tables replay the same deals & random play, whatever the
+        global RNG state
+        """
+        scores = []
+        for global_seed in [0, 1]:
+            random.seed(global_seed)
+            table = Table(*[RandomPlayer(i) for i in range(NUM_PLAYERS)], seed=7)
+            self._deals(table, 20)
+            scores.append(table.get_scores())
+        self.assertEqual(scores[0], scores[1])
+
+    def test_deal_aligned(self):
+        """
+        A deal's cards & random streams depend only on the seed and deal
+        index, not on earlier hands
+        """
+        full = self._deals(Table(*[RandomPlayer(i) for i in range(NUM_PLAYERS)], seed=3), 6)
+        # different players consume the RNG streams differently in earlier hands
+        later = self._deals(Table(*[HeuristicPlayer(i) for i in range(NUM_PLAYERS)], seed=3,
+                                  first_deal=4), 2)
+        self.assertEqual([e.hands for e in full[4:]], [e.hands for e in later])
+        self.assertEqual([e.kitty_face_up for e in full[4:]], [e.kitty_face_up for e in later])
+
+    def test_players_reseeded(self):
+        """
+        Seeded tables replace players' streams; unseeded tables leave them
+        """
+        players = [RandomPlayer(i) for i in range(NUM_PLAYERS)]
+        self.assertTrue(all(p.rng is None for p in players))
+        self._deals(Table(*players), 1)
+        self.assertTrue(all(p.rng is None for p in players))
+        self._deals(Table(*players, seed=0), 1)
+        self.assertTrue(all(p.rng is not None for p in players))
@@ -0,0 +1,117 @@
+import io
+import random
+import unittest
+
+from game_assets.euchre import NUM_PLAYERS, NUM_TRICKS
+from game_assets.events import (BinaryEventLogger, CardPlayed, DealEvent, EventCounter,
+                                EventRecorder, HandScored, PickupDecision, RewardAssigner,
+                                TrickWon, TrumpSelection, read_events)
+from game_assets.players.heuristic_player import HeuristicPlayer
+from game_assets.players.random_player import RandomPlayer
+from game_assets.table import Table
+
+
+class TestTableEvents(unittest.TestCase):
+
+    def setUp(self):
+        self.n_hands = 50
+        random.seed(0)
+        self.table = Table(*[HeuristicPlayer(i) for i in range(NUM_PLAYERS)])
+        self.recorder = EventRecorder()
+        self.counter = EventCounter()
+        self.table.subscribe(self.recorder)
+        self.table.subscribe(self.counter)
+        for _ in range(self.n_hands):
+            self.table.play_hand()
+
+    def test_play_unchanged(self):
+        """
+        Subscribers don't change play
+        """
+        random.seed(0)
+        h_table = Table(*[HeuristicPlayer(i) for i in range(NUM_PLAYERS)])
+        for _ in range(self.n_hands):
+            h_table.play_hand()
+        self.assertEqual(h_table.get_scores(), self.table.get_scores())
+
+    def test_event_counts(self):
+        """
+        Each hand emits one deal, trump selection & scoring, 5 tricks and
+        20 cards
+        """
+        counts = self.counter.counts
+        self.assertEqual(counts["DealEvent"], self.n_hands)
+        self.assertEqual(counts["TrumpSelection"], self.n_hands)
+        self.assertEqual(counts["HandScored"], self.n_hands)
+        self.assertEqual(counts["TrickWon"], self.n_hands * NUM_TRICKS)
+        self.assertEqual(counts["CardPlayed"], self.n_hands * NUM_TRICKS * NUM_PLAYERS)
+        self.assertGreaterEqual(counts["PickupDecision"], self.n_hands)
+        self.assertLessEqual(counts["PickupDecision"], NUM_PLAYERS * self.n_hands)
+
+    def test_events_describe_play(self):
+        """
+        Events carry what happened: scores sum to the table's, and players
+        (other than the dealer, who may exchange) play the cards dealt
+        """
+        events = self.recorder.events
+        points = [0, 0]
+        for event in events:
+            if isinstance(event, HandScored):
+                points[event.winning_team] += event.points
+        self.assertEqual(points, self.table.get_scores())
+        deal = events[0]
+        self.assertIsInstance(deal, DealEvent)
+        first_hand = events[:events.index(next(e for e in events if isinstance(e, HandScored))) + 1]
+        for seat in range(NUM_PLAYERS):
+            if seat == deal.dealer:
+                continue
+            played = [e.card for e in first_hand if isinstance(e, CardPlayed) and e.seat == seat]
+            self.assertCountEqual(played, deal.hands[seat])
+        kinds = [type(e) for e in first_hand]
+        self.assertLess(kinds.index(PickupDecision), kinds.index(TrumpSelection))
+        self.assertLess(kinds.index(TrumpSelection), kinds.index(CardPlayed))
+        self.assertEqual(kinds[-1], HandScored)
+
+    def test_unsubscribe(self):
+        """
+        Detached sinks receive no further events
+        """
+        self.table.unsubscribe(self.recorder)
+        n_events = len(self.recorder.events)
+        self.table.play_hand()
+        self.assertEqual(len(self.recorder.events), n_events)
+
+
+class TestSinks(unittest.TestCase):
+
+    def test_binary_round_trip(self):
+        """
+        Logged events read back equal
+        """
+        random.seed(1)
+        r_table = Table(*[RandomPlayer(i) for i in range(NUM_PLAYERS)])
+        stream = io.BytesIO()
+        recorder = EventRecorder()
+        r_table.subscribe(BinaryEventLogger(stream))
+        r_table.subscribe(recorder)
+        for _ in range(20):
+            r_table.play_hand()
+        stream.seek(0)
+        self.assertEqual(list(read_events(stream)), recorder.events)
+
+    def test_rewards(self):
+        """
+        Teammates share rewards, opponents receive the opposite
+        """
+        assigner = RewardAssigner()
+        assigner(TrickWon(0, 1))
+        assigner(TrickWon(NUM_TRICKS - 1, 1))
+        assigner(HandScored(1, 0, 1, 2))
+        self.assertEqual(assigner.rewards[1], [0.1, 2.1])
+        self.assertEqual(assigner.rewards[3], assigner.rewards[1])
+        self.assertEqual(assigner.rewards[0], [-0.1, -2.1])
+        self.assertEqual(assigner.rewards[2], assigner.rewards[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
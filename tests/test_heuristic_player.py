@@ -0,0 +1,93 @@
+from math import isclose
+import random
+import unittest
+
+from numpy.random import default_rng
+
+from game_assets.bitmask import card_ix, ix_card
+from game_assets.euchre import NUM_PLAYERS, SUITS
+from game_assets.players.heuristic_player import HeuristicPlayer, _card_score
+from game_assets.players.weighted_heuristic_player import NUM_WEIGHTS, WeightedHeuristicPlayer
+from game_assets.table import Table
+
+
+class CheckedHeuristicPlayer(HeuristicPlayer):
+    """
+    Checks the suit scores against a rescoring of the hand at each decision
+    """
+    def _check(self):
+        expected = [sum(_card_score(c, suit) for c in self.cards_held) for suit in SUITS]
+        assert self._suit_scores == expected, (self._suit_scores, expected)
+
+    def play_card(self, *args):
+        self._check()
+        card = super().play_card(*args)
+        self._check()
+        return card
+
+    def exchange_with_kitty(self, kitty_card):
+        super().exchange_with_kitty(kitty_card)
+        self._check()
+
+
+class CheckedWeightedHeuristicPlayer(WeightedHeuristicPlayer):
+    """
+    Checks the (float) suit scores against a rescoring of the hand at each
+    decision
+    """
+    def _check(self):
+        rows = [self._card_rows[card_ix(c)] for c in self.cards_held]
+        expected = [sum(row[suit] for row in rows) for suit in SUITS]
+        for actual, rescored in zip(self._suit_scores, expected):
+            assert isclose(actual, rescored, abs_tol=1e-9), (self._suit_scores, expected)
+
+    def play_card(self, *args):
+        self._check()
+        card = super().play_card(*args)
+        self._check()
+        return card
+
+    def exchange_with_kitty(self, kitty_card):
+        super().exchange_with_kitty(kitty_card)
+        self._check()
+
+
+class TestSuitScores(unittest.TestCase):
+
+    def test_maintained_through_play(self):
+        """
+        Suit scores match the hand as cards are dealt, exchanged & played
+        """
+        random.seed(0)
+        table = Table(*[CheckedHeuristicPlayer(i) for i in range(NUM_PLAYERS)])
+        for _ in range(200):
+            table.play_hand()
+
+    def test_weighted_maintained(self):
+        """
+        Weighted players keep their (float) scores too, as cards are
+        exchanged & played
+        """
+        weights = default_rng(0).random(NUM_WEIGHTS) + 0.01
+        players = [CheckedWeightedHeuristicPlayer(i, weights) for i in range(NUM_PLAYERS)]
+        table = Table(*players, seed=0)
+        for _ in range(200):
+            table.play_hand()
+
+    def test_dealer_pickup_leaves_hand(self):
+        """
+        The dealer's hypothetical exchange doesn't change the hand
+        """
+        rng = default_rng(1)
+        player = HeuristicPlayer(0)
+        for _ in range(100):
+            *hand, kitty = [ix_card(ix) for ix in rng.permutation(24)[:6].tolist()]
+            player.receive_cards(list(hand))
+            scores = list(player._suit_scores)
+            player._select_kitty_pickup_dealer(kitty)
+            self.assertEqual(player.cards_held, hand)
+            self.assertEqual(player._suit_scores, scores)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import io
+import os
+import random
+import tempfile
+import unittest
+
+from game_assets.bitmask import card_ix, cards_mask
+from game_assets.euchre import NUM_PLAYERS, NUM_TRICKS
+from game_assets.events import CardPlayed, DealEvent, EventRecorder, HandScored, TrickWon, TrumpSelection
+from game_assets.history import (HAND_DTYPE, HAND_DTYPE_DEALT, HistoryWriter, open_history,
+                                 played_seats)
+from game_assets.players.heuristic_player import HeuristicPlayer
+from game_assets.table import Table
+
+
+class TestHandHistory(unittest.TestCase):
+
+    def setUp(self):
+        self.n_hands = 40
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "hands.euhh")
+        random.seed(0)
+        self.table = Table(*[HeuristicPlayer(i) for i in range(NUM_PLAYERS)])
+        self.recorder = EventRecorder()
+        self.table.subscribe(self.recorder)
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def _play(self, writer, n_hands):
+        self.table.subscribe(writer)
+        for _ in range(n_hands):
+            self.table.play_hand()
+        self.table.unsubscribe(writer)
+
+    def test_record_size(self):
+        """
+        Records are fixed width & compact
+        """
+        self.assertEqual(HAND_DTYPE.itemsize, 32)
+        self.assertEqual(HAND_DTYPE_DEALT.itemsize, 48)
+
+    def test_round_trip(self):
+        """
+        Records match the events of each hand, with and without dealt cards
+        """
+        for with_dealt in [False, True]:
+            with self.subTest(with_dealt=with_dealt):
+                self.recorder.events.clear()
+                path = self.path + str(with_dealt)
+                with HistoryWriter(path, with_dealt=with_dealt, buffer_hands=7) as writer:
+                    self._play(writer, self.n_hands)
+                records = open_history(path)
+                self.assertEqual(len(records), self.n_hands)
+                self.assertEqual(records.dtype, HAND_DTYPE_DEALT if with_dealt else HAND_DTYPE)
+                seats = played_seats(records)
+                hand, n_played = 0, 0
+                for event in self.recorder.events:
+                    record = records[hand]
+                    if isinstance(event, DealEvent):
+                        self.assertEqual(record["dealer"], event.dealer)
+                        self.assertEqual(record["upcard"], card_ix(event.kitty_face_up))
+                        if with_dealt:
+                            self.assertEqual(record["dealt"].tolist(),
+                                             [cards_mask(h) for h in event.hands])
+                    elif isinstance(event, TrumpSelection):
+                        self.assertEqual(record["bidder"], event.bidder)
+                        self.assertEqual(record["trump"], event.trump)
+                        self.assertEqual(bool(record["pick_up"]), event.pick_up)
+                    elif isinstance(event, CardPlayed):
+                        self.assertEqual(record["cards"][n_played], card_ix(event.card))
+                        self.assertEqual(seats[hand, n_played], event.seat)
+                        n_played += 1
+                    elif isinstance(event, TrickWon):
+                        self.assertEqual(record["winners"][event.trick_number], event.winning_seat)
+                    elif isinstance(event, HandScored):
+                        self.assertEqual(record["winning_team"], event.winning_team)
+                        self.assertEqual(record["points"], event.points)
+                        self.assertEqual(n_played, NUM_PLAYERS * NUM_TRICKS)
+                        hand, n_played = hand + 1, 0
+                del records
+
+    def test_append(self):
+        """
+        Reopening a file appends to it; the dealt flag must match
+        """
+        for n in [10, 15]:
+            with HistoryWriter(self.path) as writer:
+                self._play(writer, n)
+        self.assertEqual(len(open_history(self.path)), 25)
+        with self.assertRaises(ValueError):
+            HistoryWriter(self.path, with_dealt=True)
+
+    def test_stream(self):
+        """
+        Writers accept open streams, and empty files read as empty arrays
+        """
+        stream = io.BytesIO()
+        writer = HistoryWriter(stream)
+        self._play(writer, 5)
+        writer.close()
+        self.assertEqual(len(stream.getvalue()), 8 + 5 * HAND_DTYPE.itemsize)
+        HistoryWriter(self.path).close()
+        self.assertEqual(len(open_history(self.path)), 0)
+
+    def test_not_history(self):
+        with open(self.path, "wb") as f:
+            f.write(b"notahistoryfile")
+        with self.assertRaises(ValueError):
+            open_history(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
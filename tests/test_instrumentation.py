@@ -0,0 +1,69 @@
+import pickle
+import random
+import unittest
+
+from game_assets.euchre import NUM_TRICKS
+from game_assets.instrumentation import (EUCHRES, HANDS, KITTY_PICKUPS, PHASES, PLAY_TRICK,
+                                         SCORE_TRICK, STUCK_DEALER, Instrumentation)
+from game_assets.players.heuristic_player import HeuristicPlayer
+from game_assets.table import Table
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    def setUp(self):
+        self.n_hands = 200
+        self.instrumentation = Instrumentation()
+        random.seed(0)
+        h_table = Table(*[HeuristicPlayer(i) for i in range(4)], instrumentation=self.instrumentation)
+        for _ in range(self.n_hands):
+            h_table.play_hand()
+        self.scores = h_table.get_scores()
+
+    def test_play_unchanged(self):
+        """
+        Instrumented tables play as uninstrumented tables do
+        """
+        random.seed(0)
+        h_table = Table(*[HeuristicPlayer(i) for i in range(4)])
+        for _ in range(self.n_hands):
+            h_table.play_hand()
+        self.assertEqual(h_table.get_scores(), self.scores)
+
+    def test_counts(self):
+        """
+        Phases and events are counted once per occurrence
+        """
+        events = self.instrumentation.events
+        calls = self.instrumentation.calls
+        self.assertEqual(events[HANDS], self.n_hands)
+        self.assertEqual(calls[PLAY_TRICK], self.n_hands * NUM_TRICKS)
+        self.assertEqual(calls[SCORE_TRICK], self.n_hands * NUM_TRICKS)
+        self.assertEqual(events["HeuristicPlayer.play_card"], 4 * self.n_hands * NUM_TRICKS)
+        self.assertEqual(events["HeuristicPlayer.exchange_with_kitty"], events[KITTY_PICKUPS])
+        # hands turned down go through all four players in the kitty round
+        n_turned_down = self.n_hands - events[KITTY_PICKUPS]
+        self.assertGreaterEqual(events["HeuristicPlayer.select_kitty_pickup"],
+                                4 * n_turned_down + events[KITTY_PICKUPS])
+        self.assertLessEqual(events["HeuristicPlayer.select_kitty_pickup"], 4 * self.n_hands)
+        self.assertGreaterEqual(events["HeuristicPlayer.select_trump"], n_turned_down)
+        self.assertLessEqual(events[STUCK_DEALER], self.n_hands - events[KITTY_PICKUPS])
+        self.assertLessEqual(events[EUCHRES], self.n_hands)
+        self.assertAlmostEqual(sum(self.instrumentation.phase_fractions().values()), 1)
+        for phase in PHASES:
+            self.assertIn(phase, self.instrumentation.summary())
+
+    def test_merge(self):
+        """
+        Instances (e.g. returned from workers) merge by summing
+        """
+        other = pickle.loads(pickle.dumps(self.instrumentation))
+        merged = Instrumentation().merge([self.instrumentation, other])
+        self.assertEqual(merged.events[HANDS], 2 * self.n_hands)
+        self.assertEqual(merged.time_ns[PLAY_TRICK], 2 * self.instrumentation.time_ns[PLAY_TRICK])
+        merged.reset()
+        self.assertEqual(merged.events[HANDS], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
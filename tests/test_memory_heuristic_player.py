@@ -0,0 +1,126 @@
+import unittest
+
+from game_assets.bitmask import card_ix, cards_mask
+from game_assets.card import Card
+from game_assets.card_index import FOLLOWS
+from game_assets.euchre import ACE, CLUB, DIAMOND, HEART, JACK, KING, NINE, NUM_PLAYERS, QUEEN, SPADE, TEN
+from game_assets.hand import Hand
+from game_assets.players.heuristic_player import HeuristicPlayer
+from game_assets.players.memory_heuristic_player import MemoryHeuristicPlayer
+from game_assets.table import Table
+from game_assets.trick import Trick
+
+
+class CheckedMemoryPlayer(MemoryHeuristicPlayer):
+    """
+    Checks the memory against the hand's history at each decision
+    """
+    n_checked = 0
+
+    def play_card(self, active_hand, active_trick, dealer_seat, lead_seat):
+        self.observe(active_hand, active_trick)
+        played, voids = 0, [0] * NUM_PLAYERS
+        for trick in active_hand.tricks + [active_trick]:
+            for played_card in trick.played_cards:
+                ix = card_ix(played_card.card)
+                played |= 1 << ix
+                lead = trick.played_cards[0].card.suit
+                if lead not in FOLLOWS[active_hand.trump][ix]:
+                    voids[played_card.player_seat] |= 1 << lead
+        assert self.played == played
+        assert self.voids == voids
+        assert self.accounted & cards_mask(self.cards_held) == cards_mask(self.cards_held)
+        assert self.accounted & played == played
+        CheckedMemoryPlayer.n_checked += 1
+        return super().play_card(active_hand, active_trick, dealer_seat, lead_seat)
+
+
+class TestMemoryHeuristicPlayer(unittest.TestCase):
+
+    def setUp(self):
+        self.player = MemoryHeuristicPlayer(0)
+        self.player.assign_seat(0)
+        self.player.receive_cards([Card(CLUB, KING), Card(SPADE, TEN), Card(HEART, NINE),
+                                   Card(DIAMOND, QUEEN), Card(SPADE, ACE)])
+        self.hand = Hand(1, SPADE, Card(HEART, ACE), False)
+
+    def _trick(self, *played):
+        trick = Trick()
+        for card, seat in played:
+            trick.add_card(card, seat)
+        return trick
+
+    def test_memory_matches_history(self):
+        """
+        The incrementally kept memory matches the played cards
+        """
+        CheckedMemoryPlayer.n_checked = 0
+        table = Table(CheckedMemoryPlayer(0), HeuristicPlayer(1), CheckedMemoryPlayer(2),
+                      HeuristicPlayer(3), seed=0)
+        for _ in range(300):
+            table.play_hand()
+        self.assertEqual(CheckedMemoryPlayer.n_checked, 300 * 10)
+
+    def test_boss(self):
+        """
+        The king is boss once the ace is played
+        """
+        hand = Hand(1, HEART, Card(DIAMOND, NINE), False)
+        self.player.observe(hand, Trick())
+        self.assertFalse(self.player.is_boss(Card(CLUB, KING)))
+        self.player.observe(hand, self._trick((Card(CLUB, ACE), 3)))
+        self.assertTrue(self.player.is_boss(Card(CLUB, KING)))
+
+    def test_left_bar_follows_printed_suit(self):
+        """
+        With spades trump the left bar follows (and tops) clubs, as
+        HeuristicPlayer.cards_in_suit
+        """
+        self.player.observe(self.hand, self._trick((Card(CLUB, ACE), 3)))
+        self.assertEqual(self.player.highest_outstanding(CLUB), card_ix(Card(CLUB, JACK)))
+        self.assertFalse(self.player.is_boss(Card(CLUB, KING)))
+
+    def test_highest_unplayed_trump(self):
+        """
+        The highest trump outstanding falls as trumps are played
+        """
+        self.player.observe(self.hand, Trick())
+        self.assertEqual(self.player.highest_unplayed_trump, card_ix(Card(SPADE, JACK)))
+        trick = self._trick((Card(SPADE, JACK), 1), (Card(CLUB, JACK), 2), (Card(SPADE, NINE), 3))
+        self.player.observe(self.hand, trick)
+        # the ace is held, so the king is highest
+        self.assertEqual(self.player.highest_unplayed_trump, card_ix(Card(SPADE, KING)))
+        self.assertTrue(self.player.is_boss(Card(SPADE, ACE)))
+
+    def test_voids(self):
+        """
+        Failing to follow shows a void, and the winner can't be beaten by a
+        seat void in the suit led & trump
+        """
+        trick = self._trick((Card(HEART, KING), 1), (Card(CLUB, NINE), 2))
+        self.player.observe(self.hand, trick)
+        self.assertEqual(self.player.voids[2], 1 << HEART)
+        self.assertEqual(self.player.voids[1], 0)
+        # the heart ace was turned down: the king can only be trumped
+        king = card_ix(Card(HEART, KING))
+        self.assertTrue(self.player._can_be_beaten(king, HEART, [3]))
+        self.player.voids[3] = 1 << SPADE
+        self.assertFalse(self.player._can_be_beaten(king, HEART, [3]))
+        # a heart ten can be beaten by following
+        self.assertTrue(self.player._can_be_beaten(card_ix(Card(HEART, TEN)), HEART, [3]))
+        self.player.voids[3] |= 1 << HEART
+        self.assertFalse(self.player._can_be_beaten(card_ix(Card(HEART, TEN)), HEART, [3]))
+
+    def test_new_hand_resets(self):
+        """
+        Memory starts afresh with each hand
+        """
+        self.player.observe(self.hand, self._trick((Card(CLUB, ACE), 3)))
+        hand = Hand(1, SPADE, Card(HEART, ACE), True)
+        self.player.observe(hand, Trick())
+        self.assertEqual(self.player.played, 0)
+        self.assertFalse(self.player.is_boss(Card(CLUB, KING)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import random
+import unittest
+
+from numpy import array, mean, var
+
+from game_assets.events import EventRecorder, HandScored
+from game_assets.online_stats import OnlineAggregator, RunningStats
+from game_assets.players.heuristic_player import HeuristicPlayer
+from game_assets.players.random_player import RandomPlayer
+from game_assets.table import Table
+
+
+class TestRunningStats(unittest.TestCase):
+
+    def test_matches_batch(self):
+        """
+        Running & merged statistics match those of the full data
+        """
+        rng = random.Random(0)
+        xs = [rng.gauss(3, 2) for _ in range(500)]
+        for split in [0, 1, 250, 499]:
+            with self.subTest(split=split):
+                a, b = RunningStats(), RunningStats()
+                for x in xs[:split]:
+                    a.update(x)
+                for x in xs[split:]:
+                    b.update(x)
+                a.merge(b)
+                self.assertEqual(a.count, len(xs))
+                self.assertAlmostEqual(a.mean, mean(xs))
+                self.assertAlmostEqual(a.variance, var(xs, ddof=1))
+
+    def test_empty(self):
+        stats = RunningStats()
+        self.assertEqual(stats.variance, 0.0)
+        stats.update(1.0)
+        self.assertEqual(stats.variance, 0.0)
+
+
+class TestOnlineAggregator(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(0)
+        self.m_samples, self.n_rounds = 6, 30
+        self.t0_scores = []
+        self.t1_scores = []
+        self.hands = []
+        # a worker per pair of samples, merged after
+        self.workers = [OnlineAggregator() for _ in range(3)]
+        for i in range(self.m_samples):
+            worker = self.workers[i // 2]
+            worker.new_sample()
+            recorder = EventRecorder()
+            table = Table(HeuristicPlayer(0), RandomPlayer(1), HeuristicPlayer(2), RandomPlayer(3))
+            table.subscribe(worker)
+            table.subscribe(recorder)
+            t0, t1 = [], []
+            for _ in range(self.n_rounds):
+                table.play_hand()
+                s0, s1 = table.get_scores()
+                t0.append(s0)
+                t1.append(s1)
+            self.t0_scores.append(t0)
+            self.t1_scores.append(t1)
+            self.hands += [e for e in recorder.events if isinstance(e, HandScored)]
+        self.aggregator = OnlineAggregator().merge(self.workers)
+
+    def test_score_curves(self):
+        """
+        Curves match the mean & variance over full score arrays
+        """
+        scores = [array(self.t0_scores), array(self.t1_scores)]
+        curves = self.aggregator.mean_score_curves()
+        self.assertEqual(curves.shape, (2, self.n_rounds))
+        for team in range(2):
+            with self.subTest(team=team):
+                self.assertTrue(((curves[team] - mean(scores[team], axis=0)) ** 2 < 1e-18).all())
+                variance = self.aggregator.curve.score_variance()[team]
+                self.assertTrue(((variance - var(scores[team], axis=0, ddof=1)) ** 2 < 1e-18).all())
+
+    def test_hand_stats(self):
+        """
+        Counts, rates & net points match the scored hands
+        """
+        agg = self.aggregator
+        self.assertEqual(agg.hands, self.m_samples * self.n_rounds)
+        net = [h.points if h.winning_team == 0 else -h.points for h in self.hands]
+        self.assertAlmostEqual(agg.net_points.mean, mean(net))
+        self.assertAlmostEqual(agg.net_points.variance, var(net, ddof=1))
+        euchres = [h for h in self.hands if h.bidder % 2 != h.winning_team]
+        marches = [h for h in self.hands if h.bidder % 2 == h.winning_team and h.points == 2]
+        self.assertAlmostEqual(agg.euchre_rate, len(euchres) / len(self.hands))
+        self.assertAlmostEqual(agg.march_rate, len(marches) / len(self.hands))
+        self.assertEqual(agg.points_histogram.tolist(),
+                         [sum(h.points == p for h in self.hands) for p in range(3)])
+
+    def test_merge_uneven(self):
+        """
+        Samples of differing lengths merge by hand index
+        """
+        a, b = OnlineAggregator(), OnlineAggregator()
+        for team in [0, 1, 0]:
+            a.record_hand(team, team, 1)
+        b.record_hand(1, 1, 2)
+        a.merge([b])
+        self.assertEqual(a.curve.count.tolist()[:3], [2, 1, 1])
+        self.assertEqual(a.mean_score_curves().tolist(), [[0.5, 1.0, 2.0], [1.0, 1.0, 1.0]])
+
+
+if __name__ == '__main__':
+    unittest.main()
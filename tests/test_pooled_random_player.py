@@ -0,0 +1,111 @@
+from collections import Counter
+from itertools import product
+import unittest
+
+from numpy.random import default_rng
+
+from game_assets.bitmask import cards_mask, mask_ixs, mask_select
+from game_assets.card import Card
+from game_assets.euchre import CARD_FACES, NUM_PLAYERS, SUITS
+from game_assets.players.pooled_random_player import PooledRandomPlayer
+from game_assets.table import Table
+from game_assets.trick import Trick
+
+
+class TestPooledRandomPlayer(unittest.TestCase):
+
+    def setUp(self):
+        self.deck = [Card(suit, face) for suit, face in product(SUITS, CARD_FACES)]
+        self.rng = default_rng(0)
+
+    def deal(self, player: PooledRandomPlayer) -> None:
+        player.receive_cards([self.deck[ix] for ix in self.rng.permutation(24)[:5]])
+
+    def test_mask_select(self):
+        for mask in [1, 0b1011, 1 << 23 | 1 << 5, cards_mask(self.deck[:7])]:
+            with self.subTest(mask=mask):
+                self.assertEqual([mask_select(mask, n) for n in range(len(mask_ixs(mask)))],
+                                 mask_ixs(mask))
+                with self.assertRaises(ValueError):
+                    mask_select(mask, len(mask_ixs(mask)))
+
+    def test_plays_legal_cards(self):
+        """
+        Plays follow the suit led when able, each legal card equally often
+        """
+        player = PooledRandomPlayer(0, rng=default_rng(1), pool_size=64)
+        hand = [Card(0, 0), Card(0, 3), Card(0, 5), Card(2, 1), Card(3, 3)]
+        for lead, legal in [(0, hand[:3]), (1, hand), (None, hand)]:
+            with self.subTest(lead=lead):
+                counts = Counter()
+                for _ in range(6000):
+                    player.receive_cards(list(hand))
+                    trick = Trick()
+                    if lead is not None:
+                        trick.add_card(Card(lead, 4), 3)
+                    card = player.play_card(None, trick, 0, 3)
+                    counts[(card.suit, card.face)] += 1
+                    self.assertNotIn(card, player.cards_held)
+                    self.assertEqual(player._held_mask, cards_mask(player.cards_held))
+                self.assertEqual(set(counts), {(c.suit, c.face) for c in legal})
+                for n in counts.values():
+                    self.assertGreater(n / 6000, 0.8 / len(legal))
+
+    def test_exchange_with_kitty(self):
+        player = PooledRandomPlayer(0, rng=default_rng(2))
+        for _ in range(200):
+            self.deal(player)
+            held = list(player.cards_held)
+            kitty = next(c for c in self.deck if c not in held)
+            removed = player.exchange_with_kitty(kitty)
+            self.assertIn(removed, held)
+            self.assertIn(kitty, player.cards_held)
+            self.assertEqual(player._held_mask, cards_mask(player.cards_held))
+
+    def test_bidding(self):
+        player = PooledRandomPlayer(0, action_prob=0.25, rng=default_rng(3))
+        n_trials = 20000
+        picked = sum(player.select_kitty_pickup(self.deck[0], False, False) for _ in range(n_trials))
+        self.assertAlmostEqual(picked / n_trials, 0.25, delta=0.02)
+        for passed in SUITS:
+            with self.subTest(passed=passed):
+                suits = Counter(player.select_trump(Card(passed, 0), True)[0] for _ in range(3000))
+                self.assertEqual(set(suits), set(SUITS) - {passed})
+
+    def test_stream_reproducible(self):
+        """
+        Decisions depend only on the stream, however far the pool was spent
+        """
+        player = PooledRandomPlayer(0, pool_size=8)
+        decisions = []
+        for spent in [0, 5, 13]:
+            player.rng = default_rng(4)
+            for _ in range(spent):
+                player._random()
+            player.rng = default_rng(4)
+            decisions.append([player.select_kitty_pickup(self.deck[0], False, False)
+                              for _ in range(40)])
+        self.assertEqual(decisions[0], decisions[1])
+        self.assertEqual(decisions[0], decisions[2])
+
+    def test_seeded_tables(self):
+        """
+        Seeded tables of pooled players play identically
+        """
+        results = []
+        for _ in range(2):
+            table = Table(*[PooledRandomPlayer(i) for i in range(NUM_PLAYERS)], seed=5)
+            events = []
+            table.subscribe(events.append)
+            for _ in range(200):
+                table.play_hand()
+            results.append(events)
+        self.assertEqual(results[0], results[1])
+
+    def test_invalid_pool_size(self):
+        with self.assertRaises(ValueError):
+            PooledRandomPlayer(0, pool_size=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+import os
+import random
+import tempfile
+import unittest
+
+from numpy import memmap
+
+from game_assets.euchre import NUM_PLAYERS, TEAM_ONE_ID, TEAM_ZERO_ID
+from game_assets.players.heuristic_player import HeuristicPlayer
+from game_assets.results import COLUMNS, ResultsWriter, SimulationResults
+from game_assets.table import Table
+
+
+class TestResults(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.m_samples, self.n_rounds = 3, 25
+        random.seed(0)
+        self.t0_scores = []
+        self.t1_scores = []
+        with ResultsWriter(self.dir.name, shard_size=10) as writer:
+            for i in range(self.m_samples):
+                if i > 0:
+                    writer.new_sample()
+                table = Table(*[HeuristicPlayer(p) for p in range(NUM_PLAYERS)])
+                table.subscribe(writer)
+                t0, t1 = [], []
+                for _ in range(self.n_rounds):
+                    table.play_hand()
+                    s0, s1 = table.get_scores()
+                    t0.append(s0)
+                    t1.append(s1)
+                self.t0_scores.append(t0)
+                self.t1_scores.append(t1)
+        self.results = SimulationResults(self.dir.name)
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_shards(self):
+        """
+        Hands are split over shards of shard_size, one file per column
+        """
+        self.assertEqual(len(self.results.shards), 8)
+        for shard in self.results.shards:
+            self.assertEqual(sorted(os.listdir(shard)), sorted(f"{c}.npy" for c in COLUMNS))
+        self.assertEqual(len(self.results), self.m_samples * self.n_rounds)
+
+    def test_running_scores(self):
+        """
+        Running scores match the table's, per sample
+        """
+        for team, expected in [(TEAM_ZERO_ID, self.t0_scores), (TEAM_ONE_ID, self.t1_scores)]:
+            with self.subTest(team=team):
+                self.assertEqual(self.results.running_scores(team).tolist(), expected)
+
+    def test_columns_consistent(self):
+        """
+        Points sum to the final scores, and hands are indexed per sample
+        """
+        points = self.results.column("points")
+        teams = self.results.column("winning_team")
+        samples = self.results.column("sample")
+        for i in range(self.m_samples):
+            with self.subTest(sample=i):
+                in_sample = samples == i
+                self.assertEqual(int(points[in_sample & (teams == 0)].sum()), self.t0_scores[i][-1])
+                self.assertEqual(int(points[in_sample & (teams == 1)].sum()), self.t1_scores[i][-1])
+                self.assertEqual(self.results.column("hand")[in_sample].tolist(),
+                                 list(range(self.n_rounds)))
+
+    def test_lazy_load(self):
+        """
+        Columns are only loaded when requested, as a memory map per shard
+        """
+        self.assertEqual(self.results._columns, {})
+        parts = self.results["points"]
+        self.assertEqual(list(self.results._columns), ["points"])
+        self.assertEqual(len(parts), len(self.results.shards))
+        for part in parts + self.results.load_column("points", shards=[0]):
+            self.assertIsInstance(part, memmap)
+        self.assertEqual(self.results.column("points", shards=[1, 2]).tolist(),
+                         parts[1].tolist() + parts[2].tolist())
+        with self.assertRaises(KeyError):
+            self.results["not_a_column"]
+
+    def test_append(self):
+        """
+        Reopened directories gain shards after those present
+        """
+        with ResultsWriter(self.dir.name) as writer:
+            writer.record_hand(0, 1, 2, True, 1, 2)
+        results = SimulationResults(self.dir.name)
+        self.assertEqual(len(results.shards), 9)
+        self.assertEqual(results.column("team_one_score")[-1], 2)
+        self.assertEqual(results.column("pick_up")[-1], True)
+        self.assertEqual(results.column("sample")[-1], self.m_samples)
+
+    def test_append_samples(self):
+        """
+        Appended runs number their samples after those present, so running
+        scores keep a row per sample
+        """
+        with ResultsWriter(self.dir.name, shard_size=10) as writer:
+            for i in range(2):
+                if i > 0:
+                    writer.new_sample()
+                table = Table(*[HeuristicPlayer(p) for p in range(NUM_PLAYERS)])
+                table.subscribe(writer)
+                for _ in range(self.n_rounds):
+                    table.play_hand()
+        results = SimulationResults(self.dir.name)
+        self.assertEqual(sorted(set(results.column("sample").tolist())),
+                         list(range(self.m_samples + 2)))
+        scores = results.running_scores(TEAM_ZERO_ID)
+        self.assertEqual(scores.shape, (self.m_samples + 2, self.n_rounds))
+        self.assertEqual(scores[:self.m_samples].tolist(), self.t0_scores)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            ResultsWriter(self.dir.name, shard_size=0)
+        with self.assertRaises(ValueError):
+            SimulationResults(os.path.join(self.dir.name, "missing"))
+        with self.assertRaises(ValueError):
+            self.results.running_scores(2)
+
+
+if __name__ == '__main__':
+    unittest.main()
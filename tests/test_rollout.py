@@ -0,0 +1,126 @@
+from itertools import product
+from random import Random
+import unittest
+
+from numpy import argsort, int64, zeros
+from numpy.random import default_rng
+
+from game_assets import euchre
+from game_assets.bitmask import NUM_FACES, ix_card, mask_cards
+from game_assets.hand import Hand
+from game_assets.players.heuristic_player import HeuristicPlayer
+from game_assets.rollout import HEURISTIC, RANDOM, TRICK_RANK, rollout, rollout_batch
+from game_assets.table import Table
+from game_assets.trick import Trick
+
+
+def random_deals(n: int, seed: int):
+    """
+    Deal n random sets of four five-card hands, as bitmasks
+    """
+    perm = argsort(default_rng(seed).random((n, 24)), axis=1)
+    hands = zeros((n, euchre.NUM_PLAYERS), dtype=int64)
+    for seat in range(euchre.NUM_PLAYERS):
+        hands[:, seat] = (1 << perm[:, 5 * seat:5 * (seat + 1)]).sum(axis=1)
+    return hands
+
+
+class TestTrickRank(unittest.TestCase):
+
+    def test_trick_rank_matches_score_trick(self):
+        """
+        The highest ranked card wins the trick, as scored by Trick.score_trick
+        """
+        rng = default_rng(0)
+        for trump, _ in product(euchre.SUITS, range(250)):
+            cards = rng.choice(24, size=4, replace=False)
+            played = Trick()
+            for seat, ix in enumerate(cards):
+                played.add_card(ix_card(int(ix)), seat)
+            played.score_trick(trump)
+            lead = cards[0] // NUM_FACES
+            with self.subTest(trump=trump, cards=cards):
+                self.assertEqual(TRICK_RANK[trump, lead, cards].argmax(),
+                                played.winning_player_seat)
+
+
+class TestRollout(unittest.TestCase):
+
+    def setUp(self):
+        self.n = 500
+        self.hands = random_deals(self.n, 1)
+        rng = default_rng(2)
+        self.trump = rng.integers(0, 4, self.n)
+        self.lead_seat = rng.integers(0, 4, self.n)
+        self.bidder = rng.integers(0, 4, self.n)
+
+    def test_heuristic_scalar_matches_batch(self):
+        """
+        The deterministic heuristic policy plays identically in both forms
+        """
+        batched = rollout_batch(self.hands, self.trump, self.lead_seat, self.bidder, HEURISTIC)
+        for i in range(self.n):
+            scalar = rollout([int(m) for m in self.hands[i]], int(self.trump[i]),
+                            int(self.lead_seat[i]), int(self.bidder[i]), HEURISTIC)
+            self.assertEqual(scalar.tricks, batched.tricks[i].tolist())
+            self.assertEqual(scalar.points, batched.points[i].tolist())
+
+    def test_heuristic_matches_player(self):
+        """
+        The heuristic policy plays as HeuristicPlayer does, where the players'
+        hands are sorted by card index (so both break ties the same way)
+        """
+        for i in range(self.n):
+            trump = int(self.trump[i])
+            hands = [int(m) for m in self.hands[i]]
+            players = [HeuristicPlayer(seat) for seat in range(euchre.NUM_PLAYERS)]
+            h_table = Table(*players)
+            for player, mask in zip(players, hands):
+                player.receive_cards(mask_cards(mask))
+            active_hand = Hand(int(self.bidder[i]), trump, None, False)
+            for _ in range(euchre.NUM_TRICKS):
+                played_trick = h_table._play_trick(active_hand)
+                played_trick.score_trick(trump)
+                active_hand.add_trick(played_trick)
+            active_hand.score_hand()
+            result = rollout(hands, trump, (h_table.dealer + 1) % euchre.NUM_PLAYERS,
+                            int(self.bidder[i]), HEURISTIC)
+            self.assertEqual(result.points[active_hand.winning_team], active_hand.points)
+            self.assertEqual(result.tricks,
+                            [sum(t.winning_player_seat in euchre.TEAMS[team] for t in active_hand.tricks)
+                                for team in [euchre.TEAM_ZERO_ID, euchre.TEAM_ONE_ID]])
+
+    def test_points_match_calc_points(self):
+        """
+        Points are awarded as in Hand._calc_points, to the team winning the hand
+        """
+        result = rollout_batch(self.hands, self.trump, self.lead_seat, self.bidder,
+                            [RANDOM, HEURISTIC, RANDOM, HEURISTIC], default_rng(3))
+        self.assertTrue((result.tricks.sum(axis=1) == euchre.NUM_TRICKS).all())
+        for tricks, points, bidder in zip(result.tricks, result.points, self.bidder):
+            winner = int(tricks[1] >= euchre.NUM_TRICKS_TO_WIN_HAND)
+            expected = [0, 0]
+            expected[winner] = Hand._calc_points(int(tricks[winner]), bidder % 2 == winner)
+            self.assertEqual(points.tolist(), expected)
+
+    def test_random_scalar_completes(self):
+        """
+        Random rollouts from a partially played hand play out the remaining tricks
+        """
+        rng = Random(4)
+        hands = [int(m) for m in self.hands[0]]
+        # drop two cards from every hand, as if two tricks were played
+        for seat in range(euchre.NUM_PLAYERS):
+            for _ in range(2):
+                hands[seat] &= hands[seat] - 1
+        result = rollout(hands, euchre.HEART, 2, 1, RANDOM, rng, tricks_won=(1, 1))
+        self.assertEqual(sum(result.tricks), euchre.NUM_TRICKS)
+
+    def test_bad_policy(self):
+        """
+        Unknown policies, or a policy list of the wrong length, raise
+        """
+        with self.assertRaises(ValueError):
+            rollout_batch(self.hands, self.trump, self.lead_seat, self.bidder, "greedy")
+        with self.assertRaises(ValueError):
+            rollout_batch(self.hands, self.trump, self.lead_seat, self.bidder, [RANDOM] * 3)
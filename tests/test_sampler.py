@@ -0,0 +1,207 @@
+from itertools import combinations, product
+import unittest
+
+from numpy.random import default_rng
+
+from game_assets import euchre
+from game_assets.bitmask import (DECK_MASK, NUM_FACES, SUIT_MASKS, card_ix, cards_mask,
+                                mask_ixs, popcount)
+from game_assets.card import Card
+from game_assets.hand import Hand
+from game_assets.players.heuristic_player import HeuristicPlayer
+from game_assets.players.random_player import RandomPlayer
+from game_assets.sampler import KITTY, HiddenHandSampler
+from game_assets.table import Table
+from game_assets.trick import Trick
+
+
+def brute_force_deals(sampler: HiddenHandSampler) -> int:
+    """
+    Count consistent deals of the sampler's unseen cards by direct enumeration
+    """
+    holders = [h for h in range(euchre.NUM_PLAYERS + 1) if h != sampler.seat]
+    caps = [sampler.capacity[h] - popcount(sampler.fixed[h]) for h in holders]
+
+    def count(cards, h_pos):
+        if h_pos == len(holders):
+            return int(not cards)
+        n = 0
+        for held in combinations(cards, caps[h_pos]):
+            held_mask = sum(1 << ix for ix in held)
+            void_mask = void_cards(sampler, holders[h_pos])
+            if held_mask & void_mask:
+                continue
+            n += count([c for c in cards if c not in held], h_pos + 1)
+        return n
+
+    return count(mask_ixs(sampler.unknown), 0)
+
+
+def void_cards(sampler: HiddenHandSampler, holder: int) -> int:
+    """
+    The bitmask of the cards a holder's voids rule out
+    """
+    return sum(SUIT_MASKS[s] for s in euchre.SUITS if (sampler.voids[holder] >> s) & 1)
+
+
+def sampling_player(player_class):
+    """
+    A player class observing each hand with a HiddenHandSampler, checking at
+    each of its turns that the real deal is one the sampler counts
+    """
+    class SamplingPlayer(player_class):
+        table = None
+        n_checks = 0
+
+        def play_card(self, active_hand, active_trick, dealer_seat, lead_seat):
+            played_seats = [played.player_seat for played in active_trick.played_cards]
+            if not active_hand.tricks and self.seat not in played_seats:
+                self.sampler = HiddenHandSampler(self.seat, self.cards_held, active_hand.trump,
+                                                 dealer_seat, active_hand.kitty_face_up,
+                                                 active_hand.kitty_picked_up)
+            self.sampler.update(active_hand, active_trick)
+            assert self.sampler.n_deals > 0
+            for seat, player in enumerate(self.table.players):
+                if seat != self.seat:
+                    held = cards_mask(player.cards_held)
+                    assert not held & void_cards(self.sampler, seat), (seat, player.cards_held)
+                    assert self.sampler.fixed[seat] & ~held == 0
+                    assert held & ~(self.sampler.fixed[seat] | self.sampler.unknown) == 0
+            SamplingPlayer.n_checks += 1
+            return super().play_card(active_hand, active_trick, dealer_seat, lead_seat)
+
+    return SamplingPlayer
+
+
+class TestTablePlay(unittest.TestCase):
+
+    def test_consistent_with_play(self):
+        """
+        Fed from seeded tables' play, the sampler's voids never contradict
+        the cards players hold, and the real deal is always counted
+        """
+        for player_class in (HeuristicPlayer, RandomPlayer):
+            with self.subTest(player=player_class.__name__):
+                observer = sampling_player(player_class)
+                table = Table(observer(0), *[player_class(i) for i in range(1, 4)], seed=11)
+                observer.table = table
+                for _ in range(300):
+                    table.play_hand()
+                self.assertEqual(observer.n_checks, 300 * euchre.NUM_TRICKS)
+
+
+class TestHiddenHandSampler(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Seat 0 holds five hearts (trump), seat 3 deals and picks up the
+        ace of spades. Three tricks have been played.
+        """
+        self.trump = euchre.HEART
+        self.held = [Card(euchre.HEART, f) for f in
+                    [euchre.NINE, euchre.TEN, euchre.QUEEN, euchre.KING, euchre.ACE]]
+        self.upcard = Card(euchre.SPADE, euchre.ACE)
+        self.sampler = HiddenHandSampler(0, self.held, self.trump, 3, self.upcard, True,
+                                        rng=default_rng(7))
+        tricks = [
+            # seat 1 leads clubs, seat 0 shows void in clubs
+            [(Card(euchre.CLUB, euchre.ACE), 1), (Card(euchre.CLUB, euchre.NINE), 2),
+             (Card(euchre.CLUB, euchre.TEN), 3), (Card(euchre.HEART, euchre.NINE), 0)],
+            # seat 0 leads trump, seats 1 and 3 show void in trump
+            [(Card(euchre.HEART, euchre.ACE), 0), (Card(euchre.SPADE, euchre.NINE), 1),
+             (Card(euchre.DIAMOND, euchre.JACK), 2), (Card(euchre.DIAMOND, euchre.NINE), 3)],
+            # seat 0 leads trump, seat 2 shows void in trump
+            [(Card(euchre.HEART, euchre.KING), 0), (Card(euchre.SPADE, euchre.TEN), 1),
+             (Card(euchre.SPADE, euchre.QUEEN), 2), (Card(euchre.DIAMOND, euchre.TEN), 3)],
+        ]
+        for played in tricks:
+            for c, seat in played:
+                self.sampler.observe(c, seat, played[0][0])
+
+    def test_voids_tracked(self):
+        """
+        Voids are tracked by the printed suit led, and the left bar follows
+        trump
+        """
+        self.assertEqual(self.sampler.voids[1], 1 << euchre.HEART)
+        self.assertEqual(self.sampler.voids[2], 1 << euchre.HEART)
+        self.assertEqual(self.sampler.voids[3], 1 << euchre.HEART)
+
+    def test_n_deals_matches_enumeration(self):
+        """
+        The counted number of consistent deals agrees with brute force
+        """
+        self.assertEqual(self.sampler.n_deals, brute_force_deals(self.sampler))
+
+    def test_samples_consistent(self):
+        """
+        Sampled deals are complete, disjoint, and respect voids and the
+        dealer's picked-up card
+        """
+        masks = self.sampler.sample(2000)
+        trump_mask = SUIT_MASKS[self.trump]
+        for row in masks:
+            row = [int(m) for m in row]
+            union = 0
+            for m in row:
+                self.assertEqual(union & m, 0)
+                union |= m
+            self.assertEqual(union, self.sampler.unknown | sum(self.sampler.fixed))
+            self.assertEqual([popcount(m) for m in row], self.sampler.capacity)
+            for seat in [1, 2, 3]:
+                self.assertEqual(row[seat] & trump_mask, 0)
+            self.assertTrue(row[3] >> card_ix(self.upcard) & 1)
+
+    def test_samples_uniform(self):
+        """
+        Location frequencies of an unseen card match brute-force
+        probabilities (binomial bounds of ~5 standard deviations)
+        """
+        n = 20000
+        masks = self.sampler.sample(n)
+        total = brute_force_deals(self.sampler)
+        probes = [card_ix(Card(euchre.HEART, euchre.JACK)),
+                card_ix(Card(euchre.CLUB, euchre.KING))]
+        for probe, h in product(probes, [1, 2, 3, KITTY]):
+            with self.subTest(probe=probe, holder=h):
+                expected = self._location_prob(probe, h, total)
+                observed = ((masks[:, h] >> probe) & 1).mean()
+                self.assertLess(abs(observed - expected),
+                                5 * (expected * (1 - expected) / n) ** 0.5 + 1e-9)
+
+    def test_update_is_incremental(self):
+        """
+        Updating from the hand's tricks only consumes unseen cards
+        """
+        sampler = HiddenHandSampler(0, self.held, self.trump, 3, self.upcard, True)
+        active_hand = Hand(0, self.trump, self.upcard, True)
+        active_trick = Trick()
+        active_trick.add_card(Card(euchre.CLUB, euchre.ACE), 1)
+        sampler.update(active_hand, active_trick)
+        active_trick.add_card(Card(euchre.CLUB, euchre.NINE), 2)
+        sampler.update(active_hand, active_trick)
+        sampler.update(active_hand, active_trick)
+        self.assertEqual(sampler.capacity, [5, 4, 4, 5, 4])
+        self.assertEqual(popcount(sampler.unknown), 24 - 5 - 1 - 2)
+
+    def test_inconsistent_card(self):
+        """
+        Observing a card known to be held elsewhere raises
+        """
+        with self.assertRaises(ValueError):
+            self.sampler.observe(Card(euchre.HEART, euchre.QUEEN), 1,
+                                Card(euchre.HEART, euchre.QUEEN))
+
+    def _location_prob(self, ix: int, holder: int, total: int) -> float:
+        """
+        Exact probability that card ix is with holder, by brute force
+        """
+        if (self.sampler.voids[holder] >> (ix // NUM_FACES)) & 1:
+            return 0
+        sampler = HiddenHandSampler.__new__(HiddenHandSampler)
+        sampler.__dict__.update(self.sampler.__dict__)
+        sampler.fixed = self.sampler.fixed[:]
+        sampler.capacity = self.sampler.capacity[:]
+        sampler.fixed[holder] |= 1 << ix
+        sampler.unknown = self.sampler.unknown & ~(1 << ix) & DECK_MASK
+        return brute_force_deals(sampler) / total
@@ -1,9 +1,10 @@
 import unittest
 
 
+from game_assets.players.heuristic_player import HeuristicPlayer
 from game_assets.players.random_player import RandomPlayer
 from game_assets.table import Table
-from game_assets.euchre import TEAM_ZERO_ID, TEAM_ONE_ID
+from game_assets.euchre import NUM_TRICKS, TEAM_ZERO_ID, TEAM_ONE_ID
 
 class TestGetScores(unittest.TestCase):
     """
@@ -41,6 +42,39 @@ class TestGetScores(unittest.TestCase):
                 actual_scores = self.base_table.get_scores()
                 self.assertEqual(score_pair, actual_scores)
 
+
+class TestHandTurns(unittest.TestCase):
+
+    def test_matches_play_hand(self):
+        """
+        Driving a seeded table through hand_turns, sending back the
+        suspended player's own choices, plays as play_hand
+        """
+        for make_player in (HeuristicPlayer, RandomPlayer):
+            with self.subTest(player=make_player.__name__):
+                tables = [Table(*[make_player(i) for i in range(4)], seed=3) for _ in range(2)]
+                events = [[], []]
+                for table, sink in zip(tables, events):
+                    table.subscribe(sink.append)
+                driven = tables[1].players[2]
+                for _ in range(50):
+                    tables[0].play_hand()
+                    turns = tables[1].hand_turns(driven)
+                    n_turns = 0
+                    try:
+                        active_hand, active_trick = next(turns)
+                        while True:
+                            n_turns += 1
+                            card = driven.play_card(active_hand, active_trick, tables[1].dealer,
+                                                    active_trick.played_cards[0].player_seat
+                                                    if active_trick.played_cards else driven.seat)
+                            active_hand, active_trick = turns.send(card)
+                    except StopIteration:
+                        pass
+                    self.assertEqual(n_turns, NUM_TRICKS)
+                self.assertEqual(events[0], events[1])
+                self.assertEqual(tables[0].get_scores(), tables[1].get_scores())
+
 """
 Additional unit tests not provided - behavior will be indirectly validated
 by review. The author is aware that the above tests are not of particuarly
@@ -0,0 +1,89 @@
+import random
+import unittest
+from itertools import product
+
+from numpy import array, ones
+from numpy.random import default_rng
+
+from game_assets.bitmask import ix_card
+from game_assets.card import Card
+from game_assets.euchre import CARD_FACES, NUM_PLAYERS, SUITS
+from game_assets.players.heuristic_player import HeuristicPlayer
+from game_assets.players.weighted_heuristic_player import (DEFAULT_WEIGHTS, HEURISTIC_BOUNDS,
+                                                           NUM_WEIGHTS, WeightedHeuristicPlayer,
+                                                           check_weights, hand_features,
+                                                           hand_strengths, score_bounds)
+from game_assets.table import Table
+
+
+class TestWeightedHeuristicPlayer(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = default_rng(0)
+        self.deck = [Card(suit, face) for suit, face in product(SUITS, CARD_FACES)]
+
+    def _hands(self, n):
+        return array([self.rng.permutation(24)[:5] for _ in range(n)])
+
+    def test_matches_heuristic(self):
+        """
+        Default weights & heuristic bounds score, bid and play as
+        HeuristicPlayer
+        """
+        heuristic = HeuristicPlayer(0)
+        weighted = WeightedHeuristicPlayer(0, bounds=HEURISTIC_BOUNDS)
+        for hand in self._hands(200):
+            cards = [ix_card(ix) for ix in hand.tolist()]
+            heuristic.receive_cards(list(cards))
+            weighted.receive_cards(list(cards))
+            for suit in SUITS:
+                self.assertAlmostEqual(heuristic._eval_hand_strength(suit),
+                                       weighted._eval_hand_strength(suit))
+        random.seed(0)
+        h_table = Table(*[HeuristicPlayer(i) for i in range(NUM_PLAYERS)], seed=1)
+        w_table = Table(*[WeightedHeuristicPlayer(i, bounds=HEURISTIC_BOUNDS)
+                          for i in range(NUM_PLAYERS)], seed=1)
+        for _ in range(100):
+            h_table.play_hand()
+            w_table.play_hand()
+        self.assertEqual(h_table.get_scores(), w_table.get_scores())
+
+    def test_batch_matches_players(self):
+        """
+        The matrix evaluator matches each player's strengths, for every
+        weight vector
+        """
+        weights = self.rng.random((3, NUM_WEIGHTS)) + 0.01
+        hands = self._hands(50)
+        strengths = hand_strengths(hand_features(hands), weights)
+        self.assertEqual(strengths.shape, (50, 4, 3))
+        for k, w in enumerate(weights):
+            player = WeightedHeuristicPlayer(0, w)
+            for n, hand in enumerate(hands):
+                player.receive_cards([ix_card(ix) for ix in hand.tolist()])
+                for suit in SUITS:
+                    with self.subTest(k=k, n=n, suit=suit):
+                        self.assertAlmostEqual(strengths[n, suit, k], player._eval_hand_strength(suit))
+
+    def test_bounds(self):
+        """
+        Exact bounds span [0, 1] over all holdings
+        """
+        low, high = score_bounds(DEFAULT_WEIGHTS)
+        self.assertAlmostEqual(low[0], 1/6)
+        self.assertAlmostEqual(high[0], 4)
+        low, high = score_bounds(ones((2, NUM_WEIGHTS)))
+        self.assertEqual((low.tolist(), high.tolist()), ([5, 5], [5, 5]))
+
+    def test_invalid_weights(self):
+        for weights in [ones(3), -ones(NUM_WEIGHTS), array([0] + [1] * (NUM_WEIGHTS - 1)),
+                        array([float("nan")] * NUM_WEIGHTS)]:
+            with self.subTest(weights=weights):
+                with self.assertRaises(ValueError):
+                    check_weights(weights)
+        with self.assertRaises(ValueError):
+            WeightedHeuristicPlayer(0, ones(NUM_WEIGHTS))
+
+
+if __name__ == '__main__':
+    unittest.main()
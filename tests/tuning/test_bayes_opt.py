@@ -0,0 +1,110 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from numpy import array, linspace, nan, zeros
+from numpy.linalg import LinAlgError
+from numpy.random import default_rng
+
+from game_assets.deal_bank import DealBank
+from tuning.bayes_opt import BayesianOptimizer, GaussianProcess, fit_gp, optimize_thresholds
+from tuning.search import SearchEngine
+
+
+class TestGaussianProcess(unittest.TestCase):
+
+    def test_interpolates(self):
+        """
+        With little noise, the posterior passes through the observations,
+        with small uncertainty there
+        """
+        x = linspace(0, 1, 8)[:, None]
+        y = (x[:, 0] - 0.3) ** 2
+        gp = GaussianProcess(0.2, 1.0, 1e-8).fit(x, y)
+        mean, std = gp.predict(x)
+        self.assertTrue((abs(mean - y) < 1e-4).all())
+        self.assertTrue((std < 1e-3).all())
+        _, far_std = gp.predict(array([[3.0]]))
+        self.assertGreater(far_std[0], 0.9)
+
+    def test_fit_noise(self):
+        """
+        Noisy observations of a constant select a noisy model
+        """
+        rng = default_rng(0)
+        x = rng.random((30, 2))
+        gp = fit_gp(x, rng.normal(size=30))
+        self.assertGreaterEqual(gp.noise_var / gp.signal_var, 0.1)
+
+    def test_fit_singular(self):
+        """
+        A singular kernel matrix for every grid point is retried with
+        jitter, and a GP is always returned or an error raised
+        """
+        x = zeros((4, 2))
+        y = array([0.0, 1.0, 2.0, 3.0])
+        with patch("tuning.bayes_opt.NOISE_RATIOS", [0.0]):
+            gp = fit_gp(x, y)
+            self.assertIsInstance(gp, GaussianProcess)
+            self.assertGreater(gp.noise_var, 0)
+            with patch("tuning.bayes_opt.JITTERS", [0.0]):
+                with self.assertRaises(LinAlgError):
+                    fit_gp(x, y)
+        with self.assertRaises(ValueError):
+            fit_gp(x, array([0.0, nan, 1.0, 2.0]))
+
+
+class TestBayesianOptimizer(unittest.TestCase):
+
+    def test_finds_optimum(self):
+        """
+        The optimum of a noisy quadratic is found in a few batches
+        """
+        rng = default_rng(1)
+        target = array([0.7, 0.2])
+
+        def objective(points):
+            return -((points - target) ** 2).sum(axis=1) + 0.01 * rng.normal(size=len(points))
+
+        optimizer = BayesianOptimizer([(0, 1), (0, 1)], batch_size=4, seed=0, n_candidates=500)
+        point, _ = optimizer.run(objective, 6)
+        self.assertLess(abs(point - target).max(), 0.15)
+        self.assertEqual(len(optimizer.y), 24)
+
+    def test_batches(self):
+        """
+        Batches are within bounds, and distinct (constant liar)
+        """
+        optimizer = BayesianOptimizer([(0, 2), (-1, 1), (5, 6)], batch_size=3, n_initial=3, seed=0,
+                                      n_candidates=200)
+        for _ in range(2):
+            points = optimizer.ask()
+            self.assertEqual(points.shape, (3, 3))
+            self.assertTrue(((points >= optimizer.bounds[:, 0]) & (points <= optimizer.bounds[:, 1])).all())
+            self.assertEqual(len({tuple(p) for p in points.tolist()}), 3)
+            optimizer.tell(points, points.sum(axis=1))
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            BayesianOptimizer([(1, 0)])
+        with self.assertRaises(ValueError):
+            BayesianOptimizer([(0, 1)]).best()
+
+
+class TestOptimizeThresholds(unittest.TestCase):
+
+    def test_run(self):
+        with tempfile.TemporaryDirectory() as d:
+            bank_path = os.path.join(d, "bank.npy")
+            DealBank.generate(200, seed=0).save(bank_path)
+            engine = SearchEngine(bank_path, block_hands=50)
+            config, mean = optimize_thresholds(engine, 100, n_rounds=3, batch_size=2, seed=0,
+                                               n_initial=2, n_candidates=100)
+            self.assertEqual(len(config), 2)
+            self.assertTrue(all(0 <= v <= 1 for v in config))
+            self.assertEqual(engine.n_played, 12)
+
+
+if __name__ == '__main__':
+    unittest.main()
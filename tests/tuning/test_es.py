@@ -0,0 +1,75 @@
+import os
+import tempfile
+import unittest
+
+from numpy import array, ones
+
+from game_assets.players.weighted_heuristic_player import DEFAULT_WEIGHTS, NUM_WEIGHTS
+from tuning.es import EvolutionStrategy, rank_utilities, to_weights
+
+
+class TestES(unittest.TestCase):
+
+    def _es(self, **kwargs):
+        return EvolutionStrategy(population=4, hands_per_candidate=40, block_hands=20, **kwargs)
+
+    def test_utilities(self):
+        """
+        Utilities sum to 0, and are ordered as the scores
+        """
+        scores = array([0.1, 0.5, -0.2, 0.3])
+        utilities = rank_utilities(scores)
+        self.assertAlmostEqual(utilities.sum(), 0)
+        by_score = utilities[scores.argsort()]
+        self.assertTrue((by_score[1:] >= by_score[:-1]).all())
+        self.assertGreater(utilities[1], utilities[3])
+
+    def test_to_weights(self):
+        weights = to_weights(-ones(NUM_WEIGHTS))
+        self.assertTrue((weights[:7] > 0).all())
+        self.assertTrue((weights[7:] == 0).all())
+
+    def test_converges(self):
+        """
+        The search distribution moves to the optimum of a noiseless
+        objective
+        """
+        target = DEFAULT_WEIGHTS + 0.2
+        es = EvolutionStrategy(population=16, sigma=0.2)
+        for _ in range(300):
+            z, candidates = es.ask()
+            es.tell(z, -((candidates - target) ** 2).sum(axis=1), candidates)
+        self.assertLess(abs(es.mean_weights - target).max(), 0.05)
+        self.assertEqual(es.state.generation, 300)
+
+    def test_common_deals(self):
+        """
+        Identical candidates in a generation score identically
+        """
+        es = self._es()
+        scores = es.evaluate(array([DEFAULT_WEIGHTS, DEFAULT_WEIGHTS]))
+        self.assertEqual(scores[0], scores[1])
+
+    def test_deterministic_resume(self):
+        """
+        Runs don't depend on the number of workers, or on being resumed
+        """
+        serial = self._es().run(2)
+        parallel = self._es(n_workers=2).run(2)
+        self.assertEqual(serial, parallel)
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "es.json")
+            self._es(checkpoint_path=path).run(1)
+            resumed = self._es(checkpoint_path=path)
+            self.assertEqual(resumed.state.generation, 1)
+            self.assertEqual(resumed.run(2), serial)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            EvolutionStrategy(population=3)
+        with self.assertRaises(ValueError):
+            EvolutionStrategy(initial=ones(3))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+
+from game_assets.players.heuristic_player import HeuristicPlayer
+from game_assets.players.random_player import RandomPlayer
+from game_assets.table import Table
+from tuning.paired import paired_compare
+
+
+def heuristic_vs_random(pickup_act, trump_call_act):
+    return lambda **kw: Table(HeuristicPlayer(0, pickup_act, trump_call_act), RandomPlayer(1),
+                              HeuristicPlayer(2, pickup_act, trump_call_act), RandomPlayer(3), **kw)
+
+
+class TestPaired(unittest.TestCase):
+
+    def test_identical(self):
+        """
+        Identical configurations have no difference, in every block
+        """
+        result = paired_compare(heuristic_vs_random(0.3, 0.5), heuristic_vs_random(0.3, 0.5),
+                                n_blocks=4, block_hands=50)
+        self.assertEqual((result.difference, result.stderr), (0.0, 0.0))
+        self.assertGreater(result.unpaired_stderr, 0.0)
+        self.assertEqual(result.n_hands, 200)
+
+    def test_variance_reduction(self):
+        """
+        Common random numbers reduce the variance of nearby configurations'
+        difference
+        """
+        result = paired_compare(heuristic_vs_random(0.3, 0.5), heuristic_vs_random(0.35, 0.55),
+                                n_blocks=10, block_hands=100)
+        self.assertLess(result.stderr, result.unpaired_stderr)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            paired_compare(heuristic_vs_random(0.3, 0.5), heuristic_vs_random(0.3, 0.5), n_blocks=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
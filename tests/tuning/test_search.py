@@ -0,0 +1,107 @@
+import os
+import tempfile
+import unittest
+
+from game_assets.deal_bank import DealBank
+from tuning.search import Evaluation, SearchEngine, grid_configs, random_configs
+
+
+class TestSearch(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.bank_path = os.path.join(self.dir.name, "bank.npy")
+        DealBank.generate(1000, seed=0).save(self.bank_path)
+        self.checkpoint = os.path.join(self.dir.name, "search.jsonl")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_configs(self):
+        self.assertEqual(grid_configs([0, 0.5], [1]), [(0.0, 1.0), (0.5, 1.0)])
+        configs = random_configs(5, seed=3)
+        self.assertEqual(configs, random_configs(5, seed=3))
+        self.assertTrue(all(0 <= v <= 1 for c in configs for v in c))
+
+    def test_deterministic(self):
+        """
+        Evaluations depend on neither the number of workers nor the order
+        blocks were played in
+        """
+        configs = grid_configs([0.05, 0.5], [0.4, 0.9])
+        serial = SearchEngine(self.bank_path, block_hands=50).evaluate(configs, 200)
+        parallel = SearchEngine(self.bank_path, block_hands=50, n_workers=2).evaluate(configs, 200)
+        self.assertEqual(serial, parallel)
+        incremental = SearchEngine(self.bank_path, block_hands=50)
+        incremental.evaluate(configs[:1], 100)
+        self.assertEqual(incremental.evaluate(configs, 200), serial)
+        self.assertEqual(incremental.n_played, 16)
+
+    def test_common_deals(self):
+        """
+        Identical configurations on the same blocks score identically, and
+        budgets round up to whole blocks
+        """
+        engine = SearchEngine(self.bank_path, opponent=(0.05, 0.4), block_hands=50)
+        a, b = engine.evaluate([(0.2, 0.6), (0.2, 0.6)], 120)
+        self.assertEqual(a, b)
+        self.assertEqual(a.n_hands, 150)
+        self.assertEqual(engine.n_played, 3)
+
+    def test_resume(self):
+        """
+        A new engine on a checkpoint replays nothing already played
+        """
+        configs = grid_configs([0.1, 0.3], [0.5])
+        first = SearchEngine(self.bank_path, block_hands=50, checkpoint_path=self.checkpoint)
+        expected = first.evaluate(configs, 100)
+        resumed = SearchEngine(self.bank_path, block_hands=50, checkpoint_path=self.checkpoint)
+        self.assertEqual(resumed.evaluate(configs, 100), expected)
+        self.assertEqual(resumed.n_played, 0)
+        resumed.evaluate(configs, 150)
+        self.assertEqual(resumed.n_played, 2)
+        with self.assertRaises(ValueError):
+            SearchEngine(self.bank_path, block_hands=25, checkpoint_path=self.checkpoint)
+
+    def test_resume_truncated(self):
+        """
+        A checkpoint whose last line was partly written resumes, replaying
+        that block, and resumes again
+        """
+        configs = grid_configs([0.1, 0.3], [0.5])
+        expected = SearchEngine(self.bank_path, block_hands=50,
+                                checkpoint_path=self.checkpoint).evaluate(configs, 100)
+        with open(self.checkpoint, "rb+") as f:
+            f.truncate(os.path.getsize(self.checkpoint) - 10)
+        resumed = SearchEngine(self.bank_path, block_hands=50, checkpoint_path=self.checkpoint)
+        self.assertEqual(resumed.evaluate(configs, 100), expected)
+        self.assertEqual(resumed.n_played, 1)
+        again = SearchEngine(self.bank_path, block_hands=50, checkpoint_path=self.checkpoint)
+        self.assertEqual(again.evaluate(configs, 100), expected)
+        self.assertEqual(again.n_played, 0)
+        with open(self.checkpoint) as f:
+            self.assertEqual(len(f.read().splitlines()), 1 + 4)
+
+    def test_schedules(self):
+        engine = SearchEngine(self.bank_path, block_hands=50)
+        grid = engine.grid_search([0.0, 0.5, 1.0], [0.5], 100)
+        self.assertEqual(len(grid), 3)
+        self.assertEqual([e.mean for e in grid], sorted([e.mean for e in grid], reverse=True))
+        self.assertEqual(len(engine.random_search(4, 50, seed=0)), 4)
+        halving = engine.successive_halving(random_configs(9, seed=1), 50, 450, eta=3)
+        self.assertEqual(len(halving), 1)
+        self.assertEqual(halving[0].n_hands, 450)
+        bands = engine.hyperband(450, eta=3, seed=0)
+        self.assertEqual(len(bands), 3)
+        self.assertTrue(all(isinstance(e, Evaluation) and e.n_hands == 450 for e in bands))
+
+    def test_invalid(self):
+        engine = SearchEngine(self.bank_path, block_hands=50)
+        with self.assertRaises(ValueError):
+            engine.evaluate([(0.5, 0.5)], 2000)
+        with self.assertRaises(ValueError):
+            engine.successive_halving([(0.5, 0.5)], 50, 100, eta=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import random
+import unittest
+
+from game_assets.players.heuristic_player import HeuristicPlayer
+from game_assets.players.random_player import RandomPlayer
+from game_assets.table import Table
+from tuning.sequential import (BETTER, EQUIVALENT, UNDECIDED, WORSE, confidence_radius,
+                               min_equivalence_radius, sequential_compare, sequential_grid)
+
+
+def heuristic_vs_random(pickup_act=0.05, trump_call_act=0.4):
+    return Table(HeuristicPlayer(0, pickup_act, trump_call_act), RandomPlayer(1),
+                 HeuristicPlayer(2, pickup_act, trump_call_act), RandomPlayer(3))
+
+
+class TestSequential(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(0)
+
+    def test_radius(self):
+        """
+        The radius shrinks with observations, and grows with looks &
+        variance
+        """
+        self.assertEqual(confidence_radius(1, 1.0, 1, 0.05), float("inf"))
+        self.assertLess(confidence_radius(2000, 1.0, 1, 0.05), confidence_radius(1000, 1.0, 1, 0.05))
+        self.assertLess(confidence_radius(1000, 1.0, 1, 0.05), confidence_radius(1000, 1.0, 5, 0.05))
+        self.assertLess(confidence_radius(1000, 1.0, 1, 0.05), confidence_radius(1000, 2.0, 1, 0.05))
+
+    def test_clear_difference_stops_early(self):
+        """
+        Heuristic teams beat random teams well within the fixed budget
+        """
+        for make_table, decision in [(heuristic_vs_random, BETTER),
+                                     (lambda: Table(RandomPlayer(0), HeuristicPlayer(1),
+                                                    RandomPlayer(2), HeuristicPlayer(3)), WORSE)]:
+            with self.subTest(decision=decision):
+                result = sequential_compare(make_table, batch_hands=250, max_hands=5000)
+                self.assertEqual(result.decision, decision)
+                self.assertLess(result.n_hands, 5000)
+                self.assertGreater(abs(result.mean), result.radius)
+
+    def test_equivalent(self):
+        """
+        Identical teams are found equivalent given a loose tolerance
+        """
+        result = sequential_compare(lambda: Table(*[HeuristicPlayer(i) for i in range(4)]),
+                                    batch_hands=500, max_hands=10000, tolerance=0.5)
+        self.assertEqual(result.decision, EQUIVALENT)
+        self.assertLess(abs(result.mean) + result.radius, 0.5)
+
+    def test_undecided(self):
+        """
+        Runs out of hands before a tight (but reachable) tolerance is met
+        """
+        self.assertLess(min_equivalence_radius(100, 250, 0.05, 0.65), 0.65)
+        result = sequential_compare(lambda: Table(*[RandomPlayer(i) for i in range(4)]),
+                                    batch_hands=100, max_hands=250, tolerance=0.65)
+        self.assertEqual(result.decision, UNDECIDED)
+        self.assertEqual((result.n_hands, result.n_batches), (200, 2))
+
+    def test_unreachable_tolerance(self):
+        """
+        A tolerance the radius can't fall below within max_hands is refused
+        """
+        for kwargs in [{"tolerance": 0.02}, {"batch_hands": 100, "max_hands": 250, "tolerance": 0.3}]:
+            with self.subTest(**kwargs):
+                with self.assertRaises(ValueError):
+                    sequential_compare(heuristic_vs_random, **kwargs)
+
+    def test_default_budget(self):
+        """
+        The default tolerance is reachable well within the default budget
+        """
+        self.assertLess(min_equivalence_radius(500, 30000, 0.05, 0.1), 0.1)
+        self.assertLess(min_equivalence_radius(500, 10000, 0.05, 0.1), 0.1)
+
+    def test_grid(self):
+        grids = sequential_grid(heuristic_vs_random, [0.05, 0.5], [0.4], batch_hands=250,
+                                max_hands=2000, tolerance=0.5)
+        self.assertEqual(grids["mean"].shape, (2, 1))
+        self.assertTrue((grids["n_hands"] <= 2000).all())
+        self.assertEqual(set(grids["decision"].ravel()) - {BETTER, EQUIVALENT, UNDECIDED}, set())
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            sequential_compare(heuristic_vs_random, batch_hands=10, max_hands=5)
+        with self.assertRaises(ValueError):
+            sequential_compare(heuristic_vs_random, alpha=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
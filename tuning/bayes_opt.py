@@ -0,0 +1,294 @@
+"""
+Batched Bayesian optimization of continuous heuristic knobs, e.g.
+HeuristicPlayer's (pickup_act, trump_call_act).
+
+A Gaussian process (RBF kernel, with a noise term for the noisy score
+differences) is fit to the points evaluated so far, its hyperparameters
+chosen by marginal likelihood over a small grid. Each round proposes a
+batch of points for parallel evaluation: the upper confidence bound is
+maximized over random & local candidates, and each pick is added to the
+GP as a "constant liar" observation (at its predicted mean) before the
+next, spreading the batch out.
+
+`optimize_thresholds` drives the optimizer with a `search.SearchEngine`,
+so batches are played over its process pool on common deals (and cached
+or checkpointed there).
+"""
+from itertools import product
+from math import log, pi
+from typing import Callable, List, Sequence, Tuple
+
+from numpy import (argmax, array, asarray, clip, concatenate, exp, eye, float64, isfinite,
+                   ndarray, sqrt, vstack, zeros)
+from numpy.linalg import LinAlgError, slogdet, solve
+from numpy.random import default_rng
+
+from .search import SearchEngine
+
+# hyperparameter grids: length scales (on the unit cube) & noise to signal ratios
+LENGTH_SCALES = [0.05, 0.1, 0.2, 0.4, 0.8]
+NOISE_RATIOS = [1e-3, 1e-2, 0.1, 0.5]
+# diagonal jitter (relative to the signal variance) added to the noise, in
+# turn, while no grid point can be fit
+JITTERS = [0.0, 1e-6, 1e-4, 1e-2, 1.0]
+
+
+def rbf_kernel(a: ndarray, b: ndarray, length_scale: float) -> ndarray:
+    """
+    Squared exponential kernel between the rows of a & b
+    """
+    sq_dist = ((a[:, None, :] - b[None, :, :]) ** 2).sum(axis=2)
+    return exp(-0.5 * sq_dist / length_scale ** 2)
+
+
+class GaussianProcess:
+    """
+    GP regression with an RBF kernel & Gaussian noise, on a constant mean
+    """
+
+    def __init__(self, length_scale: float, signal_var: float, noise_var: float):
+        self.length_scale = length_scale
+        self.signal_var = signal_var
+        self.noise_var = noise_var
+
+    def fit(self, x: ndarray, y: ndarray) -> 'GaussianProcess':
+        """
+        Condition on observations
+
+        Parameters
+        ----------
+            x : np.array
+                (n x d) points, in the unit cube
+
+            y : np.array
+                (n,) observed values
+
+        Returns
+        -------
+            GaussianProcess : this instance
+        """
+        self.x = asarray(x, dtype=float64)
+        y = asarray(y, dtype=float64)
+        self.y_mean = y.mean()
+        self.k = (self.signal_var * rbf_kernel(self.x, self.x, self.length_scale)
+                  + self.noise_var * eye(len(self.x)))
+        self.alpha = solve(self.k, y - self.y_mean)
+        self._y = y - self.y_mean
+        return self
+
+    def log_marginal_likelihood(self) -> float:
+        _, log_det = slogdet(self.k)
+        return float(-0.5 * self._y @ self.alpha - 0.5 * log_det - len(self._y) / 2 * log(2 * pi))
+
+    def predict(self, x: ndarray) -> Tuple[ndarray, ndarray]:
+        """
+        Posterior mean & standard deviation (of the latent function)
+
+        Parameters
+        ----------
+            x : np.array
+                (m x d) points
+
+        Returns
+        -------
+            Tuple[np.array, np.array] : (m,) means & standard deviations
+        """
+        k_star = self.signal_var * rbf_kernel(asarray(x, dtype=float64), self.x, self.length_scale)
+        mean = self.y_mean + k_star @ self.alpha
+        var = self.signal_var - (k_star * solve(self.k, k_star.T).T).sum(axis=1)
+        return mean, sqrt(clip(var, 0, None))
+
+
+def fit_gp(x: ndarray, y: ndarray) -> GaussianProcess:
+    """
+    Fit a GP, choosing the length scale & noise by marginal likelihood. If
+    the kernel matrix is singular for every grid point (e.g. repeated points
+    with little noise), the grid is retried with growing diagonal jitter
+
+    Raises
+    ------
+        ValueError : if y is not finite
+
+        LinAlgError : if no grid point can be fit, even with jitter
+    """
+    y = asarray(y, dtype=float64)
+    if not isfinite(y).all():
+        raise ValueError("Cannot fit a GP to non-finite observations")
+    signal_var = max(float(y.var()), 1e-12)
+    for jitter in JITTERS:
+        best, best_lml = None, float("-inf")
+        for length_scale, noise_ratio in product(LENGTH_SCALES, NOISE_RATIOS):
+            try:
+                gp = GaussianProcess(length_scale, signal_var,
+                                     (noise_ratio + jitter) * signal_var).fit(x, y)
+            except LinAlgError:
+                continue
+            if (lml := gp.log_marginal_likelihood()) > best_lml:
+                best, best_lml = gp, lml
+        if best is not None:
+            return best
+    raise LinAlgError(f"The GP kernel matrix is singular for every hyperparameter, "
+                      f"even with a diagonal jitter of {JITTERS[-1]} x the signal variance")
+
+
+class BayesianOptimizer:
+    """
+    Batched GP-UCB maximization over a box
+    """
+
+    def __init__(self, bounds: Sequence[Tuple[float, float]], batch_size: int = 8,
+                n_initial: int = 8, kappa: float = 2.0, n_candidates: int = 2000,
+                seed: int = None):
+        """
+        Parameters
+        ----------
+            bounds : Sequence[Tuple[float, float]]
+                The (low, high) bounds of each dimension
+
+            batch_size : int, default = 8
+                Points proposed per round (e.g. the number of workers)
+
+            n_initial : int, default = 8
+                Uniformly random points evaluated before the GP is used
+
+            kappa : float, default = 2.0
+                The exploration weight of the upper confidence bound
+
+            n_candidates : int, default = 2000
+                Random candidates the acquisition is maximized over
+
+            seed : int, default = None
+                Seeds the proposals
+        """
+        self.bounds = asarray(bounds, dtype=float64)
+        if (self.bounds.ndim != 2 or self.bounds.shape[1] != 2
+                or (self.bounds[:, 1] <= self.bounds[:, 0]).any()):
+            raise ValueError("bounds must be a sequence of increasing (low, high) pairs")
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive")
+        self.batch_size = batch_size
+        self.n_initial = n_initial
+        self.kappa = kappa
+        self.n_candidates = n_candidates
+        self.rng = default_rng(seed)
+        # observations, in the unit cube
+        self.x = zeros((0, len(self.bounds)))
+        self.y = zeros(0)
+
+    def _to_unit(self, points: ndarray) -> ndarray:
+        return (asarray(points, dtype=float64) - self.bounds[:, 0]) / (self.bounds[:, 1] - self.bounds[:, 0])
+
+    def _from_unit(self, u: ndarray) -> ndarray:
+        return self.bounds[:, 0] + u * (self.bounds[:, 1] - self.bounds[:, 0])
+
+    def ask(self) -> ndarray:
+        """
+        Propose a batch of points
+
+        Returns
+        -------
+            np.array : (batch_size x d) points
+        """
+        d = len(self.bounds)
+        if len(self.y) < self.n_initial:
+            return self._from_unit(self.rng.random((self.batch_size, d)))
+        x, y = self.x, self.y
+        # random candidates, and perturbations of the best observed points
+        top = self.x[self.y.argsort()[::-1][:5]]
+        local = top[self.rng.integers(len(top), size=self.n_candidates // 2)]
+        local = clip(local + 0.05 * self.rng.standard_normal(local.shape), 0, 1)
+        candidates = vstack([self.rng.random((self.n_candidates // 2, d)), local])
+        batch = []
+        for _ in range(self.batch_size):
+            gp = fit_gp(x, y)
+            mean, std = gp.predict(candidates)
+            pick = argmax(mean + self.kappa * std)
+            batch.append(candidates[pick])
+            # constant liar: pretend the pick was observed at its predicted mean
+            x = vstack([x, candidates[pick]])
+            y = concatenate([y, [mean[pick]]])
+        return self._from_unit(array(batch))
+
+    def tell(self, points: ndarray, values: Sequence[float]) -> None:
+        """
+        Add evaluated points (higher values are better)
+        """
+        self.x = vstack([self.x, self._to_unit(points)])
+        self.y = concatenate([self.y, asarray(values, dtype=float64)])
+
+    def best(self) -> Tuple[ndarray, float]:
+        """
+        The observed point of greatest posterior mean (robust to noise), and
+        that mean
+
+        Returns
+        -------
+            Tuple[np.array, float] : the point & its posterior mean
+        """
+        if len(self.y) == 0:
+            raise ValueError("No points have been evaluated")
+        mean, _ = fit_gp(self.x, self.y).predict(self.x)
+        ix = int(argmax(mean))
+        return self._from_unit(self.x[ix]), float(mean[ix])
+
+    def run(self, objective: Callable[[ndarray], Sequence[float]], n_rounds: int) -> Tuple[ndarray, float]:
+        """
+        Propose, evaluate and add n_rounds batches
+
+        Parameters
+        ----------
+            objective : Callable[[np.array], Sequence[float]]
+                Evaluates a (batch_size x d) batch of points
+
+            n_rounds : int
+                The number of batches
+
+        Returns
+        -------
+            Tuple[np.array, float] : see `best`
+        """
+        for _ in range(n_rounds):
+            points = self.ask()
+            self.tell(points, objective(points))
+        return self.best()
+
+
+def optimize_thresholds(engine: SearchEngine, n_hands: int, n_rounds: int = 10,
+                        batch_size: int = 8, seed: int = None, **kwargs) -> Tuple[Tuple[float, float], float]:
+    """
+    Bayesian optimization of (pickup_act, trump_call_act), evaluated by a
+    search engine
+
+    Parameters
+    ----------
+        engine : search.SearchEngine
+            Evaluates batches of configurations (over its pool, on common
+            deals)
+
+        n_hands : int
+            Hands per evaluation
+
+        n_rounds : int, default = 10
+            The number of batches
+
+        batch_size : int, default = 8
+            Configurations per batch
+
+        seed : int, default = None
+            Seeds the proposals
+
+        **kwargs :
+            Passed to BayesianOptimizer
+
+    Returns
+    -------
+        Tuple[Tuple[float, float], float] : the best configuration, and its
+            posterior mean net points per hand
+    """
+    optimizer = BayesianOptimizer([(0, 1), (0, 1)], batch_size=batch_size, seed=seed, **kwargs)
+
+    def objective(points: ndarray) -> List[float]:
+        return [e.mean for e in engine.evaluate([tuple(p) for p in points.tolist()], n_hands)]
+
+    point, mean = optimizer.run(objective, n_rounds)
+    return tuple(point.tolist()), mean
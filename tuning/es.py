@@ -0,0 +1,310 @@
+"""
+Evolution strategies over `WeightedHeuristicPlayer` card weights.
+
+A separable natural evolution strategy (SNES): a diagonal Gaussian search
+distribution (mean, per-weight sigma) over the weights, sampled in
+antithetic pairs, updated each generation from the rank-based utilities of
+its candidates.
+
+Each candidate plays as team zero (seats 0 & 2) against a fixed reference
+team of HeuristicPlayers, scored by its mean net points per hand. Within a
+generation every candidate plays the same deals (a seeded `Table`, see its
+seed schedule), so candidates are compared on common random numbers; each
+generation plays new deals. Candidates' hands are split into blocks,
+played over a process pool.
+
+The search state is checkpointed after each generation, and a run resumes
+from its checkpoint.
+"""
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from math import log, sqrt
+from multiprocessing import Pool
+from typing import List, Tuple
+
+from numpy import array, asarray, exp, float64, maximum, ndarray, zeros
+from numpy.random import SeedSequence, default_rng
+
+from game_assets.players.heuristic_player import HeuristicPlayer
+from game_assets.players.weighted_heuristic_player import (DEFAULT_WEIGHTS, NUM_TRUMP_WEIGHTS,
+                                                           NUM_WEIGHTS, WeightedHeuristicPlayer)
+from game_assets.table import Table
+
+# the least trump weight of a candidate (see weighted_heuristic_player.check_weights)
+MIN_TRUMP_WEIGHT = 1e-3
+
+
+def to_weights(x: ndarray) -> ndarray:
+    """
+    Map a point of the search space to valid weights: negative weights
+    are clipped to 0, trump weights to MIN_TRUMP_WEIGHT
+    """
+    weights = maximum(asarray(x, dtype=float64), 0)
+    weights[:NUM_TRUMP_WEIGHTS] = maximum(weights[:NUM_TRUMP_WEIGHTS], MIN_TRUMP_WEIGHT)
+    return weights
+
+
+def rank_utilities(scores: ndarray) -> ndarray:
+    """
+    NES fitness shaping: utilities by rank, summing to 0, positive for the
+    better half
+
+    Parameters
+    ----------
+        scores : np.array
+            The candidates' scores (higher is better)
+
+    Returns
+    -------
+        np.array : each candidate's utility
+    """
+    n = len(scores)
+    ranks = zeros(n, dtype=int)
+    ranks[asarray(scores).argsort()[::-1]] = range(1, n + 1)
+    raw = maximum(0, log(n / 2 + 1) - array([log(r) for r in ranks]))
+    return raw / raw.sum() - 1 / n
+
+
+def _play_block(task: Tuple) -> Tuple[int, float]:
+    """
+    Play a block of hands of a candidate
+
+    Parameters
+    ----------
+        task : Tuple
+            (candidate index, weights, pickup_act, trump_call_act, reference
+            (pickup_act, trump_call_act), seed, first deal, hands)
+
+    Returns
+    -------
+        Tuple[int, int] : the candidate index, and its net points
+    """
+    candidate, weights, pickup_act, trump_call_act, reference, seed, first_deal, n_hands = task
+    table = Table(WeightedHeuristicPlayer(0, weights, pickup_act, trump_call_act),
+                  HeuristicPlayer(1, *reference),
+                  WeightedHeuristicPlayer(2, weights, pickup_act, trump_call_act),
+                  HeuristicPlayer(3, *reference), seed=seed, first_deal=first_deal)
+    for _ in range(n_hands):
+        table.play_hand()
+    t0_score, t1_score = table.get_scores()
+    return candidate, t0_score - t1_score
+
+
+@dataclass
+class ESState:
+    """
+    The search state
+
+    Attributes
+    ----------
+        generation : int
+            The number of generations completed
+
+        mean, sigma : List[float]
+            The search distribution
+
+        best_weights : List[float]
+            The best candidate seen
+
+        best_score : float
+            The best candidate's mean net points per hand (in its
+            generation's deals)
+
+        history : List[float]
+            The mean score of each generation's candidates
+    """
+    generation: int
+    mean: List[float]
+    sigma: List[float]
+    best_weights: List[float] = None
+    best_score: float = float("-inf")
+    history: List[float] = field(default_factory=list)
+
+
+class EvolutionStrategy:
+    """
+    SNES over WeightedHeuristicPlayer weights
+    """
+
+    def __init__(self, initial: ndarray = DEFAULT_WEIGHTS, sigma: float = 0.1,
+                population: int = 16, hands_per_candidate: int = 2000, block_hands: int = 500,
+                pickup_act = 1/3, trump_call_act = 0.55, reference: Tuple[float, float] = (1/3, 0.55),
+                n_workers: int = 1, seed: int = 0, checkpoint_path: str = None):
+        """
+        Parameters
+        ----------
+            initial : np.array, default = DEFAULT_WEIGHTS
+                The initial mean weights
+
+            sigma : float, default = 0.1
+                The initial standard deviation of every weight
+
+            population : int, default = 16
+                Candidates per generation (even: sampled in antithetic pairs)
+
+            hands_per_candidate : int, default = 2000
+                Hands each candidate plays per generation
+
+            block_hands : int, default = 500
+                Hands per task sent to the workers
+
+            pickup_act, trump_call_act : float
+                The candidates' thresholds (see HeuristicPlayer)
+
+            reference : Tuple[float, float], default = (1/3, 0.55)
+                The opposing HeuristicPlayers' (pickup_act, trump_call_act)
+
+            n_workers : int, default = 1
+                The number of worker processes
+
+            seed : int, default = 0
+                Seeds the sampling & deals. Runs don't depend on n_workers
+
+            checkpoint_path : str, default = None
+                If provided, the state is saved here after each generation,
+                and loaded from here if present
+        """
+        if population < 2 or population % 2:
+            raise ValueError("population must be even, and at least 2")
+        if hands_per_candidate < 1 or block_hands < 1:
+            raise ValueError("hands_per_candidate & block_hands must be positive")
+        self.population = population
+        self.hands_per_candidate = hands_per_candidate
+        self.block_hands = block_hands
+        self.pickup_act = pickup_act
+        self.trump_call_act = trump_call_act
+        self.reference = tuple(reference)
+        self.n_workers = n_workers
+        self.seed = seed
+        self.checkpoint_path = checkpoint_path
+        self.eta_sigma = (3 + log(NUM_WEIGHTS)) / (5 * sqrt(NUM_WEIGHTS))
+        if checkpoint_path is not None and os.path.exists(checkpoint_path):
+            with open(checkpoint_path) as f:
+                self.state = ESState(**json.load(f))
+        else:
+            initial = asarray(initial, dtype=float64)
+            if initial.shape != (NUM_WEIGHTS,):
+                raise ValueError(f"initial must have shape ({NUM_WEIGHTS},)")
+            self.state = ESState(0, initial.tolist(), [sigma] * NUM_WEIGHTS)
+
+    def _generation_seeds(self) -> Tuple[SeedSequence, int]:
+        """
+        The current generation's sampling seed, and deal seed
+        """
+        sample_seq, deal_seq = SeedSequence([self.seed, self.state.generation]).spawn(2)
+        return sample_seq, int(deal_seq.generate_state(1)[0])
+
+    def ask(self) -> Tuple[ndarray, ndarray]:
+        """
+        Sample the current generation's candidates
+
+        Returns
+        -------
+            Tuple[np.array, np.array] : (population x NUM_WEIGHTS) standard
+                normal samples, and the candidates' weights
+        """
+        sample_seq, _ = self._generation_seeds()
+        half = default_rng(sample_seq).standard_normal((self.population // 2, NUM_WEIGHTS))
+        z = array([s * row for row in half for s in (1, -1)])
+        x = array(self.state.mean) + array(self.state.sigma) * z
+        return z, array([to_weights(row) for row in x])
+
+    def evaluate(self, candidates: ndarray, pool: Pool = None) -> ndarray:
+        """
+        Play each candidate on the generation's common deals
+
+        Parameters
+        ----------
+            candidates : np.array
+                (n x NUM_WEIGHTS) weights
+
+            pool : multiprocessing.Pool, default = None
+                Workers to play blocks on. Played serially if None
+
+        Returns
+        -------
+            np.array : each candidate's mean net points per hand
+        """
+        _, deal_seed = self._generation_seeds()
+        tasks = []
+        for candidate, weights in enumerate(candidates):
+            for first_deal in range(0, self.hands_per_candidate, self.block_hands):
+                n_hands = min(self.block_hands, self.hands_per_candidate - first_deal)
+                tasks.append((candidate, weights, self.pickup_act, self.trump_call_act,
+                              self.reference, deal_seed, first_deal, n_hands))
+        results = pool.map(_play_block, tasks) if pool is not None else map(_play_block, tasks)
+        net_points = zeros(len(candidates))
+        for candidate, points in results:
+            net_points[candidate] += points
+        return net_points / self.hands_per_candidate
+
+    def tell(self, z: ndarray, scores: ndarray, candidates: ndarray = None) -> None:
+        """
+        Update the search distribution from the generation's scores
+
+        Parameters
+        ----------
+            z : np.array
+                The samples from `ask`
+
+            scores : np.array
+                Each candidate's score (higher is better)
+
+            candidates : np.array, default = None
+                The candidates' weights, to track the best seen
+
+        Returns
+        -------
+            None
+        """
+        utilities = rank_utilities(scores)
+        mean, sigma = array(self.state.mean), array(self.state.sigma)
+        mean += sigma * (utilities @ z)
+        sigma *= exp(self.eta_sigma / 2 * (utilities @ (z ** 2 - 1)))
+        self.state.mean, self.state.sigma = mean.tolist(), sigma.tolist()
+        best = int(asarray(scores).argmax())
+        if candidates is not None and scores[best] > self.state.best_score:
+            self.state.best_score = float(scores[best])
+            self.state.best_weights = candidates[best].tolist()
+        self.state.history.append(float(asarray(scores).mean()))
+        self.state.generation += 1
+
+    def run(self, n_generations: int) -> ESState:
+        """
+        Run until n_generations have completed (including any loaded from
+        the checkpoint)
+
+        Returns
+        -------
+            ESState : the final state
+        """
+        pool = Pool(self.n_workers) if self.n_workers > 1 else None
+        try:
+            while self.state.generation < n_generations:
+                z, candidates = self.ask()
+                self.tell(z, self.evaluate(candidates, pool), candidates)
+                self.save_checkpoint()
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+        return self.state
+
+    def save_checkpoint(self) -> None:
+        """
+        Write the state to the checkpoint (if any), atomically
+        """
+        if self.checkpoint_path is None:
+            return
+        tmp_path = self.checkpoint_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(asdict(self.state), f)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    @property
+    def mean_weights(self) -> ndarray:
+        """
+        The search distribution's mean, as valid weights
+        """
+        return to_weights(self.state.mean)
@@ -0,0 +1,86 @@
+"""
+Paired comparison of two configurations under common random numbers.
+
+Both configurations play the same blocks of deals, on tables sharing a seed
+schedule (see `Table`), so each block's deals and the players' random
+streams match. The per-block difference of team zero's net points then
+cancels much of the luck of the deal, and its standard error is typically
+far below that of independent runs of the same length.
+"""
+from dataclasses import dataclass
+from typing import Callable
+
+from game_assets.online_stats import RunningStats
+from game_assets.table import Table
+
+
+@dataclass
+class PairedComparison:
+    """
+    The result of a paired comparison
+
+    Attributes
+    ----------
+        difference : float
+            Mean (a - b) net points per hand of team zero
+
+        stderr : float
+            The standard error of the difference, from the paired blocks
+
+        unpaired_stderr : float
+            The standard error had the configurations played independent
+            deals (for reference)
+
+        n_hands : int
+            The number of hands each configuration played
+    """
+    difference: float
+    stderr: float
+    unpaired_stderr: float
+    n_hands: int
+
+
+def paired_compare(make_table_a: Callable[..., Table], make_table_b: Callable[..., Table],
+                n_blocks: int = 20, block_hands: int = 250, seed: int = 0) -> PairedComparison:
+    """
+    Compare team zero's net points per hand between two configurations, on
+    common deals & random streams
+
+    Parameters
+    ----------
+        make_table_a, make_table_b : Callable[..., Table]
+            Create a table of each configuration, passing on the `seed` and
+            `first_deal` keywords to `Table` (e.g.
+            `lambda **kw: Table(p1, p2, p3, p4, **kw)`, adding `deals` to
+            deal from a bank)
+
+        n_blocks : int, default = 20
+            The number of blocks (each a fresh table)
+
+        block_hands : int, default = 250
+            The number of hands per block
+
+        seed : int, default = 0
+            The tables' seed
+
+    Returns
+    -------
+        PairedComparison : the estimated difference
+    """
+    if n_blocks < 2 or block_hands < 1:
+        raise ValueError("Require at least 2 blocks, of at least 1 hand")
+    stats_a, stats_b, stats_diff = RunningStats(), RunningStats(), RunningStats()
+    for block in range(n_blocks):
+        means = []
+        for make_table in (make_table_a, make_table_b):
+            table = make_table(seed=seed, first_deal=block * block_hands)
+            for _ in range(block_hands):
+                table.play_hand()
+            t0_score, t1_score = table.get_scores()
+            means.append((t0_score - t1_score) / block_hands)
+        stats_a.update(means[0])
+        stats_b.update(means[1])
+        stats_diff.update(means[0] - means[1])
+    return PairedComparison(stats_diff.mean, (stats_diff.variance / n_blocks) ** 0.5,
+                            ((stats_a.variance + stats_b.variance) / n_blocks) ** 0.5,
+                            n_blocks * block_hands)
@@ -0,0 +1,346 @@
+"""
+Parallel search of `HeuristicPlayer` bidding thresholds
+(pickup_act, trump_call_act).
+
+A configuration plays as team zero (seats 0 & 2) against a fixed opponent
+team, and is scored by its mean net points per hand (its points less the
+opponents'). Every configuration plays the same deals, from a shared
+`DealBank`, in blocks of `block_hands`: block b is a fresh table dealt the
+bank's deals [b * block_hands, (b + 1) * block_hands), with the players'
+RNGs seeded per deal by the table's seed schedule. Blocks are the unit of
+work sent to the process pool, of caching, and of checkpointing, so larger
+budgets (e.g. later successive halving rungs) only play the blocks not yet
+played, and an interrupted search resumes from its checkpoint.
+
+Schedules:
+    - grid_search: every point of a grid, as the notebooks
+    - random_search: uniformly sampled configurations
+    - successive_halving: play all configurations on a small budget, keep
+      the best 1/eta, multiply the budget by eta, repeat
+    - hyperband: successive halving brackets trading off the number of
+      configurations against their initial budget
+"""
+import json
+import os
+from dataclasses import dataclass
+from math import ceil, floor, log
+from multiprocessing import Pool
+from typing import Dict, Iterable, List, Tuple
+
+from numpy.random import default_rng
+
+from game_assets.deal_bank import DealBank
+from game_assets.players.heuristic_player import HeuristicPlayer
+from game_assets.players.random_player import RandomPlayer
+from game_assets.table import Table
+
+# (pickup_act, trump_call_act)
+Config = Tuple[float, float]
+
+# deal banks opened by this process, by path
+_BANKS: Dict[str, DealBank] = {}
+
+
+@dataclass
+class Evaluation:
+    """
+    A configuration's results
+
+    Attributes
+    ----------
+        config : Config
+            (pickup_act, trump_call_act)
+
+        net_points : int
+            The configuration's team's points less its opponents', over
+            all hands
+
+        n_hands : int
+            The number of hands played
+    """
+    config: Config
+    net_points: int
+    n_hands: int
+
+    @property
+    def mean(self) -> float:
+        """
+        Mean net points per hand
+        """
+        return self.net_points / self.n_hands if self.n_hands else 0.0
+
+
+def grid_configs(pickup_grid: Iterable[float], trump_call_grid: Iterable[float]) -> List[Config]:
+    """
+    Every (pickup_act, trump_call_act) pair of two grids
+    """
+    return [(float(p), float(t)) for p in pickup_grid for t in trump_call_grid]
+
+
+def random_configs(n_configs: int, seed: int = None) -> List[Config]:
+    """
+    Configurations sampled uniformly from [0, 1] x [0, 1]
+    """
+    return [tuple(c) for c in default_rng(seed).random((n_configs, 2)).tolist()]
+
+
+def _play_block(task: Tuple) -> Tuple[Config, int, int]:
+    """
+    Play one block of hands of a configuration
+
+    Parameters
+    ----------
+        task : Tuple
+            (config, opponent, bank path, block index, block_hands, seed)
+
+    Returns
+    -------
+        Tuple[Config, int, int] : the config, block index, and team zero's
+            net points
+    """
+    config, opponent, bank_path, block, block_hands, seed = task
+    if bank_path not in _BANKS:
+        _BANKS[bank_path] = DealBank.load(bank_path)
+    if opponent is None:
+        opponents = [RandomPlayer(1), RandomPlayer(3)]
+    else:
+        opponents = [HeuristicPlayer(1, *opponent), HeuristicPlayer(3, *opponent)]
+    table = Table(HeuristicPlayer(0, *config), opponents[0], HeuristicPlayer(2, *config),
+                  opponents[1], deals=_BANKS[bank_path], first_deal=block * block_hands, seed=seed)
+    for _ in range(block_hands):
+        table.play_hand()
+    t0_score, t1_score = table.get_scores()
+    return config, block, t0_score - t1_score
+
+
+class SearchEngine:
+    """
+    Evaluates configurations on a shared deal bank over a process pool,
+    caching (and optionally checkpointing) each played block
+    """
+
+    def __init__(self, deal_bank_path: str, opponent: Config = None, block_hands: int = 250,
+                n_workers: int = 1, checkpoint_path: str = None, seed: int = 0):
+        """
+        Parameters
+        ----------
+            deal_bank_path : str
+                A bank saved with `DealBank.save`, opened (memory-mapped) by
+                each worker
+
+            opponent : Config, default = None
+                The opposing team's (pickup_act, trump_call_act). Random
+                players if None
+
+            block_hands : int, default = 250
+                The number of hands per block. Budgets are rounded up to
+                whole blocks
+
+            n_workers : int, default = 1
+                The number of worker processes
+
+            checkpoint_path : str, default = None
+                If provided, played blocks are appended to this file, and
+                those already in it are not replayed
+
+            seed : int, default = 0
+                Seeds the players' RNGs (the deals are the bank's)
+        """
+        if block_hands < 1:
+            raise ValueError("block_hands must be positive")
+        self.deal_bank_path = deal_bank_path
+        self.n_deals = len(DealBank.load(deal_bank_path))
+        self.opponent = None if opponent is None else tuple(opponent)
+        self.block_hands = block_hands
+        self.n_workers = n_workers
+        self.seed = seed
+        # (config, block) -> net points
+        self.blocks: Dict[Tuple[Config, int], int] = {}
+        # the number of blocks played (not loaded from the checkpoint)
+        self.n_played = 0
+        self.checkpoint_path = checkpoint_path
+        if checkpoint_path is not None:
+            self._open_checkpoint()
+
+    def _settings(self) -> Dict:
+        return {"n_deals": self.n_deals, "opponent": self.opponent,
+                "block_hands": self.block_hands, "seed": self.seed}
+
+    def _open_checkpoint(self) -> None:
+        """
+        Load the blocks of an existing checkpoint, or start a new one
+        """
+        settings = json.loads(json.dumps(self._settings()))
+        if os.path.exists(self.checkpoint_path) and os.path.getsize(self.checkpoint_path):
+            with open(self.checkpoint_path, "rb") as f:
+                header = f.readline()
+                # the end of the last complete line
+                complete = len(header) if header.endswith(b"\n") else 0
+                if complete:
+                    if json.loads(header) != settings:
+                        raise ValueError("The checkpoint was written with different settings")
+                    for line in f:
+                        if not line.endswith(b"\n"):
+                            break
+                        record = json.loads(line)
+                        self.blocks[(tuple(record["config"]), record["block"])] = record["net_points"]
+                        complete += len(line)
+            # a partially written last line is dropped, so appends start on
+            # a line of their own
+            if complete < os.path.getsize(self.checkpoint_path):
+                os.truncate(self.checkpoint_path, complete)
+            if complete:
+                return
+        with open(self.checkpoint_path, "w") as f:
+            f.write(json.dumps(settings) + "\n")
+
+    def _n_blocks(self, n_hands: int) -> int:
+        n_blocks = ceil(n_hands / self.block_hands)
+        if n_blocks * self.block_hands > self.n_deals:
+            raise ValueError(f"{n_blocks * self.block_hands} hands exceed the bank's {self.n_deals} deals")
+        return n_blocks
+
+    def evaluate(self, configs: Iterable[Config], n_hands: int) -> List[Evaluation]:
+        """
+        Evaluate configurations on the bank's first n_hands deals (rounded
+        up to whole blocks), playing only blocks not already played
+
+        Parameters
+        ----------
+            configs : Iterable[Config]
+                The configurations
+
+            n_hands : int
+                The number of hands each plays
+
+        Returns
+        -------
+            List[Evaluation] : the evaluations, in the order of configs
+        """
+        configs = [tuple(float(v) for v in c) for c in configs]
+        n_blocks = self._n_blocks(n_hands)
+        tasks = [(c, self.opponent, self.deal_bank_path, b, self.block_hands, self.seed)
+                 for c in dict.fromkeys(configs) for b in range(n_blocks)
+                 if (c, b) not in self.blocks]
+        if tasks:
+            checkpoint = open(self.checkpoint_path, "a") if self.checkpoint_path else None
+            try:
+                if self.n_workers > 1:
+                    with Pool(self.n_workers) as pool:
+                        for result in pool.imap_unordered(_play_block, tasks):
+                            self._add_block(result, checkpoint)
+                else:
+                    for task in tasks:
+                        self._add_block(_play_block(task), checkpoint)
+            finally:
+                if checkpoint is not None:
+                    checkpoint.close()
+        return [Evaluation(c, sum(self.blocks[(c, b)] for b in range(n_blocks)),
+                           n_blocks * self.block_hands) for c in configs]
+
+    def _add_block(self, result: Tuple[Config, int, int], checkpoint) -> None:
+        config, block, net_points = result
+        self.blocks[(config, block)] = net_points
+        self.n_played += 1
+        if checkpoint is not None:
+            checkpoint.write(json.dumps({"config": config, "block": block,
+                                         "net_points": net_points}) + "\n")
+            checkpoint.flush()
+
+    def grid_search(self, pickup_grid: Iterable[float], trump_call_grid: Iterable[float],
+                    n_hands: int) -> List[Evaluation]:
+        """
+        Evaluate every point of a grid
+
+        Returns
+        -------
+            List[Evaluation] : the evaluations, best first
+        """
+        return _ranked(self.evaluate(grid_configs(pickup_grid, trump_call_grid), n_hands))
+
+    def random_search(self, n_configs: int, n_hands: int, seed: int = None) -> List[Evaluation]:
+        """
+        Evaluate uniformly sampled configurations
+
+        Returns
+        -------
+            List[Evaluation] : the evaluations, best first
+        """
+        return _ranked(self.evaluate(random_configs(n_configs, seed), n_hands))
+
+    def successive_halving(self, configs: Iterable[Config], min_hands: int, max_hands: int,
+                        eta: int = 3) -> List[Evaluation]:
+        """
+        Evaluate configurations on min_hands, keep the best 1 / eta, and
+        repeat with eta times the hands, until one remains or max_hands is
+        reached
+
+        Parameters
+        ----------
+            configs : Iterable[Config]
+                The configurations
+
+            min_hands : int
+                The first rung's hands
+
+            max_hands : int
+                The most hands played by a configuration
+
+            eta : int, default = 3
+                The reduction factor
+
+        Returns
+        -------
+            List[Evaluation] : the last rung's evaluations, best first
+        """
+        if eta < 2:
+            raise ValueError("eta must be at least 2")
+        survivors = list(configs)
+        n_hands = min(min_hands, max_hands)
+        while True:
+            ranked = _ranked(self.evaluate(survivors, n_hands))
+            if n_hands >= max_hands or len(ranked) == 1:
+                return ranked
+            survivors = [e.config for e in ranked[:max(1, len(ranked) // eta)]]
+            n_hands = min(n_hands * eta, max_hands)
+
+    def hyperband(self, max_hands: int, min_hands: int = None, eta: int = 3,
+                seed: int = None) -> List[Evaluation]:
+        """
+        Hyperband: successive halving brackets of randomly sampled
+        configurations, from many configurations on few hands to few on
+        max_hands
+
+        Parameters
+        ----------
+            max_hands : int
+                The most hands played by a configuration
+
+            min_hands : int, default = None
+                The fewest hands a configuration is judged on. One block if
+                None
+
+            eta : int, default = 3
+                The reduction factor
+
+            seed : int, default = None
+                Seeds the sampling of configurations
+
+        Returns
+        -------
+            List[Evaluation] : the final evaluation of each bracket, best first
+        """
+        min_hands = min_hands or self.block_hands
+        s_max = floor(log(max_hands / min_hands) / log(eta) + 1e-9)
+        rng = default_rng(seed)
+        finals = []
+        for s in range(s_max, -1, -1):
+            n_configs = ceil((s_max + 1) / (s + 1) * eta ** s)
+            configs = random_configs(n_configs, rng.integers(1 << 32))
+            finals.append(self.successive_halving(configs, ceil(max_hands / eta ** s),
+                                                  max_hands, eta)[0])
+        return _ranked(finals)
+
+
+def _ranked(evaluations: List[Evaluation]) -> List[Evaluation]:
+    return sorted(evaluations, key=lambda e: e.mean, reverse=True)
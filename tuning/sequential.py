@@ -0,0 +1,227 @@
+"""
+Sequential (early stopping) comparison of the two teams at a table.
+
+Rather than a fixed number of hands per configuration, hands are played in
+batches until an anytime-valid confidence sequence on team zero's mean net
+points per hand (team zero's points less team one's) either excludes 0 (one
+team is better) or lies within +/- tolerance (the teams are equivalent).
+
+The confidence radius is an empirical Bernstein bound on the per-hand net
+points (bounded in [-2, 2]), with the error rate alpha split over the
+batches (alpha_k = alpha * 6 / (pi^2 k^2) at the k'th look), so the chance
+of any wrong decision over the whole run is at most alpha.
+
+Every scored hand is worth at least a point, so the net points of a hand
+are at least 1 in magnitude, and their variance is at least 1 - mean^2.
+Equivalence within a tolerance therefore needs a budget large enough for
+the radius to fall below the tolerance at that variance; budgets that
+can't are refused up front.
+"""
+from dataclasses import dataclass
+from math import log, pi, sqrt
+from typing import Callable, Dict, Iterable
+
+from numpy import full, int64, ndarray, zeros
+
+from game_assets.online_stats import MAX_HAND_POINTS, OnlineAggregator
+from game_assets.table import Table
+
+# the range of a hand's net points
+NET_POINTS_RANGE = 2 * MAX_HAND_POINTS
+# the fewest points a scored hand is worth
+MIN_HAND_POINTS = 1
+
+# decisions
+BETTER = "better"
+WORSE = "worse"
+EQUIVALENT = "equivalent"
+UNDECIDED = "undecided"
+DECISIONS = [BETTER, WORSE, EQUIVALENT, UNDECIDED]
+
+
+@dataclass
+class SequentialResult:
+    """
+    The outcome of a sequential comparison
+
+    Attributes
+    ----------
+        decision : str
+            BETTER/WORSE if team zero's mean net points per hand is
+            significantly above/below 0, EQUIVALENT if it is within the
+            tolerance, UNDECIDED if max_hands ran out first
+
+        mean : float
+            Team zero's mean net points per hand
+
+        radius : float
+            The confidence radius about the mean at stopping
+
+        n_hands : int
+            The number of hands played
+
+        n_batches : int
+            The number of batches (looks) played
+    """
+    decision: str
+    mean: float
+    radius: float
+    n_hands: int
+    n_batches: int
+
+
+def confidence_radius(n: int, variance: float, look: int, alpha: float,
+                    value_range: float = NET_POINTS_RANGE) -> float:
+    """
+    Empirical Bernstein confidence radius for the mean of n bounded
+    observations, at the look'th of a sequence of looks
+
+    Parameters
+    ----------
+        n : int
+            The number of observations
+
+        variance : float
+            The observations' sample variance
+
+        look : int
+            The (1-based) number of the look
+
+        alpha : float
+            The error rate of the whole sequence of looks
+
+        value_range : float, default = NET_POINTS_RANGE
+            The range of an observation
+
+    Returns
+    -------
+        float : The radius (inf for n < 2)
+    """
+    if n < 2:
+        return float("inf")
+    log_term = log(3 / (alpha * 6 / (pi ** 2 * look ** 2)))
+    return sqrt(2 * variance * log_term / n) + 3 * value_range * log_term / n
+
+
+def min_equivalence_radius(batch_hands: int, max_hands: int, alpha: float,
+                           tolerance: float) -> float:
+    """
+    The least confidence radius at the last look of a run, for teams
+    within the tolerance (whose net points have variance at least
+    MIN_HAND_POINTS^2 - tolerance^2). EQUIVALENT can only be decided if it
+    is below the tolerance
+
+    Parameters
+    ----------
+        batch_hands, max_hands, alpha, tolerance
+            See sequential_compare
+
+    Returns
+    -------
+        float : the radius
+    """
+    looks = max_hands // batch_hands
+    variance = max(MIN_HAND_POINTS ** 2 - tolerance ** 2, 0.0)
+    return confidence_radius(looks * batch_hands, variance, looks, alpha)
+
+
+def sequential_compare(make_table: Callable[[], Table], batch_hands: int = 500,
+                    max_hands: int = 30000, alpha: float = 0.05,
+                    tolerance: float = 0.1) -> SequentialResult:
+    """
+    Play batches of hands, each on a fresh table, until the teams are found
+    to differ, to be equivalent, or max_hands are played
+
+    Parameters
+    ----------
+        make_table : Callable[[], Table]
+            Creates a table of the configuration under test
+
+        batch_hands : int, default = 500
+            The number of hands per batch
+
+        max_hands : int, default = 30000
+            The most hands played (the notebooks' 30 x 1000)
+
+        alpha : float, default = 0.05
+            The error rate over all looks
+
+        tolerance : float, default = 0.1
+            Mean net points per hand within which the teams are equivalent
+            (0.1 is 100 points over 1000 hands). Must be reachable within
+            max_hands, see `min_equivalence_radius`
+
+    Returns
+    -------
+        SequentialResult : the decision & estimate
+    """
+    if batch_hands < 1 or max_hands < batch_hands:
+        raise ValueError("Require 1 <= batch_hands <= max_hands")
+    if not 0 < alpha < 1:
+        raise ValueError("alpha must be in (0, 1)")
+    if (reachable := min_equivalence_radius(batch_hands, max_hands, alpha, tolerance)) >= tolerance:
+        raise ValueError(f"tolerance {tolerance} can't be reached within max_hands={max_hands}: "
+                         f"the confidence radius is at least {reachable:.4f} there")
+    aggregator = OnlineAggregator()
+    look = 0
+    decision, radius = UNDECIDED, float("inf")
+    while aggregator.hands + batch_hands <= max_hands:
+        look += 1
+        table = make_table()
+        aggregator.new_sample()
+        table.subscribe(aggregator)
+        for _ in range(batch_hands):
+            table.play_hand()
+        table.unsubscribe(aggregator)
+        stats = aggregator.net_points
+        radius = confidence_radius(stats.count, stats.variance, look, alpha)
+        if stats.mean - radius > 0:
+            decision = BETTER
+        elif stats.mean + radius < 0:
+            decision = WORSE
+        elif -tolerance < stats.mean - radius and stats.mean + radius < tolerance:
+            decision = EQUIVALENT
+        if decision != UNDECIDED:
+            break
+    return SequentialResult(decision, aggregator.net_points.mean, radius,
+                            aggregator.hands, look)
+
+
+def sequential_grid(make_table: Callable[[float, float], Table], pickup_grid: Iterable[float],
+                    trump_call_grid: Iterable[float], **kwargs) -> Dict[str, ndarray]:
+    """
+    Sequentially compare each (pickup_act, trump_call_act) configuration,
+    as the notebooks' grid searches
+
+    Parameters
+    ----------
+        make_table : Callable[[float, float], Table]
+            Creates a table of the configuration (pickup_act, trump_call_act)
+
+        pickup_grid, trump_call_grid : Iterable[float]
+            The values of each parameter
+
+        **kwargs :
+            Passed to sequential_compare
+
+    Returns
+    -------
+        Dict[str, np.array] : (pickup x trump call) grids of "mean" net
+            points per hand, "radius", "n_hands" and "decision"
+    """
+    pickup_grid, trump_call_grid = list(pickup_grid), list(trump_call_grid)
+    shape = (len(pickup_grid), len(trump_call_grid))
+    grids = {
+        "mean": zeros(shape),
+        "radius": zeros(shape),
+        "n_hands": zeros(shape, dtype=int64),
+        "decision": full(shape, UNDECIDED, dtype=object),
+    }
+    for pgi, pickup_act in enumerate(pickup_grid):
+        for tci, trump_call_act in enumerate(trump_call_grid):
+            result = sequential_compare(lambda: make_table(pickup_act, trump_call_act), **kwargs)
+            grids["mean"][pgi, tci] = result.mean
+            grids["radius"][pgi, tci] = result.radius
+            grids["n_hands"][pgi, tci] = result.n_hands
+            grids["decision"][pgi, tci] = result.decision
+    return grids